@@ -11,7 +11,14 @@ install_requires = [
     "pyyaml",
     "requests",
 ]
-tests_require = ["pytest", "pytest-cov", "pytest-flake8", "pytest-mypy", "hypothesis"]
+tests_require = [
+    "pytest",
+    "pytest-cov",
+    "pytest-flake8",
+    "pytest-mypy",
+    "pytest-benchmark",
+    "hypothesis",
+]
 docs_require = []
 extras_require = {
     "dev": tests_require + docs_require + ["pre-commit", "bump2version"],
@@ -1,48 +1,77 @@
-import numpy as np
-
-from pint import Quantity
+"""Physical constants, as plain floats in S.I. units and as Quantities.
 
+The Quantity version of each constant has the same name followed by an underscore,
+eg. 'q_'. They are created the first time they are used since building the first
+Quantity loads the unit registry of pint, which is slow.
+"""
+import numpy as np
 
 pi = np.pi
-pi_ = Quantity(np.pi, "dimensionless")
 """Ehmmm... the Pi number"""
 
 q = 1.60217646e-19
-q_ = Quantity(q, "C")
 """Electron charge"""
 
 kb = 1.3806503e-23
-kb_ = Quantity(kb, "J/K")
 """Boltzmann's constant"""
 
 h = 6.626068e-34
-h_ = Quantity(h, "J*s")
 """Plank's constant"""
 
 hbar = h / (2 * pi)
-hbar_ = h_ / (2 * pi_)
 """Reduced Plank's constant"""
 
 electron_mass = 9.10938188e-31
-electron_mass_ = Quantity(electron_mass, "kg")
 """Electron rest mass"""
 
 vacuum_permittivity = 8.854187817e-12
-vacuum_permittivity_ = Quantity(vacuum_permittivity, "F/m")
 """Permitivity of the vacuum"""
 
 c = 299792458.0
-c_ = Quantity(c, "m/s")
 """Speed of light"""
 
 fs = 6.8e-5
-fs_ = Quantity(fs, "steradian")
 """Solid angle of the Sun - or entendu"""
 
 Ts = 5762.0
-Ts_ = Quantity(Ts, "k")
 """Temperature of the Sun when considered as a black body"""
 
 solar_constant = 1361.0
-solar_constant_ = Quantity(solar_constant, "kW/m**2")
 """Solar constant - density of solar irradiance out of the atmosphere"""
+
+_UNITS = {
+    "pi_": "dimensionless",
+    "q_": "C",
+    "kb_": "J/K",
+    "h_": "J*s",
+    "hbar_": "J*s",
+    "electron_mass_": "kg",
+    "vacuum_permittivity_": "F/m",
+    "c_": "m/s",
+    "fs_": "steradian",
+    "Ts_": "k",
+    "solar_constant_": "kW/m**2",
+}
+"""Units of the constants available as Quantities."""
+
+
+def __getattr__(name: str):
+    """Create the Quantity version of a constant the first time it is requested.
+
+    Args:
+        name: Name of the constant, ending in an underscore.
+
+    Raises:
+        AttributeError: if there is no such constant.
+
+    Returns:
+        The constant as a Quantity.
+    """
+    if name not in _UNITS:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    from pint import Quantity
+
+    value = Quantity(globals()[name[:-1]], _UNITS[name])
+    globals()[name] = value
+    return value
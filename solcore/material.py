@@ -1,6 +1,21 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple, Dict, Any
+from typing import (
+    Optional,
+    Tuple,
+    Dict,
+    Any,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Sequence,
+    Set,
+    Union,
+)
+from collections import OrderedDict
+import pickle
+from threading import Lock
 
 import xarray as xr
 import numpy as np
@@ -10,12 +25,44 @@ from deprecated import deprecated
 from warnings import warn
 from functools import partial
 
-from solcore.parameter import ParameterManager, Parameter, validate_nk
+from solcore.parameter import (
+    ParameterManager,
+    Parameter,
+    Context,
+    validate_nk,
+    _format_units,
+    _magnitude,
+    _parameter_state,
+    _restore_parameter,
+)
+
+NKEntry = Tuple[np.ndarray, xr.DataArray, int]
+"""Array and DataArray with the nk data interpolated on a grid, and the memory taken."""
+
+_nk_cache_lock = Lock()
+
+NKState = Tuple[Hashable, Dict, Tuple, Tuple, Tuple]
+"""Name, attributes, dimensions, data and coordinates of nk data (see '_nk_state')."""
+
+SNAPSHOT_VERSION = 2
+"""Version of the format of the state of the materials used in the snapshots."""
 
 
 class Material:
 
-    __slots__ = ("name", "comp", "sources", "_nk", "_params")
+    __slots__ = (
+        "name",
+        "comp",
+        "sources",
+        "_nk",
+        "_params",
+        "_resolved",
+        "_context",
+        "_nk_cache",
+    )
+
+    nk_cache_maxbytes: int = 32 * 2 ** 20
+    """Memory available to each material to keep the nk data interpolated on grids."""
 
     def __init__(
         self,
@@ -24,13 +71,17 @@ class Material:
         sources: Tuple[str, ...] = (),
         nk: xr.DataArray = xr.DataArray(),
         params: Optional[dict] = None,
+        resolved: Iterable[str] = (),
     ):
         # Define the types
         self.name: str
         self.comp: frozendict
         self.sources: Tuple[str, ...]
-        self._nk: xr.DataArray
+        self._nk: Union[xr.DataArray, NKState]
         self._params: Dict[str, Q_]
+        self._resolved: Set[str]
+        self._context: Context
+        self._nk_cache: OrderedDict[Tuple, NKEntry]
 
         # Actually create the attributes. Needed this way since it is inmutable
         composition = frozendict(comp if isinstance(comp, dict) else {})
@@ -40,12 +91,20 @@ class Material:
         object.__setattr__(self, "sources", tuple(sources))
         object.__setattr__(self, "_nk", nk)
         object.__setattr__(self, "_params", parameters)
+        object.__setattr__(self, "_resolved", set(resolved))
+        inputs = {k: v for k, v in parameters.items() if k not in self._resolved}
+        object.__setattr__(self, "_context", Context(inputs, comp=composition))
+        object.__setattr__(self, "_nk_cache", OrderedDict())
 
     def __getattr__(self, item: str) -> Q_:
         """Retrieve attributes for the material.
 
         If the requested attribute is not already in the params dictionary, then it will
         be retrieved from the available sources and the result stored in the sources.
+        The composition and the parameters given as inputs are passed to the sources as
+        an immutable Context, created with the material. The parameters retrieved are
+        not added to it, so the context and the keys in the resolution cache of later
+        enquiries do not depend on what was retrieved before.
 
         Raises:
             ParameterMissing: If the requested attribute does not exists in the
@@ -55,18 +114,131 @@ class Material:
             The value of the parameter.
         """
         if item not in self._params:
-            self._params[item] = ParameterManager().get_parameter(
+            value = ParameterManager().get_parameter(
                 material=self.name,
                 parameter=item,
                 source=self.sources,
-                comp=self.comp,
-                **self._params,
+                context=self._context,
             )
+            self._params[item] = value
+            self._resolved.add(item)
         return self._params[item]
 
     def __setattr__(self, item, value) -> Any:
         raise AttributeError("Attributes of a Material object cannot be change.")
 
+    def __getstate__(self) -> Tuple:
+        """Compact state of the material, made of plain Python objects.
+
+        The parameters are stored as their magnitude, units as a string, description
+        and reference, and the nk data as raw buffers. Interpolated nk data is not
+        included. The nk data of a restored material is only rebuilt when used.
+
+        Returns:
+            A tuple with the state, starting with the version of the format.
+        """
+        quantities = tuple(
+            (k, *_parameter_state(v))
+            for k, v in self._params.items()
+            if isinstance(v, Q_)
+        )
+        others = {k: v for k, v in self._params.items() if not isinstance(v, Q_)}
+        return (
+            SNAPSHOT_VERSION,
+            self.name,
+            dict(self.comp),
+            self.sources,
+            quantities,
+            others,
+            tuple(self._resolved),
+            self._nk if isinstance(self._nk, tuple) else _nk_state(self._nk),
+        )
+
+    def __reduce__(self):
+        return _restore_material, (self.__getstate__(),)
+
+    def evolve(self, comp: Optional[dict] = None, **kwargs) -> Material:
+        """Create a new material changing some of the inputs, eg. the temperature.
+
+        The parameters already retrieved from the sources are reused if they do not
+        depend on any of the changed inputs, directly or indirectly (see
+        'ParameterManager.dependencies'). Any other is retrieved again when needed.
+        Parameters given as inputs are kept, unless changed.
+
+        Args:
+            comp: New composition of the material, if it changes.
+            **kwargs: The inputs to change. As with 'factory', they should be
+                Quantities, otherwise the results and errors might be unexpected.
+
+        Returns:
+            A new Material object.
+        """
+        changes = self._validate_args(**kwargs)
+        changed = set(changes)
+        if comp is not None and comp != self.comp:
+            changed.add("comp")
+
+        given = frozenset(k for k in self._params if k not in self._resolved)
+        given = given | frozenset(changes)
+
+        def unchanged(parameter: str) -> bool:
+            deps = ParameterManager().dependencies(
+                self.name, parameter, self.sources, given
+            )
+            return deps is not None and not deps & changed
+
+        params = {
+            k: v
+            for k, v in self._params.items()
+            if k not in changes and (k not in self._resolved or unchanged(k))
+        }
+        resolved = [k for k in params if k in self._resolved]
+        params.update(changes)
+
+        material = Material(
+            name=self.name,
+            comp=dict(self.comp) if comp is None else comp,
+            sources=self.sources,
+            params=params,
+            resolved=resolved,
+        )
+        if "nk" not in self._resolved or unchanged("nk"):
+            object.__setattr__(material, "_nk", self._nk)
+            object.__setattr__(material, "_nk_cache", self._nk_cache)
+            if "nk" in self._resolved:
+                material._resolved.add("nk")
+        return material
+
+    def snapshot(self) -> bytes:
+        """Compact binary representation of the material.
+
+        Returns:
+            The snapshot, which can be turned back into a material with
+            'from_snapshot'.
+        """
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: bytes) -> Material:
+        """Create a material out of a snapshot.
+
+        As with pickle, snapshots must only be loaded from trusted sources.
+
+        Args:
+            snapshot: The snapshot, created with 'Material.snapshot'.
+
+        Raises:
+            TypeError: If the snapshot is not that of a material.
+            ValueError: If the snapshot uses an unsupported version of the format.
+
+        Returns:
+            The material.
+        """
+        material = pickle.loads(snapshot)
+        if not isinstance(material, cls):
+            raise TypeError(f"The snapshot is not that of a {cls.__name__}.")
+        return material
+
     @property
     def params(self) -> Tuple[str, ...]:
         """List of parameters already stored in the material."""
@@ -83,12 +255,138 @@ class Material:
         Return:
             The refractive index
         """
-        if self._nk.shape == ():
+        nk = self._nk
+        if isinstance(nk, tuple):
+            nk = _restore_nk(nk)
+            object.__setattr__(self, "_nk", nk)
+        elif nk.shape == ():
             nk = ParameterManager().get_nk(
-                material=self.name, source=self.sources, comp=self.comp, **self._params,
+                material=self.name, source=self.sources, **self._context
             )
             object.__setattr__(self, "_nk", nk)
-        return self._nk
+            self._resolved.add("nk")
+        return nk
+
+    def nk_on(
+        self, grid: Union[Q_, np.ndarray, Sequence[float]], as_array: bool = False
+    ) -> Union[xr.DataArray, np.ndarray]:
+        """Complex refractive index of the material interpolated on a wavelength grid.
+
+        The result is cached for each grid, identified by its values and units, so
+        evaluating repeatedly on the same grid only needs a dictionary lookup. The least
+        recently used grids are discarded once the results take more memory than
+        'nk_cache_maxbytes'. The results are shared and, therefore, read-only.
+
+        Args:
+            grid: Wavelengths to interpolate the data on. If they are not a Quantity,
+                they are assumed to be in the units of the wavelength of the nk data.
+            as_array: If True, a contiguous complex128 array with the magnitude of the
+                refractive index is returned, rather than a DataArray.
+
+        Raises:
+            ParameterMissing: If there is no nk data for the material in any of the
+                available databases.
+
+        Return:
+            The refractive index on the grid, as a DataArray or as an array.
+        """
+        key = _grid_fingerprint(grid)
+        with _nk_cache_lock:
+            entry = self._nk_cache.get(key)
+            if entry is not None:
+                self._nk_cache.move_to_end(key)
+
+        if entry is None:
+            array, data = _interpolate_nk(self.nk, grid)
+            entry = (array, data, array.nbytes + data.wavelength.nbytes + len(key[2]))
+            with _nk_cache_lock:
+                self._nk_cache[key] = entry
+                size = sum(e[2] for e in self._nk_cache.values())
+                while size > self.nk_cache_maxbytes and len(self._nk_cache) > 1:
+                    size -= self._nk_cache.popitem(last=False)[1][2]
+
+        return entry[0] if as_array else entry[1]
+
+    def to_record(
+        self,
+        fields: Sequence[str],
+        units: Optional[Mapping[str, str]] = None,
+        as_dict: bool = False,
+    ) -> Union[np.void, Dict[str, float]]:
+        """Parameters of the material as a flat record of floats.
+
+        Args:
+            fields: Parameters to include in the record.
+            units: Units in which to express each parameter. Those not given are
+                expressed in the units they have in the material.
+            as_dict: If True, a dictionary with the values is returned, rather than a
+                NumPy structured record.
+
+        Raises:
+            ValueError: If any parameter is not a scalar number.
+
+        Returns:
+            The record, with one float64 field per parameter.
+        """
+        records = Material.to_records((self,), fields, units, as_dict)
+        if isinstance(records, dict):
+            return {k: float(v[0]) for k, v in records.items()}
+        return records[0]
+
+    @staticmethod
+    def to_records(
+        materials: Sequence[Material],
+        fields: Sequence[str],
+        units: Optional[Mapping[str, str]] = None,
+        as_dict: bool = False,
+    ) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        """Parameters of several materials as a table of floats, eg. for solvers.
+
+        The parameters are retrieved and converted once, so the inner loops of a
+        solver can index plain arrays rather than getting attributes of the materials.
+        The units of the parameters are stored in the metadata of the dtype of the
+        structured array, under 'units'.
+
+        Args:
+            materials: Materials to include in the table, one row each.
+            fields: Parameters to include in the table, one column each.
+            units: Units in which to express each parameter. Those not given are
+                expressed in the units they have in the first material.
+            as_dict: If True, a dictionary with a float64 array per parameter is
+                returned, rather than a NumPy structured array.
+
+        Raises:
+            ValueError: If any parameter is not a scalar number.
+
+        Returns:
+            The structured array, with shape (len(materials),) and one float64 field
+            per parameter, or the dictionary of arrays.
+        """
+        units = dict(units or {})
+        columns: Dict[str, np.ndarray] = {}
+        for field in fields:
+            values = [getattr(m, field) for m in materials]
+            if field not in units and values and isinstance(values[0], Q_):
+                units[field] = _format_units(values[0].units)
+            target = units.get(field)
+            try:
+                column = np.array(
+                    [_magnitude(v, target) for v in values], dtype=np.float64
+                )
+            except (TypeError, ValueError) as err:
+                raise ValueError(f"Parameter '{field}' is not a number.") from err
+            if column.shape != (len(materials),):
+                raise ValueError(f"Parameter '{field}' is not a scalar.")
+            columns[field] = column
+
+        if as_dict:
+            return columns
+
+        dtype = np.dtype([(f, np.float64) for f in columns], metadata={"units": units})
+        records = np.empty(len(materials), dtype=dtype)
+        for field, column in columns.items():
+            records[field] = column
+        return records
 
     @property
     def material_str(self) -> str:
@@ -134,18 +432,20 @@ class Material:
         with_units = cls._validate_args(**kwargs)
 
         to_retrieve = tuple((p for p in include if p != "nk"))
-        params: Dict[str, Parameter] = (
-            ParameterManager().get_multiple_parameters(
-                material=name,
-                include=to_retrieve,
-                source=sources,
-                comp=comp,
-                **with_units,
+        params: Dict[str, Q_] = (
+            dict(
+                ParameterManager().get_multiple_parameters(
+                    material=name,
+                    include=to_retrieve,
+                    source=sources,
+                    context=Context(with_units, comp=comp),
+                )
             )
             if to_retrieve != ()
             else {}
         )
         params.update(with_units)
+        resolved = set(to_retrieve) - set(with_units)
 
         if nk.shape != ():
             validate_nk(nk)
@@ -153,8 +453,104 @@ class Material:
             nk = ParameterManager().get_nk(
                 material=name, source=sources, comp=comp, **params
             )
+            resolved.add("nk")
+
+        return cls(
+            name=name,
+            comp=comp,
+            sources=sources,
+            nk=nk,
+            params=params,
+            resolved=resolved,
+        )
+
+    @classmethod
+    def factory_many(
+        cls,
+        name: str,
+        comp: Optional[Dict[str, Union[float, Sequence[float]]]] = None,
+        include: Tuple[str, ...] = (),
+        sources: Tuple[str, ...] = (),
+        **kwargs,
+    ) -> List[Material]:
+        """Create several materials of the same kind, eg. a composition sweep.
+
+        The compositions, as well as the temperature and doping, can be given as one
+        dimensional arrays, all of them with the same length or scalars. The
+        parameters to include are retrieved once for all the materials, using arrays
+        as inputs, so the parameters of the parent materials of an alloy are obtained
+        only once. The parameters to include must, therefore, support array inputs.
+        The materials share the units, descriptions and references of the
+        parameters.
+
+        Args:
+            name: Name of the material.
+            comp: Composition of the materials, eg. {"Al": [0.1, 0.2, 0.3]}.
+            include: Parameters to retrieve form the sources during the creation of
+                the materials. Any parameter can be retrieved later on, as well.
+            sources: Sources in which to look for parameters. By default, all of the
+                available sources are used. If provided, the sources will be scanned
+                in the the order given.
+            **kwargs: Any extra argument will be incorporated to the parameters
+                dictionary of the materials (see 'factory').
 
-        return cls(name=name, comp=comp, sources=sources, nk=nk, params=params)
+        Raises:
+            ValueError: If the inputs are not scalars or one dimensional arrays of the
+                same length.
+
+        Returns:
+            A list with the new Material objects.
+        """
+        if "nk" in kwargs:
+            raise ValueError("Materials created in bulk cannot be given the nk data.")
+
+        composition = {k: np.asarray(v, dtype=float) for k, v in (comp or {}).items()}
+        with_units = cls._validate_args(**kwargs)
+
+        inputs = [*composition.values(), *(v.m for v in with_units.values())]
+        shape = np.broadcast(*inputs, np.empty(())).shape
+        if len(shape) > 1:
+            raise ValueError("Inputs must be scalars or one dimensional arrays.")
+        number = shape[0] if len(shape) == 1 else 1
+
+        to_retrieve = tuple((p for p in include if p != "nk"))
+        params: Dict[str, Q_] = (
+            dict(
+                ParameterManager().get_multiple_parameters(
+                    material=name,
+                    include=to_retrieve,
+                    source=sources,
+                    context=Context(with_units, comp=composition),
+                )
+            )
+            if to_retrieve != ()
+            else {}
+        )
+        params.update(with_units)
+        resolved = set(include) - set(with_units)
+
+        materials = []
+        for i in range(number):
+            comp_i = {k: _item(v, i, number) for k, v in composition.items()}
+            params_i = {k: _item(v, i, number) for k, v in params.items()}
+            nk = (
+                ParameterManager().get_nk(
+                    material=name, source=sources, comp=comp_i, **params_i
+                )
+                if "nk" in include
+                else xr.DataArray()
+            )
+            materials.append(
+                cls(
+                    name=name,
+                    comp=comp_i,
+                    sources=sources,
+                    nk=nk,
+                    params=params_i,
+                    resolved=resolved,
+                )
+            )
+        return materials
 
     @staticmethod
     def _validate_args(**kwargs) -> Dict[str, Q_]:
@@ -187,7 +583,8 @@ class Material:
         return result
 
     def __repr__(self) -> str:
-        nk = self._nk.__repr__().replace("\n", " ")
+        nk = (self.nk if isinstance(self._nk, tuple) else self._nk).__repr__()
+        nk = nk.replace("\n", " ")
         return (
             f"<Material(name={self.name}, comp={self.comp._dict}, "
             f"sources={self.sources}, nk={nk}, params={self._params})>"
@@ -235,6 +632,174 @@ def material(name: str):
     return partial(_material, name)
 
 
+def _grid_fingerprint(grid: Union[Q_, np.ndarray, Sequence[float]]) -> Tuple:
+    """Key identifying a wavelength grid by its units, shape and values.
+
+    The values are included as raw bytes, rather than as a digest, so different grids
+    never share a key. Comparing them is about as fast as hashing them.
+
+    Args:
+        grid: The wavelength grid, with or without units.
+
+    Returns:
+        A tuple with the units, if any, the shape and the values as bytes.
+    """
+    if isinstance(grid, Q_):
+        units, grid = grid.units, grid.magnitude
+    else:
+        units = None
+    values = np.ascontiguousarray(grid, dtype=float)
+    return units, values.shape, values.tobytes()
+
+
+def _interpolate_nk(
+    nk: xr.DataArray, grid: Union[Q_, np.ndarray, Sequence[float]]
+) -> Tuple[np.ndarray, xr.DataArray]:
+    """Interpolate the nk data on a wavelength grid.
+
+    Args:
+        nk: The nk data, with or without units.
+        grid: The wavelength grid, with or without units.
+
+    Returns:
+        A read-only contiguous complex128 array with the magnitude of the result and
+        the result as a DataArray sharing that array.
+    """
+    import pint_xarray  # noqa: F401
+
+    units = nk.wavelength.pint.units
+    if units is None:
+        grid = grid.magnitude if isinstance(grid, Q_) else grid
+        out = nk.interp(wavelength=np.asarray(grid, dtype=float))
+    else:
+        grid = grid if isinstance(grid, Q_) else Q_(np.asarray(grid, float), units)
+        out = nk.pint.interp(wavelength=grid)
+
+    array = np.ascontiguousarray(out.pint.magnitude, dtype=np.complex128)
+    array.flags.writeable = False
+    data = out.copy(data=array if out.pint.units is None else Q_(array, out.pint.units))
+    return array, data
+
+
+def _restore_material(state: Tuple) -> Material:
+    """Create a material out of its state (see 'Material.__getstate__').
+
+    Args:
+        state: The state of the material.
+
+    Raises:
+        ValueError: If the state uses an unsupported version of the format.
+
+    Returns:
+        The material.
+    """
+    version, *contents = state
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported version of the material snapshot: {version}.")
+
+    name, comp, sources, quantities, others, resolved, nk = contents
+    params = {k: _restore_parameter(*v) for k, *v in quantities}
+    params.update(others)
+    material = Material(
+        name=name, comp=comp, sources=sources, params=params, resolved=resolved
+    )
+    if nk is not None:
+        # The nk data is rebuilt the first time it is used
+        object.__setattr__(material, "_nk", nk)
+    return material
+
+
+def _nk_state(nk: xr.DataArray) -> Union[None, xr.DataArray, NKState]:
+    """Compact state of the nk data, made of plain Python objects and raw buffers.
+
+    Only DataArrays whose coordinates are those of their dimensions are stored this
+    way. Any other is returned as it is.
+
+    Args:
+        nk: The nk data, with or without units.
+
+    Returns:
+        None, if there is no data, or a tuple with the name, attributes, data and
+        coordinates. Data and coordinates are given as tuples with the raw buffer,
+        the data type, the shape and the units, if any.
+    """
+    if nk.shape == ():
+        return None
+    elif set(nk.coords) - set(nk.dims) or not set(nk.dims) <= set(nk.coords):
+        return nk
+
+    import pint_xarray  # noqa: F401
+
+    def buffer(values: xr.DataArray) -> Tuple[bytes, str, Tuple[int, ...], Any]:
+        units = values.pint.units
+        array = np.ascontiguousarray(values.pint.magnitude)
+        return (
+            array.tobytes(),
+            array.dtype.str,
+            array.shape,
+            None if units is None else _format_units(units),
+        )
+
+    coords = tuple((d, buffer(nk[d])) for d in nk.dims)
+    return nk.name, dict(nk.attrs), nk.dims, buffer(nk), coords
+
+
+def _restore_nk(state: Union[None, xr.DataArray, NKState]) -> xr.DataArray:
+    """Create the nk data out of its state (see '_nk_state').
+
+    Args:
+        state: The state of the nk data.
+
+    Returns:
+        The nk data.
+    """
+    if state is None:
+        return xr.DataArray()
+    elif isinstance(state, xr.DataArray):
+        return state
+
+    def array(buffer: bytes, dtype: str, shape: Tuple[int, ...]) -> np.ndarray:
+        return np.frombuffer(buffer, dtype=dtype).reshape(shape).copy()
+
+    name, attrs, dims, (*data, units), coords = state
+    nk = xr.DataArray(
+        array(*data),
+        name=name,
+        dims=dims,
+        coords={d: array(*c) for d, (*c, _) in coords},
+        attrs=attrs,
+    )
+    coord_units = {d: u for d, (*_, u) in coords if u is not None}
+    if units is None and len(coord_units) == 0:
+        return nk
+
+    import pint_xarray  # noqa: F401
+
+    return nk.pint.quantify(units, **coord_units)
+
+
+def _item(value: Any, i: int, number: int) -> Any:
+    """Element of a value retrieved for several materials at once.
+
+    Args:
+        value: A scalar, or array, or a Quantity or Parameter of those.
+        i: The index of the material.
+        number: The number of materials.
+
+    Returns:
+        The element 'i' of the value broadcasted to the number of materials. For
+        Parameters, the description and reference are kept.
+    """
+    if np.ndim(value) == 0:
+        return value.item() if isinstance(value, np.ndarray) else value
+    elif isinstance(value, Parameter):
+        m = np.broadcast_to(value.m, (number,))[i]
+        return Parameter(m, value.units, description=value.d, reference=value.r)
+    elif isinstance(value, Q_):
+        return Q_(np.broadcast_to(value.m, (number,))[i], value.units)
+    return np.broadcast_to(value, (number,))[i].item()
+
+
 def _material(name: str, **kwargs):
     """Second step of the old, 2-step interface to get materials. Deprecated.
 
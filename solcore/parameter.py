@@ -1,16 +1,71 @@
 from __future__ import annotations
 
+import atexit
+import os
 from abc import ABC, abstractmethod
-from functools import lru_cache
-from typing import Dict, Optional, Set, Tuple, Type, Union
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from functools import lru_cache, wraps
+from inspect import signature
+from itertools import chain
+from threading import Lock, RLock, local
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 from warnings import warn
 
+import numpy as np
+import pint
 import xarray as xr
 from pint import Quantity as Q_
 
 from .constants import pi
 
 
+def _configure_units() -> None:
+    """Make pint use array-like magnitudes, as the nk arrays of solcore require.
+
+    pint_xarray enables 'force_ndarray_like' in pint's application registry when
+    imported, which solcore only does when an nk array is first built, so quantities
+    would otherwise get scalar or array magnitudes depending on what had been used
+    before. The option is enabled when this module is imported, instead.
+
+    Note this changes pint's application registry, which is global: if it has not
+    been loaded, yet, it is replaced by a lazy registry with the option enabled, so
+    the unit definitions are still loaded only when the first quantity is created.
+    Otherwise, eg. if set with 'pint.set_application_registry', the option is
+    enabled in place, as pint_xarray would do.
+
+    Returns:
+        None
+    """
+    registry = pint.get_application_registry().get()
+    if isinstance(registry, pint.LazyRegistry):
+        pint.set_application_registry(
+            pint.LazyRegistry(kwargs={"force_ndarray_like": True})
+        )
+    elif not (registry.force_ndarray or registry.force_ndarray_like):
+        registry.force_ndarray_like = True
+
+
+_configure_units()
+
+
 class MaterialMissing(Exception):
 
     """Raised if a material does not exist in a source."""
@@ -58,19 +113,26 @@ class ParameterSourceError(Exception):
 
 
 class Parameter(Q_):
+
+    __slots__ = ("_metadata",)
+    _metadata: Tuple[str, Tuple[str, ...]]
+
     def __new__(
         cls,
-        value: Union[str, float, int, Q_],
-        units: Optional[str] = None,
+        value: Union[str, float, int, np.ndarray, Q_],
+        units: Optional[Any] = None,
         description: str = "",
         reference: Union[str, Tuple[str, ...]] = (),
     ):
         """Wrapper of the pint.Quantity class adding 'description' and 'reference'.
 
+        The description and reference are interned, so all the parameters with the
+        same metadata share it, and units given as strings are parsed only once.
+
         Args:
-            value (str, number): Magnitude value or a string with the magnitude and its
-                units.
-            units (str): Units of the magnitude.
+            value (str, number, array): Magnitude value or a string with the magnitude
+                and its units.
+            units (str): Units of the magnitude, as a string or a pint Unit.
             description (str): Short description of the meaning of the parameter.
             reference (str): Keyword reference for the parameter, ie. where the
                 parameter is coming from. Eg. 'Vurgaftman JAP 2001'
@@ -78,39 +140,37 @@ class Parameter(Q_):
         v = value
         u = units
         if isinstance(value, str):
-            parsed = Q_(value, units)
-            v = parsed.magnitude
-            u = parsed.units
+            v, u = _parse_quantity(value, units)
         elif isinstance(value, Q_):
             v = value.magnitude
             u = value.units
-        out = Q_.__new__(cls, v, u)
-        out._description = str(description)
+        elif isinstance(units, str):
+            u = _parse_units(units)
+        out = cast(Parameter, Q_.__new__(cls, v, u))
         if isinstance(reference, str):
-            out._reference = (reference,)
-        elif isinstance(reference, tuple):
-            out._reference = reference
+            reference = (reference,)
+        out._metadata = _interned(str(description), reference)
         return out
 
     @property
     def description(self) -> str:
         """Parameter's description. Long form for `d`"""
-        return self._description
+        return self._metadata[0]
 
     @property
     def d(self) -> str:
         """Parameter's description. Short form for `description`"""
-        return self._description
+        return self._metadata[0]
 
     @property
     def reference(self) -> Tuple[str, ...]:
         """Parameter's reference. Long form for `r`"""
-        return self._reference
+        return self._metadata[1]
 
     @property
     def r(self) -> Tuple[str, ...]:
         """Parameter's reference. Short form for `reference`"""
-        return self._reference
+        return self._metadata[1]
 
     def __str__(self) -> str:
         out = super(Parameter, self).__str__()
@@ -129,22 +189,581 @@ class Parameter(Q_):
         out = out.replace("Quantity", "Parameter")
         return out.replace(")>", f", '{self.d}', '{self.r}')>")
 
+    def __reduce__(self):
+        # Otherwise, pint pickles it as a plain Quantity, losing the metadata. The
+        # units are stored as a string, which is more compact, and parsed only once
+        return _restore_parameter, _parameter_state(self)
+
+    def m_as(self, units: Any) -> Any:
+        # Only the magnitude is needed, so there is no metadata to propagate
+        return Q_.to(self, units).magnitude
+
+    def __iter__(self):
+        return (_with_metadata(v, (self,)) for v in super(Parameter, self).__iter__())
+
+
+_PROPAGATED = (
+    "__add__",
+    "__radd__",
+    "__sub__",
+    "__rsub__",
+    "__mul__",
+    "__rmul__",
+    "__matmul__",
+    "__rmatmul__",
+    "__truediv__",
+    "__rtruediv__",
+    "__floordiv__",
+    "__rfloordiv__",
+    "__mod__",
+    "__rmod__",
+    "__divmod__",
+    "__rdivmod__",
+    "__pow__",
+    "__rpow__",
+    "__neg__",
+    "__pos__",
+    "__abs__",
+    "__round__",
+    "__getitem__",
+    "__copy__",
+    "__deepcopy__",
+    "__array_ufunc__",
+    "__array_function__",
+    "_numpy_method_wrap",
+    "to",
+    "to_base_units",
+    "to_root_units",
+    "to_reduced_units",
+    "clip",
+    "T",
+    "real",
+    "imag",
+)
+"""Operations of Quantity whose results get the metadata of the Parameters involved."""
+
+
+def _propagating(method: Callable) -> Callable:
+    """Wrap a method of Quantity so its result keeps the metadata of the Parameters.
+
+    Args:
+        method: The method to wrap.
+
+    Returns:
+        The wrapped method.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        value = method(self, *args, **kwargs)
+        metadata = self._metadata
+        if _shares_metadata(args, metadata) and (
+            len(kwargs) == 0 or _shares_metadata(kwargs.values(), metadata)
+        ):
+            # Most operations involve a single Parameter, so there is nothing to merge
+            return _with_metadata_of(value, self)
+        return _with_metadata(value, (self, args, kwargs))
+
+    return wrapper
+
+
+def _shares_metadata(operands: Iterable, metadata: Tuple[str, Tuple[str, ...]]) -> bool:
+    """Check if the operands of an operation add nothing to the given metadata.
+
+    Args:
+        operands: The operands, possibly nested in lists, tuples or dictionaries.
+        metadata: The interned metadata of the Parameter doing the operation.
+
+    Returns:
+        True if all the Parameters among the operands have the same metadata.
+    """
+    for o in operands:
+        if isinstance(o, Parameter):
+            if o._metadata is not metadata:
+                return False
+        elif isinstance(o, (list, tuple, dict)) and len(o) > 0:
+            values = o.values() if isinstance(o, dict) else o
+            if not _shares_metadata(values, metadata):
+                return False
+    return True
+
+
+def _with_metadata_of(value: Any, parameter: Parameter) -> Any:
+    """Give the result of an operation the metadata of the only Parameter involved.
+
+    This is a shortcut of '_with_metadata' when the Parameter is the only one or all
+    share the same metadata.
+
+    Args:
+        value: The result of the operation.
+        parameter: The Parameter.
+
+    Returns:
+        The result, as a Parameter if it is a quantity, or as it is, otherwise.
+    """
+    if isinstance(value, tuple):
+        return tuple(_with_metadata_of(v, parameter) for v in value)
+    if not isinstance(value, Q_):
+        return value
+
+    metadata = parameter._metadata
+    if isinstance(value, Parameter) and value._metadata is metadata:
+        # Eg. one of the operands, which must not be modified
+        return value
+    elif (
+        metadata[0] != ""
+        and value._units != parameter._units
+        and not _same_dimensionality(value._units, parameter._units)
+    ):
+        metadata = _interned("", metadata[1])
+    return _as_parameter(value, metadata)
+
+
+def _as_parameter(value: Q_, metadata: Tuple[str, Tuple[str, ...]]) -> Parameter:
+    """Turn the result of an operation into a Parameter with the given metadata.
+
+    Quantities are turned into Parameters sharing their magnitude and units, which
+    is much faster than creating a new Parameter, as they are already valid.
+
+    Args:
+        value: The result of the operation.
+        metadata: The interned description and reference.
+
+    Returns:
+        The Parameter, which is the same value if it was a Parameter already.
+    """
+    if isinstance(value, Parameter):
+        out = value
+    else:
+        out = object.__new__(Parameter)
+        # Quantities of a registry's own class have the registry as class attribute
+        out.__dict__.update(value.__dict__, _REGISTRY=value._REGISTRY)
+    out._metadata = metadata
+    return out
+
+
+for _name in _PROPAGATED:
+    _attr = getattr(Q_, _name)
+    if isinstance(_attr, property) and _attr.fget is not None:
+        setattr(Parameter, _name, property(_propagating(_attr.fget)))
+    else:
+        setattr(Parameter, _name, _propagating(_attr))
+
+
+def _with_metadata(value: Any, operands: Any) -> Any:
+    """Give the result of an operation the metadata of the Parameters involved.
+
+    The references of all the Parameters are merged, as for calculable parameters.
+    The description is kept if all the Parameters share it and the result has their
+    dimensionality, eg. when slicing, reducing or converting units; otherwise, it is
+    dropped since the result is a different magnitude.
+
+    Args:
+        value: The result of the operation.
+        operands: The inputs of the operation, possibly nested in lists, tuples or
+            dictionaries.
+
+    Returns:
+        The result, as a Parameter if it is a quantity and any operand is a
+        Parameter, or as it is, otherwise.
+    """
+    if isinstance(value, tuple):
+        return tuple(_with_metadata(v, operands) for v in value)
+    if not isinstance(value, Q_):
+        return value
+
+    params: List[Parameter] = []
+    if _find_parameters(operands, value, params) or len(params) == 0:
+        return value
+
+    description = params[0].d
+    units = value._units
+    for p in params:
+        if p.d != description or (
+            p._units != units and not _same_dimensionality(p._units, units)
+        ):
+            description = ""
+            break
+    reference = tuple(dict.fromkeys(chain.from_iterable(p.r for p in params)))
+    return _as_parameter(value, _interned(description, reference))
+
+
+def _find_parameters(operands: Iterable, value: Any, found: List[Parameter]) -> bool:
+    """Collect the Parameters among the operands of an operation.
+
+    Args:
+        operands: The operands, possibly nested in lists, tuples or dictionaries.
+        value: The result of the operation.
+        found: The Parameters found so far. It is updated in place.
+
+    Returns:
+        True if the result is one of the operands, in which case the search stops.
+    """
+    for o in operands:
+        if o is value:
+            return True
+        elif isinstance(o, Parameter):
+            found.append(o)
+        elif isinstance(o, (list, tuple, dict)) and len(o) > 0:
+            values = o.values() if isinstance(o, dict) else o
+            if _find_parameters(values, value, found):
+                return True
+    return False
+
+
+def _parameter_state(value: Q_) -> Tuple[Any, str, Optional[str], Tuple[str, ...]]:
+    """Compact state of a Parameter or Quantity, made of plain Python objects.
+
+    Args:
+        value: The Parameter or Quantity.
+
+    Returns:
+        A tuple with the magnitude, the units as a string and the description and
+        reference, if it is a Parameter, or None and an empty tuple otherwise.
+    """
+    magnitude = value.magnitude
+    if isinstance(magnitude, np.ndarray) and magnitude.ndim == 0:
+        magnitude = magnitude.item()
+    if isinstance(value, Parameter):
+        return magnitude, _format_units(value.units), value.d, value.r
+    return magnitude, _format_units(value.units), None, ()
+
+
+def _restore_parameter(
+    magnitude: Any, units: str, description: Optional[str], reference: Tuple[str, ...]
+) -> Q_:
+    """Build a Parameter or Quantity out of its state (see '_parameter_state').
+
+    Args:
+        magnitude: The magnitude.
+        units: The units, as a string.
+        description: The description or None, if the value is a Quantity.
+        reference: The reference.
+
+    Returns:
+        The Parameter or Quantity.
+    """
+    if description is None:
+        return Q_(magnitude, _parse_units(units))
+    return Parameter(magnitude, _parse_units(units), description, reference)
+
+
+def _detached(value: Any) -> Any:
+    """Copy of a value that can be changed without affecting the original.
+
+    Only the magnitude, if it is an array, is copied, as the units and metadata are
+    immutable, which is much faster than building a new Parameter.
+
+    Args:
+        value: The value to copy, usually a Parameter.
+
+    Returns:
+        The copy.
+    """
+    if not isinstance(value, Q_):
+        return copy(value)
+
+    out = object.__new__(type(value))
+    out.__dict__.update(value.__dict__)
+    if isinstance(value._magnitude, np.ndarray):
+        out._magnitude = value._magnitude.copy()
+    if isinstance(value, Parameter):
+        cast(Parameter, out)._metadata = value._metadata
+    return out
+
+
+@lru_cache(maxsize=4096)
+def _interned(
+    description: str, reference: Tuple[str, ...]
+) -> Tuple[str, Tuple[str, ...]]:
+    """The first description and reference seen equal to the given ones.
+
+    Args:
+        description: The description of a parameter.
+        reference: The reference of a parameter.
+
+    Returns:
+        A tuple with the description and reference.
+    """
+    return description, reference
+
+
+@lru_cache(maxsize=1024)
+def _same_dimensionality(units: Any, other: Any) -> bool:
+    """Check if two units have the same dimensionality, which is slow with pint.
+
+    Args:
+        units: The units, as a pint UnitsContainer.
+        other: The other units, as a pint UnitsContainer.
+
+    Returns:
+        True if they have the same dimensionality.
+    """
+    return Q_(1, units).dimensionality == Q_(1, other).dimensionality
+
+
+@lru_cache(maxsize=1024)
+def _parse_quantity(value: str, units: Optional[Any]) -> Tuple[Any, Any]:
+    """Parse a string with a quantity, eg. '1.5 eV', which pint does every time.
+
+    Args:
+        value: The string with the magnitude and, possibly, the units.
+        units: The units, if they are not part of the string.
+
+    Returns:
+        A tuple with the magnitude and a pint Unit object.
+    """
+    parsed: Q_ = Q_(value, units)
+    magnitude = parsed.magnitude
+    if isinstance(magnitude, np.ndarray) and magnitude.ndim == 0:
+        magnitude = magnitude.item()
+    return magnitude, parsed.units
+
+
+@lru_cache(maxsize=None)
+def _format_units(units: Any) -> str:
+    """String representation of the units, which is slow to obtain with pint.
+
+    Args:
+        units: A pint Unit object.
+
+    Returns:
+        The units as a string that '_parse_units' understands.
+    """
+    return str(units)
+
+
+class Context(Mapping):
+
+    """Immutable inputs of an enquiry, shared by reference during its resolution.
+
+    A context holds the external inputs (eg. T, Na, Nd and comp) and any value already
+    known, like the parameters resolved so far by a Material. It is passed as it is
+    from the ParameterManager to the sources and back, rather than unpacked into
+    keyword arguments at every step, and the information derived from it - its keys
+    in the resolution cache and the magnitudes of its values - is obtained only once.
+    """
+
+    __slots__ = ("_values", "_names", "_keys", "_magnitudes", "_arrays")
+
+    def __init__(self, values: Optional[Mapping[str, Any]] = None, **kwargs):
+        """Create a context out of a mapping and/or keyword arguments.
+
+        Args:
+            values: The values of the context.
+            **kwargs: More values of the context.
+        """
+        self._values: Dict[str, Any] = dict(values if values is not None else {})
+        self._values.update(kwargs)
+        self._names: Optional[FrozenSet[str]] = None
+        self._keys: Dict[Optional[FrozenSet[str]], Hashable] = {}
+        self._magnitudes: Optional[Dict[str, Any]] = None
+        self._arrays: Optional[bool] = None
+
+    def __getitem__(self, item: str) -> Any:
+        return self._values[item]
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"Context({self._values})"
+
+    @classmethod
+    def of(cls, context: Optional[Context], kwargs: Dict[str, Any]) -> Context:
+        """Context of an enquiry given as a context, keyword arguments or both.
+
+        Args:
+            context: The context of the enquiry, if any.
+            kwargs: Other input arguments, which take precedence over the context.
+
+        Returns:
+            The same context if there are no other arguments or a new one.
+        """
+        if context is None:
+            return cls(kwargs)
+        return context.replace(**kwargs) if len(kwargs) > 0 else context
+
+    def replace(self, **kwargs) -> Context:
+        """Create a new context adding or replacing some values.
+
+        Args:
+            **kwargs: The new values.
+
+        Returns:
+            A new context with the new values.
+        """
+        return Context(self._values, **kwargs)
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        """Names of the values in the context.
+
+        Returns:
+            A frozenset with the names.
+        """
+        if self._names is None:
+            self._names = frozenset(self._values)
+        return self._names
+
+    @property
+    def key(self) -> Optional[Hashable]:
+        """Hashable representation of the context (see '_hashable').
+
+        Returns:
+            The representation or None if any of the values cannot be hashed.
+        """
+        return self.key_of(None)
+
+    def key_of(self, names: Optional[FrozenSet[str]]) -> Optional[Hashable]:
+        """Hashable representation of some of the values of the context.
+
+        Enquiries that depend on a few of the values only are keyed by those, so the
+        rest of the context does not affect them. The representation is obtained once
+        for each set of names.
+
+        Args:
+            names: Names of the values to represent, or None for all of them. Names
+                missing from the context are ignored.
+
+        Returns:
+            The representation or None if any of the values cannot be hashed.
+        """
+        try:
+            key = self._keys[names]
+        except KeyError:
+            values = self._values
+            if names is not None:
+                values = {k: values[k] for k in names if k in values}
+            key = _hashable(values)
+            try:
+                hash(key)
+            except TypeError:
+                key = _UNHASHABLE
+            self._keys[names] = key
+        return None if key is _UNHASHABLE else key
+
+    @property
+    def magnitudes(self) -> Dict[str, Any]:
+        """Values of the context, replacing Quantities by their magnitudes.
+
+        Returns:
+            A dictionary with the magnitudes.
+        """
+        if self._magnitudes is None:
+            self._magnitudes = {
+                k: (v.magnitude if isinstance(v, Q_) else v)
+                for k, v in self._values.items()
+            }
+        return self._magnitudes
+
+    @property
+    def has_arrays(self) -> bool:
+        """If any of the values of the context is an array or has array magnitude.
+
+        Returns:
+            True if there are arrays in the context.
+        """
+        if self._arrays is None:
+            self._arrays = any(np.ndim(v) > 0 for v in self.magnitudes.values())
+        return self._arrays
+
+
+_UNHASHABLE = object()
+"""Marker of contexts with values that cannot be hashed."""
+
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+"""Statistics of the ParameterManager resolution cache."""
+
+
+def _hashable(value: Any) -> Hashable:
+    """Transform a parameter input argument into something that can be hashed.
+
+    Quantities are represented by their magnitude and units, so the (expensive)
+    conversion to base units of Quantity.__hash__ is avoided. Zero-dimensional arrays,
+    used as magnitudes as solcore sets pint to force ndarray-like magnitudes, are
+    replaced by the scalar they contain. If the magnitude is not hashable (eg. an
+    array), hashing the result will fail.
+
+    Args:
+        value: The value to transform.
+
+    Returns:
+        A hashable representation of the value.
+    """
+    if isinstance(value, Q_):
+        return _hashable(value.magnitude), value.units
+    elif isinstance(value, np.ndarray) and value.ndim == 0:
+        return value.item()
+    elif isinstance(value, Mapping):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    return value
+
 
 class ParameterManager:
 
+    """Registry of parameter sources, in charge of dispatching the enquiries.
+
+    The manager is a singleton that can be used from several threads at once. Its
+    initialization and the loading and indexing of sources are guarded by a lock and
+    the tables of sources and of available parameters are never modified in place,
+    but replaced by updated copies, so enquiries can read them without locking. The
+    resolution cache has its own lock and the bookkeeping of an enquiry in progress
+    is kept per thread.
+    """
+
     _instance = None
+    _lock = RLock()
+    _cache_maxsize: int = 4096
+    _map_chunksize: int = 32
 
     def __new__(cls):
         if cls._instance is None:
-            inst = object.__new__(cls)
-            inst._known_sources = {}
-            inst.sources = {}
-            cls._instance = inst
+            with cls._lock:
+                if cls._instance is None:
+                    inst = object.__new__(cls)
+                    inst._known_sources = {}
+                    inst.sources = {}
+                    inst._cache = OrderedDict()
+                    inst._cache_lock = Lock()
+                    inst._cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+                    inst._dependencies = {}
+                    inst._local = local()
+                    inst._index = {}
+                    inst._any_material = {}
+                    inst._indexed = frozenset()
+                    inst._initialized = False
+                    inst._load_times = {}
+                    inst._executor = None
+                    inst._executor_key = None
+                    atexit.register(inst.shutdown)
+                    cls._instance = inst
         return cls._instance
 
     def __init__(self):
         self._known_sources: Dict[str, Type[ParameterSourceBase]]
         self.sources: Dict[str, ParameterSourceBase]
+        self._cache: OrderedDict[Hashable, Tuple[Parameter, Set[str]]]
+        self._cache_lock: Lock
+        self._cache_stats: Dict[str, int]
+        self._dependencies: Dict[Hashable, Optional[FrozenSet[str]]]
+        self._local: local
+        self._index: Dict[Tuple[str, str], FrozenSet[str]]
+        self._any_material: Dict[str, FrozenSet[str]]
+        self._indexed: FrozenSet[str]
+        self._initialized: bool
+        self._load_times: Dict[str, float]
+        self._executor: Optional[ProcessPoolExecutor]
+        self._executor_key: Optional[Tuple[int, Tuple[str, ...]]]
 
     def gather_sources(self) -> None:
         """Scan several standard locations to register known sources.
@@ -155,18 +774,66 @@ class ParameterManager:
         from . import parameter_sources  # noqa: F401
 
     def initialize(self) -> None:
-        """Imports all known sources
+        """Registers all known sources, discarding any source already loaded.
+
+        Sources are not loaded here, but the first time they are needed. Use 'preload'
+        to load them in advance.
 
         Returns:
             None
         """
+        # Sources register themselves when imported, so this is done before taking the
+        # lock to avoid dead-locks with the import machinery
         self.gather_sources()
-        for source in self.known_sources:
-            self.sources[source] = self._known_sources[source].load_source(source)
+        with self._lock:
+            self.sources = {}
+            self._indexed = frozenset()
+            self._index = {}
+            self._any_material = {}
+            self._load_times = {}
+            self._initialized = True
+            self.clear_cache()
+
+    def _ensure_initialized(self) -> None:
+        """Initialize the manager if it has not been initialized, yet.
+
+        Returns:
+            None
+        """
+        if not self._initialized:
+            self.gather_sources()
+            with self._lock:
+                if not self._initialized:
+                    self.initialize()
+
+    def preload(self, source: Union[str, Tuple[str, ...]] = ()) -> None:
+        """Loads the selected sources in advance, rather than on first use.
+
+        Args:
+            source (Union[str, Tuple[str], None]): Source name or list of source
+                names to load. By default, all known sources are loaded.
+
+        Returns:
+            None
+        """
+        for s in self._normalise_source(source):
+            self._load_source(s)
+
+    @property
+    def load_times(self) -> Dict[str, float]:
+        """Time, in seconds, that took to load and index each of the loaded sources.
+
+        Returns:
+            A dictionary with the load time of each source.
+        """
+        return dict(self._load_times)
 
     def add_source(self, name: str, source_class: Type[ParameterSourceBase]) -> None:
         """Adds a parameters source class to the registry.
 
+        The source is not loaded until it is needed. If a source with the same name had
+        been loaded already, it is discarded.
+
         Args:
             name (str): Name of the source
             source_class (ParameterSource): Class to register.
@@ -174,12 +841,17 @@ class ParameterManager:
         Returns:
             None
         """
-        if name in self.known_sources:
-            warn(f"ParameterSource name '{name}' already exists.")
-
-        self._known_sources[name] = source_class
-        self._normalise_source.cache_clear()
-        self._validate_source.cache_clear()
+        with self._lock:
+            if name in self.known_sources:
+                warn(f"ParameterSource name '{name}' already exists.")
+
+            self._known_sources = {**self._known_sources, name: source_class}
+            self._normalise_source.cache_clear()
+            self._validate_source.cache_clear()
+            if name in self.sources:
+                self.sources = {k: v for k, v in self.sources.items() if k != name}
+                self._unindex_source(name)
+            self.clear_cache()
 
     @property
     def known_sources(self) -> Tuple[str, ...]:
@@ -191,6 +863,8 @@ class ParameterManager:
         material: str,
         parameter: str,
         source: Union[str, Tuple[str, ...]] = (),
+        use_cache: bool = True,
+        context: Optional[Context] = None,
         **kwargs,
     ) -> Parameter:
         """Retrieve the parameter for the material.
@@ -198,13 +872,27 @@ class ParameterManager:
         Any arguments that obtaining this parameter requires must be included as
         keyword arguments in the call.
 
+        Results are stored in a bounded, least-recently-used cache keyed by the
+        material, the parameter, the sources and the input arguments, so repeated
+        enquiries do not need to go through the sources again. Inputs that cannot be
+        hashed (eg. arrays) skip the cache. Each caller gets its own copy of a cached
+        value, so changing it in place does not affect the cache.
+
+        The input arguments can be given as a Context, which is passed as it is to the
+        sources, as keyword arguments or both.
+
         Args:
             material (str): Material the enquiry is about.
             parameter (str): The parameter of interest.
             source (Union[str, Tuple[str], None]): Source name or list of source
                 names in which to look for the information. By default, all available
                 sources are used.
+            use_cache (bool): If False, the cache is neither checked nor updated for
+                this enquiry nor for those made to resolve it, eg. the arguments of a
+                calculable parameter.
+            context (Optional[Context]): The input arguments of the enquiry.
             **kwargs: Any other argument needed to calculate the requested parameter.
+                They take precedence over the values in the context.
 
         Raises
             MaterialMissing: if the material does not exist in the selected sources
@@ -216,11 +904,298 @@ class ParameterManager:
             A Parameter object with the requested parameter.
         """
         nsource = self._normalise_source(source)
-        for s in nsource:
-            if parameter in self.sources[s].parameters(material):
-                return self.sources[s].get_parameter(material, parameter, **kwargs)
-        else:
-            raise ParameterMissing(nsource, material, parameter)
+        context = Context.of(context, kwargs)
+        use_cache = use_cache and self.caching
+        key = (
+            self._cache_key(material, parameter, nsource, context)
+            if use_cache
+            else None
+        )
+        if key is not None:
+            with self._cache_lock:
+                entry = self._cache.get(key)
+                if entry is not None:
+                    self._cache.move_to_end(key)
+                    self._cache_stats["hits"] += 1
+            if entry is not None:
+                self._track_sources(entry[1])
+                return _detached(entry[0])
+
+        resolving = self._resolving
+        resolving.append(set())
+        if not use_cache:
+            # Nested enquiries in this thread skip the cache, too
+            self._local.uncached = getattr(self._local, "uncached", 0) + 1
+        try:
+            s = self._find_source(material, parameter, nsource)
+            resolving[-1].add(s)
+            source_ = self.sources[s]
+            value = (
+                source_.get_parameter_in_context(material, parameter, context)
+                if isinstance(source_, ParameterSourceBase)
+                else source_.get_parameter(material, parameter, **context)
+            )
+        finally:
+            used = resolving.pop()
+            if not use_cache:
+                self._local.uncached -= 1
+
+        self._track_sources(used)
+        if key is not None:
+            with self._cache_lock:
+                self._cache_stats["misses"] += 1
+                self._cache[key] = (_detached(value), used)
+                if len(self._cache) > self._cache_maxsize:
+                    self._cache.popitem(last=False)
+                    self._cache_stats["evictions"] += 1
+        return value
+
+    def get_parameter_grid(
+        self,
+        material: str,
+        parameter: str,
+        source: Union[str, Tuple[str, ...]] = (),
+        **kwargs,
+    ) -> xr.DataArray:
+        """Retrieve the parameter for the material over a grid of external inputs.
+
+        Any of the temperature (T) and doping densities (Na and Nd), as well as the
+        fractions in the composition (comp), can be given as one dimensional arrays.
+        Each of them becomes a dimension of the output, named after the input or the
+        element, and the parameter is evaluated once over the whole grid, rather than
+        point by point.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            source (Union[str, Tuple[str], None]): Source name or list of source
+                names in which to look for the information. By default, all available
+                sources are used.
+            **kwargs: Any other argument needed to calculate the requested parameter.
+                T, Na and Nd must be Quantities, with scalar or 1D array magnitudes.
+
+        Raises
+            ValueError: if any of the swept inputs is not a 1D array
+            MaterialMissing: if the material does not exist in the selected sources
+            ParameterMissing: if the parameter does not exist for that material in any
+                of the selected sources
+            InputArgumentMissing: if there is a problem when retrieving the parameter.
+
+        Returns:
+            A DataArray with the parameter, with the swept inputs as coordinates.
+        """
+        import pint_xarray  # noqa: F401
+
+        comp = kwargs.get("comp", {})
+        axes = {
+            k: kwargs[k] for k in ("T", "Na", "Nd") if np.ndim(kwargs.get(k, 0)) > 0
+        }
+        axes.update({k: np.asarray(v) for k, v in comp.items() if np.ndim(v) > 0})
+        if any(np.ndim(v) != 1 for v in axes.values()):
+            raise ValueError(
+                f"Swept inputs {tuple(axes)} must be one dimensional arrays."
+            )
+
+        inputs = dict(kwargs, comp=dict(comp))
+        for i, (k, v) in enumerate(axes.items()):
+            shape = tuple(-1 if j == i else 1 for j in range(len(axes)))
+            if k in comp:
+                inputs["comp"][k] = v.reshape(shape)
+            else:
+                inputs[k] = v.reshape(shape)
+        if "comp" not in kwargs:
+            del inputs["comp"]
+
+        value = self.get_parameter(material, parameter, source, **inputs)
+        shape = tuple(len(v) for v in axes.values())
+        data = xr.DataArray(
+            np.broadcast_to(value.magnitude, shape),
+            name=parameter,
+            dims=tuple(axes),
+            coords={k: getattr(v, "magnitude", v) for k, v in axes.items()},
+            attrs={"description": value.d, "reference": value.r},
+        )
+        units: Dict[Hashable, Any] = {data.name: value.units}
+        units.update({k: v.units for k, v in axes.items() if k not in comp})
+        return data.pint.quantify(units)
+
+    def map(
+        self,
+        requests: Iterable[Mapping[str, Any]],
+        processes: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ) -> List[Union[Parameter, Exception]]:
+        """Retrieve many parameters at once, spreading the work over several processes.
+
+        Each request is a mapping with the arguments of 'get_parameter', eg.
+        {"material": "GaAs", "parameter": "band_gap", "T": Q_(300, "K")}. The worker
+        processes are started the first time they are needed, loading the sources
+        already loaded by this manager, and are kept for later calls until the sources
+        or the cache change (see 'shutdown'). Sources registered at runtime are only
+        available to the workers if the processes are forked.
+
+        Args:
+            requests (Iterable[Mapping]): The enquiries to evaluate.
+            processes (Optional[int]): Number of worker processes. By default, as many
+                as CPUs are available, but no more than one per 32 requests, so
+                a few requests are evaluated serially in this process, as
+                they are when processes is 1.
+            chunksize (Optional[int]): Number of requests sent to a worker at once. By
+                default, the requests are split in about four chunks per worker, of at
+                least 32 requests each.
+
+        Returns:
+            A list with the parameters, in the same order as the requests. If an
+            enquiry fails, the exception raised takes the place of its parameter.
+        """
+        requests = list(requests)
+        if processes is None:
+            processes = min(os.cpu_count() or 1, len(requests) // self._map_chunksize)
+        processes = min(processes, len(requests))
+        if processes <= 1:
+            return [_evaluate(r) for r in requests]
+
+        if chunksize is None:
+            chunksize, extra = divmod(len(requests), processes * 4)
+            chunksize = max(chunksize + (1 if extra else 0), self._map_chunksize)
+
+        return list(self._pool(processes).map(_evaluate, requests, chunksize=chunksize))
+
+    def _pool(self, processes: int) -> ProcessPoolExecutor:
+        """The worker processes used by 'map', started if needed.
+
+        The pool is replaced if it has a different number of processes or if the
+        sources loaded by this manager have changed since it was started.
+
+        Args:
+            processes (int): Number of worker processes.
+
+        Returns:
+            The executor running the worker processes.
+        """
+        key = (processes, tuple(self.sources))
+        with self._lock:
+            if self._executor is None or self._executor_key != key:
+                self.shutdown()
+                self._executor = ProcessPoolExecutor(
+                    processes, initializer=_init_worker, initargs=(key[1],)
+                )
+                self._executor_key = key
+            return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker processes used by 'map', if any.
+
+        This is done automatically when the sources or the cache change, as the
+        workers keep their own, and when the interpreter exits.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._executor_key = None
+        if executor is not None:
+            executor.shutdown()
+
+    def cache_info(self) -> CacheInfo:
+        """Statistics of the resolution cache used by 'get_parameter'.
+
+        Returns:
+            A CacheInfo named tuple with the hits, misses, evictions, maximum size and
+            current size of the cache.
+        """
+        with self._cache_lock:
+            return CacheInfo(
+                maxsize=self._cache_maxsize,
+                currsize=len(self._cache),
+                **self._cache_stats,
+            )
+
+    def clear_cache(self, source: Optional[str] = None) -> None:
+        """Clear the resolution cache used by 'get_parameter'.
+
+        The loaded sources are also asked to clear any cache they keep (see
+        'ParameterSourceBase.clear_cache'), as they might depend on the changes.
+
+        Args:
+            source (Optional[str]): If provided, only the entries that depend, directly
+                or indirectly, on this source are removed. Otherwise, the whole cache
+                is cleared and the statistics reset.
+
+        Returns:
+            None
+        """
+        for loaded in self.sources.values():
+            loaded.clear_cache()
+        self.shutdown()
+
+        with self._cache_lock:
+            self._dependencies.clear()
+            if source is None:
+                self._cache.clear()
+                self._cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+                return
+
+            for key in [k for k, (_, used) in self._cache.items() if source in used]:
+                del self._cache[key]
+
+    def _cache_key(
+        self, material: str, parameter: str, nsource: Tuple[str, ...], context: Context,
+    ) -> Optional[Hashable]:
+        """Build the key of the resolution cache for an enquiry.
+
+        Only the inputs the parameter depends on (see 'dependencies') are part of the
+        key, so the enquiry hits the cache whatever else the context holds, eg. other
+        parameters. If the dependencies are not known, all inputs are.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            nsource (Tuple[str, ...]): Normalised sources of the enquiry.
+            context (Context): Input arguments of the enquiry.
+
+        Returns:
+            The key or None if any of the inputs cannot be hashed.
+        """
+        key = context.key_of(self._find_dependencies(material, parameter, nsource))
+        if key is None:
+            return None
+        return material, parameter, nsource, key
+
+    @property
+    def caching(self) -> bool:
+        """If the enquiries in progress in the current thread use the cache.
+
+        Returns:
+            False if any of them was made with 'use_cache=False'.
+        """
+        return getattr(self._local, "uncached", 0) == 0
+
+    @property
+    def _resolving(self) -> List[Set[str]]:
+        """Sources used by each of the enquiries in progress in the current thread.
+
+        Returns:
+            A list with a set of sources per enquiry, the innermost one last.
+        """
+        try:
+            return self._local.resolving
+        except AttributeError:
+            self._local.resolving = []
+            return self._local.resolving
+
+    def _track_sources(self, used: Set[str]) -> None:
+        """Record the sources used in a resolution in the enclosing enquiry, if any.
+
+        Args:
+            used (Set[str]): Sources used to resolve a parameter.
+
+        Returns:
+            None
+        """
+        if len(self._resolving) > 0:
+            self._resolving[-1].update(used)
 
     def get_nk(
         self, material: str, source: Union[str, Tuple[str, ...]] = (), **kwargs,
@@ -246,11 +1221,131 @@ class ParameterManager:
             A DataArray with the refractive index for the chosen material.
         """
         nsource = self._normalise_source(source)
-        for s in nsource:
-            if "nk" in self.sources[s].parameters(material):
-                return self.sources[s].get_nk(material, **kwargs)
-        else:
-            raise ParameterMissing(nsource, material, "nk")
+        s = self._find_source(material, "nk", nsource)
+        return self.sources[s].get_nk(material, **kwargs)
+
+    def find_source(
+        self, material: str, parameter: str, source: Union[str, Tuple[str, ...]] = (),
+    ) -> str:
+        """Find the source that provides the parameter for the material.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            source (Union[str, Tuple[str], None]): Source name or list of source
+                names in which to look for the information. By default, all available
+                sources are used.
+
+        Raises
+            ParameterMissing: if the parameter does not exist for that material in any
+                of the selected sources
+
+        Returns:
+            The name of the first of the selected sources providing the parameter.
+        """
+        return self._find_source(material, parameter, self._normalise_source(source))
+
+    def dependencies(
+        self,
+        material: str,
+        parameter: str,
+        source: Union[str, Tuple[str, ...]] = (),
+        provided: FrozenSet[str] = frozenset(),
+    ) -> Optional[FrozenSet[str]]:
+        """Inputs and parameters the parameter depends on, directly or indirectly.
+
+        The dependencies are obtained from the sources providing the parameter and its
+        dependencies in turn (see 'ParameterSourceBase.dependencies'). As with the
+        enquiries sources make to resolve a parameter, only the source of the parameter
+        itself is restricted to the selected ones. Names that no source provides, like
+        the temperature, are inputs of the enquiry and have no further dependencies,
+        as do the names provided as inputs.
+
+        The results are kept until the cache is cleared, keyed by the provided names
+        the parameter can actually depend on, only.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            source (Union[str, Tuple[str], None]): Source name or list of source
+                names in which to look for the information. By default, all available
+                sources are used.
+            provided (FrozenSet[str]): Names of the parameters given as inputs.
+
+        Returns:
+            A frozenset with the names of the dependencies or None if any of the
+            sources involved does not know the dependencies of a parameter.
+        """
+        return self._find_dependencies(
+            material, parameter, self._normalise_source(source), provided
+        )
+
+    def _find_dependencies(
+        self,
+        material: str,
+        parameter: str,
+        nsource: Tuple[str, ...],
+        provided: FrozenSet[str] = frozenset(),
+    ) -> Optional[FrozenSet[str]]:
+        """Dependencies of the parameter given the normalised sources.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            nsource (Tuple[str, ...]): Normalised sources of the enquiry.
+            provided (FrozenSet[str]): Names of the parameters given as inputs.
+
+        Returns:
+            A frozenset with the names of the dependencies or None if they are not
+            known.
+        """
+        if len(provided) > 0:
+            everything = self._find_dependencies(material, parameter, nsource)
+            if everything is not None:
+                provided = provided & everything
+                if len(provided) == 0:
+                    return everything
+
+        key = (material, parameter, nsource, provided)
+        try:
+            return self._dependencies[key]
+        except KeyError:
+            pass
+
+        anywhere = self._normalise_source(())
+        result: Optional[Set[str]] = set()
+        pending = [(material, parameter, nsource)]
+        visited = set()
+        while len(pending) > 0 and result is not None:
+            m, p, sources = pending.pop()
+            if (m, p, sources) in visited:
+                continue
+            visited.add((m, p, sources))
+
+            try:
+                s = self._find_source(m, p, sources)
+            except ParameterMissing:
+                continue
+
+            source_ = self.sources[s]
+            direct = (
+                source_.dependencies(m, p)
+                if isinstance(source_, ParameterSourceBase)
+                else None
+            )
+            if direct is None:
+                result = None
+                continue
+
+            for dm, dp in direct:
+                result.add(dp)
+                if dp not in provided:
+                    pending.append((dm, dp, anywhere))
+
+        out = frozenset(result) if result is not None else None
+        with self._cache_lock:
+            self._dependencies[key] = out
+        return out
 
     def get_multiple_parameters(
         self,
@@ -258,6 +1353,7 @@ class ParameterManager:
         include: Union[Tuple[str, ...], None] = None,
         exclude: Union[str, Tuple[str, ...], None] = None,
         source: Union[str, Tuple[str, ...]] = (),
+        context: Optional[Context] = None,
         **kwargs,
     ) -> Dict[str, Parameter]:
         """Retrieve multiple parameters for the material (defaults to all available).
@@ -274,6 +1370,8 @@ class ParameterManager:
             source (Union[str, Tuple[str], None]): Source name or list of source
                 names in which to look for the information. By default, all available
                 sources are used.
+            context (Optional[Context]): The input arguments, as a Context. They can
+                also be given as keyword arguments, which take precedence.
             **kwargs: Any other argument needed to calculate the requested parameter.
 
         Raises
@@ -300,12 +1398,201 @@ class ParameterManager:
                 param = param | set(self._load_source(s).parameters(material))
             parameters = tuple(param)
 
+        context = Context.of(context, kwargs)
         return {
-            p: self.get_parameter(material, p, nsource, **kwargs)
+            p: self.get_parameter(material, p, nsource, context=context)
             for p in parameters
             if p not in exclude
         }
 
+    def reindex_source(self, source: str) -> None:
+        """Refresh the information about a source that has changed.
+
+        The entries of the source in the index of available parameters are rebuilt
+        and any cached value depending on the source is discarded. Nothing is done if
+        the source has not been indexed, yet.
+
+        Args:
+            source (str): The name of the source that has changed.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if source not in self._indexed:
+                return
+
+            self._index_source(source)
+            self.clear_cache(source)
+
+    def reload_source(self, source: str) -> None:
+        """Load again a source whose data have changed, eg. its file was modified.
+
+        The new instance replaces the old one, which enquiries in progress in other
+        threads can still use, and only the cached values depending on the source are
+        discarded. If the source now provides a different set of parameters, any
+        cached value might have been resolved differently, so the whole cache is
+        cleared. Nothing is loaded if the source is not in use, yet. The class of
+        the source must discard its previous instance beforehand, if it keeps one.
+
+        Args:
+            source (str): The name of the source that has changed.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            # The priority of the source might have changed, too
+            self._normalise_source.cache_clear()
+            if source not in self.sources:
+                return
+
+            provided = {k for k, v in self._index.items() if source in v}
+            loaded = self._known_sources[source].load_source(source)
+            self.sources = {**self.sources, source: loaded}
+            self._index_source(source)
+            if provided == {k for k, v in self._index.items() if source in v}:
+                self.clear_cache(source)
+            else:
+                self.clear_cache()
+
+    def remove_source(self, name: str) -> None:
+        """Removes a parameters source from the registry, eg. if its file is gone.
+
+        Args:
+            name (str): Name of the source.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if name not in self._known_sources:
+                return
+
+            self._known_sources = {
+                k: v for k, v in self._known_sources.items() if k != name
+            }
+            self._normalise_source.cache_clear()
+            self._validate_source.cache_clear()
+            if name in self.sources:
+                self.sources = {k: v for k, v in self.sources.items() if k != name}
+                self._unindex_source(name)
+            self.clear_cache(name)
+
+    def _find_source(
+        self, material: str, parameter: str, nsource: Tuple[str, ...]
+    ) -> str:
+        """Find the source that provides the parameter using the index.
+
+        Sources are loaded as needed, in order of preference, until one providing the
+        parameter is found. Sources that declare they cannot provide it are skipped
+        without being loaded.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            nsource (Tuple[str, ...]): Normalised sources in which to look for the
+                information, in order of preference.
+
+        Raises
+            ParameterMissing: if the parameter does not exist for that material in any
+                of the selected sources
+
+        Returns:
+            The name of the first of the selected sources providing the parameter.
+        """
+        for s in nsource:
+            provides = getattr(self._known_sources.get(s), "_provides", None)
+            if provides is not None and parameter not in provides:
+                continue
+            elif s not in self.sources:
+                self._load_source(s)
+            elif s not in self._indexed:
+                with self._lock:
+                    if s not in self._indexed:
+                        self._index_source(s)
+
+            providers = self._index.get(
+                (material, parameter), self._any_material.get(parameter, frozenset())
+            )
+            if s in providers:
+                return s
+        raise ParameterMissing(nsource, material, parameter)
+
+    def _index_source(self, source: str) -> None:
+        """Add the parameters provided by a loaded source to the index.
+
+        The index links each (material, parameter) pair to the sources providing it.
+        Parameters of sources that do not depend on the material, like calculables,
+        are kept separately and merged with the material specific entries. Any
+        previous entry of the source is removed first, so this can also be used to
+        refresh the index after a source has changed.
+
+        The updated tables replace the old ones once they are complete, so enquiries in
+        other threads never see them half-way through. It must be called holding the
+        lock of the manager.
+
+        Args:
+            source (str): The name of the source to index.
+
+        Returns:
+            None
+        """
+        index, any_material = self._without_source(source)
+
+        loaded = self.sources[source]
+        if loaded.any_material:
+            for p in loaded.parameters(""):
+                any_material[p] = any_material.get(p, frozenset()) | {source}
+                for key, providers in index.items():
+                    if key[1] == p:
+                        index[key] = providers | {source}
+        else:
+            for m in loaded.materials:
+                for p in loaded.parameters(m):
+                    providers = index.get((m, p), any_material.get(p, frozenset()))
+                    index[(m, p)] = providers | {source}
+
+        self._any_material = any_material
+        self._index = index
+        self._indexed = self._indexed | {source}
+
+    def _unindex_source(self, source: str) -> None:
+        """Remove a source from the index of available parameters.
+
+        It must be called holding the lock of the manager.
+
+        Args:
+            source (str): The name of the source to remove.
+
+        Returns:
+            None
+        """
+        index, any_material = self._without_source(source)
+        self._indexed = self._indexed - {source}
+        self._any_material = any_material
+        self._index = index
+
+    def _without_source(
+        self, source: str
+    ) -> Tuple[Dict[Tuple[str, str], FrozenSet[str]], Dict[str, FrozenSet[str]]]:
+        """Copies of the index tables with the entries of a source removed.
+
+        Args:
+            source (str): The name of the source to remove.
+
+        Returns:
+            A tuple with the material specific and the material agnostic tables.
+        """
+        index = {
+            k: (v - {source} if source in v else v) for k, v in self._index.items()
+        }
+        any_material = {
+            k: (v - {source} if source in v else v)
+            for k, v in self._any_material.items()
+        }
+        return index, any_material
+
     @lru_cache(maxsize=128)
     def _validate_source(self, source: str) -> None:
         """Checks if a source is a known source
@@ -327,7 +1614,10 @@ class ParameterManager:
             raise ParameterSourceError(msg)
 
     def _load_source(self, source: str) -> ParameterSourceBase:
-        """Loads a known parameter source.
+        """Loads a known parameter source, if it has not been loaded already.
+
+        The source is also added to the index of available parameters and the time
+        taken by both steps recorded in 'load_times'.
 
         Args:
             source (str): The name of the source to load.
@@ -335,12 +1625,35 @@ class ParameterManager:
         Returns:
             The instance of the loaded source.
         """
-        if len(self.sources) == 0:
-            self.initialize()
+        self._ensure_initialized()
 
         self._validate_source(source)
+        if source not in self.sources:
+            with self._lock:
+                if source not in self.sources:
+                    start = perf_counter()
+                    loaded = self._known_sources[source].load_source(source)
+                    self.sources = {**self.sources, source: loaded}
+                    self._index_source(source)
+                    self._load_times = {
+                        **self._load_times,
+                        source: perf_counter() - start,
+                    }
         return self.sources[source]
 
+    def _priority(self, source: str) -> int:
+        """Priority of the source, taken from its class if it is not loaded yet.
+
+        Args:
+            source (str): The name of the source.
+
+        Returns:
+            The priority of the source.
+        """
+        if source in self.sources:
+            return self.sources[source].priority
+        return self._known_sources[source]._priority
+
     @lru_cache(maxsize=128)
     def _normalise_source(self, source: Union[str, Tuple[str]]) -> Tuple[str, ...]:
         """Normalise the sources to a standard sequence and prioritize them.
@@ -355,14 +1668,11 @@ class ParameterManager:
         Returns:
             A tuple with the sources to check, even if it is just one.
         """
-        if len(self.sources) == 0:
-            self.initialize()
+        self._ensure_initialized()
 
         if source == ():
             out = self.known_sources
-            return tuple(
-                sorted(out, reverse=True, key=lambda s: self.sources[s].priority)
-            )
+            return tuple(sorted(out, reverse=True, key=self._priority))
         elif isinstance(source, str):
             self._validate_source(source)
             return (source,)
@@ -378,10 +1688,40 @@ class ParameterManager:
             )
 
 
+def _init_worker(sources: Tuple[str, ...]) -> None:
+    """Prepare a worker process of 'ParameterManager.map', loading the sources.
+
+    Args:
+        sources (Tuple[str, ...]): Names of the sources to load.
+
+    Returns:
+        None
+    """
+    if len(sources) > 0:
+        ParameterManager().preload(sources)
+
+
+def _evaluate(request: Mapping[str, Any]) -> Union[Parameter, Exception]:
+    """Evaluate one of the requests of 'ParameterManager.map'.
+
+    Args:
+        request (Mapping): Arguments of 'ParameterManager.get_parameter'.
+
+    Returns:
+        The requested parameter or, if the enquiry fails, the exception raised.
+    """
+    try:
+        return ParameterManager().get_parameter(**request)
+    except Exception as err:
+        return err
+
+
 class ParameterSourceBase(ABC):
 
     name: str = ""
     _priority: int = 0
+    _any_material: bool = False
+    _provides: Optional[Tuple[str, ...]] = None
 
     def __init_subclass__(cls: Type[ParameterSourceBase]):
         if len(cls.name) == 0:
@@ -418,6 +1758,30 @@ class ParameterSourceBase(ABC):
         """
         return self._priority
 
+    @property
+    def provides(self) -> Optional[Tuple[str, ...]]:
+        """Parameters this source can provide for any of its materials, if known.
+
+        This is set at class level so the manager can skip loading sources that will
+        not have the requested parameter.
+
+        Returns:
+            A tuple with the parameters or None, if they are not known in advance.
+        """
+        return self._provides
+
+    @property
+    def any_material(self) -> bool:
+        """If the parameters of this source are available for any material.
+
+        In that case, the list of materials of the source is not used and the
+        parameters are obtained with 'parameters("")'.
+
+        Returns:
+            True if the parameters of the source do not depend on the material.
+        """
+        return self._any_material
+
     @property
     @abstractmethod
     def materials(self) -> Tuple[str, ...]:
@@ -463,6 +1827,60 @@ class ParameterSourceBase(ABC):
         """
         raise ParameterMissing(self.name, material, parameter)
 
+    def get_parameter_in_context(
+        self, material: str, parameter: str, context: Context
+    ) -> Parameter:
+        """Retrieve the parameter for the material given the context of the enquiry.
+
+        This is what the ParameterManager calls. By default, the values of the context
+        are given as keyword arguments to 'get_parameter'. Sources that retrieve other
+        parameters in turn should override it to pass the context along as it is.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            context (Context): The input arguments of the enquiry.
+
+        Raises
+            MaterialMissing: if the material does not exist in the source
+            ParameterMissing: if the parameter does not exist for that material
+            InputArgumentMissing: if there is a problem when retrieving the parameter.
+
+        Returns:
+            A Parameter object with the requested parameter.
+        """
+        return self.get_parameter(material, parameter, **context)
+
+    def dependencies(
+        self, material: str, parameter: str
+    ) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """Inputs and parameters the parameter directly depends on.
+
+        Each dependency is given as a (material, name) pair, as the parameters of an
+        alloy might depend on those of other materials. Names that no source provides,
+        like the temperature, are inputs of the enquiry.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+
+        Returns:
+            A tuple with the dependencies or None if they are not known, in which case
+            the parameter is assumed to depend on every input. By default, None.
+        """
+        return None
+
+    def clear_cache(self) -> None:
+        """Clear any cached information that depends on other sources.
+
+        This is called by the ParameterManager whenever the available sources or
+        their contents change. By default, it does nothing.
+
+        Returns:
+            None
+        """
+        pass
+
     @abstractmethod
     def get_nk(self, material: str, **kwargs) -> xr.DataArray:
         """Retrieve the nk data for the material.
@@ -484,6 +1902,74 @@ class ParameterSourceBase(ABC):
         raise ParameterMissing(self.name, material, "nk")
 
 
+def with_units(units: Dict[str, str]) -> Callable[[Callable], Callable]:
+    """Decorator to use a function written in terms of magnitudes with Quantities.
+
+    The function works with plain numbers or arrays, the arguments and the result
+    being in the units given, so no unit handling takes place inside of it. The
+    decorated function converts any Quantity argument to the units of that argument
+    - other values are used as they are - and returns a Quantity with the units of
+    the result, given under the 'return' key. The original function is available as
+    the '__wrapped__' attribute of the decorated one.
+
+    Args:
+        units: Units of the arguments and of the result.
+
+    Raises:
+        ValueError: if the units of the result are not given.
+
+    Returns:
+        The decorator.
+    """
+    if "return" not in units:
+        raise ValueError("The units of the result, 'return', must be provided.")
+
+    def decorator(function: Callable) -> Callable:
+        names = tuple(signature(function).parameters)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            kwargs.update(zip(names, args))
+            out = function(
+                **{k: _magnitude(v, units.get(k)) for k, v in kwargs.items()}
+            )
+            return Q_(out, _parse_units(units["return"]))
+
+        return wrapper
+
+    return decorator
+
+
+def _magnitude(value: Any, units: Optional[str]) -> Any:
+    """Magnitude of the value in the given units.
+
+    Args:
+        value: A Quantity or any other value, which is returned as it is.
+        units: The units of the magnitude. If None, the value is returned as it is.
+
+    Returns:
+        The magnitude.
+    """
+    if units is None or not isinstance(value, Q_):
+        return value
+
+    target = _parse_units(units)
+    return value.magnitude if value.units == target else value.m_as(target)
+
+
+@lru_cache(maxsize=None)
+def _parse_units(units: str) -> Any:
+    """Parse the units, which pint does every time they are used as a string.
+
+    Args:
+        units: The units to parse.
+
+    Returns:
+        A pint Unit object.
+    """
+    return Q_(1, units).units
+
+
 def alloy_parameter(
     p0: Union[Parameter, float],
     p1: Union[Parameter, float],
@@ -1,7 +1,6 @@
-from typing import Tuple, Dict
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 from functools import lru_cache
-import pint_xarray  # noqa: F401
 
 import numpy as np
 import xarray as xr
@@ -19,12 +18,14 @@ class BuiltinNKSource(ParameterSourceBase):
 
     name: str = "BuiltinNK"
     _root = Path(__file__).parent.parent / "material_data" / "builtin_nk"
+    _provides = ("nk",)
     _instance = None
 
     def __new__(cls, paths, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = ParameterSourceBase.__new__(cls)
-            cls._instance._paths = paths
+            inst = ParameterSourceBase.__new__(cls)
+            inst._paths = paths
+            cls._instance = inst
 
         return cls._instance
 
@@ -106,6 +107,8 @@ class BuiltinNKSource(ParameterSourceBase):
         Returns:
             A DataArray with the required data.
         """
+        import pint_xarray  # noqa: F401
+
         if material not in self.materials:
             raise MaterialMissing(self.name, material)
 
@@ -131,6 +134,24 @@ class BuiltinNKSource(ParameterSourceBase):
         )
         return data.pint.quantify({data.name: "dimensionless", "wavelength": "m"})
 
+    def dependencies(
+        self, material: str, parameter: str
+    ) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """Inputs and parameters the parameter directly depends on.
+
+        The nk data depends only on the composition.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+
+        Returns:
+            A tuple with the dependencies or None if they are not known.
+        """
+        if parameter not in self.parameters(material):
+            return None
+        return ((material, "comp"),)
+
     @lru_cache(maxsize=128)
     def _load(self, path: Path, param: str) -> Tuple[np.ndarray, np.ndarray]:
         """Loads the refractive index data from a txt file.
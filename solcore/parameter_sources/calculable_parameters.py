@@ -1,43 +1,85 @@
 from __future__ import annotations
 
-from functools import partial
+from collections import namedtuple
+from functools import partial, reduce
 from inspect import Parameter as insParam
 from inspect import signature
 from itertools import chain
 from logging import getLogger
-from typing import Callable, Dict, Optional, Tuple, Union
+from threading import local
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
 import numpy as np
 
 from pint import Quantity
-from solcore.constants import electron_mass_, h_, kb_, pi_, vacuum_permittivity_
+from solcore.constants import electron_mass, h, kb, pi, vacuum_permittivity
 from solcore.parameter import (
+    Context,
     InputArgumentMissing,
     Parameter,
     ParameterMissing,
     ParameterSourceBase,
     ParameterSourceError,
+    _magnitude,
+    _parse_units,
+    with_units,
 )
 
 
+PlanStep = namedtuple("PlanStep", ["parameter", "source", "arguments"])
+"""Step of the plan to calculate a parameter.
+
+It contains the parameter to obtain, the source it comes from (None if no source
+provides it) and, for calculable parameters, the arguments needed to calculate it.
+"""
+
+Arguments = namedtuple("Arguments", ["names", "defaults", "external"])
+"""Arguments of a calculable, recorded when registering it.
+
+It contains the names of all the arguments, in order, the default values of those
+having one and the names of the external arguments, which cannot be retrieved.
+"""
+
+Memo = Tuple[str, Context, Dict[str, Any], Dict[str, ParameterMissing]]
+"""Material, context, values and errors of an enquiry that cannot be cached."""
+
+EXTERNAL: Tuple[str, ...] = ("T", "Na", "Nd", "comp")
+"""Input arguments that cannot be retrieved and must be provided in the enquiry."""
+
+Magnitude = Union[float, np.ndarray]
+"""Annotation shortcut for the magnitudes calculables with units operate on."""
+
+
 class CalculableParameters(ParameterSourceBase):
 
     name: str = "Calculable"
     _priority: int = -10
+    _any_material: bool = True
     _instance = None
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = ParameterSourceBase.__new__(cls)
-            cls._instance._params = {}
-            cls._instance._descriptions = {}
-            cls._instance._warned = False
+            inst = ParameterSourceBase.__new__(cls)
+            inst._params = {}
+            inst._descriptions = {}
+            inst._units = {}
+            inst._arguments = {}
+            inst._warned = False
+            inst._plans = {}
+            inst._plan_inputs = {}
+            inst._local = local()
+            cls._instance = inst
         return cls._instance
 
     def __init__(self):
         self._params: Dict[str, Callable]
         self._descriptions: Dict[str, str]
+        self._units: Dict[str, Tuple[Callable, Dict[str, str]]]
+        self._arguments: Dict[str, Arguments]
         self._warned: bool
+        self._plans: Dict[Tuple[str, str, FrozenSet[str]], Tuple[PlanStep, ...]]
+        self._plan_inputs: Dict[Tuple[str, str], FrozenSet[str]]
+        self._local: local
 
     def __getitem__(self, parameter: str) -> Callable:
         """Dictionary-like access to the calculable source.
@@ -84,26 +126,46 @@ class CalculableParameters(ParameterSourceBase):
 
     @classmethod
     def register_calculable(
-        cls, function: Optional[Callable] = None, description: str = ""
+        cls,
+        function: Optional[Callable] = None,
+        description: str = "",
+        units: Optional[Dict[str, str]] = None,
     ):
         """Register a calculable with the calculable parameter source.
 
+        If the units are given, the calculable is written in terms of magnitudes in
+        those units rather than Quantities (see 'with_units'). The source then
+        evaluates it on the magnitudes of the inputs, building a single Parameter
+        out of the result, which is much faster than operating with Quantities.
+
         Args:
             function: Calculable to be registered
             description: Description of the calculable parameter
+            units: Units of the arguments and, under the 'return' key, of the result.
 
         Returns:
-            The same input
+            The same input or, if the units are given, the input decorated with
+            'with_units', so it can be called with Quantities.
         """
         if function is None:
-            return partial(cls.register_calculable, description=description)
+            return partial(
+                cls.register_calculable, description=description, units=units
+            )
 
         name = function.__name__
         if name in cls()._params:
             raise ParameterSourceError(f"Calculable parameter '{name}' already exists!")
 
+        # The arguments are inspected once, rather than on every enquiry
+        cls()._arguments[name] = _arguments(function)
+        if units is not None:
+            cls()._units[name] = (function, units)
+            function = with_units(units)(function)
+
         cls()._params[name] = function
         cls()._descriptions[name] = description
+        cls().clear_cache()
+        cls().parman.reindex_source(cls.name)
         return function
 
     @property
@@ -146,14 +208,18 @@ class CalculableParameters(ParameterSourceBase):
         Returns:
             A tuple with the arguments.
         """
-        sig = signature(self[parameter]).parameters
-        return tuple(sig.keys())
+        self[parameter]
+        return self._arguments[parameter].names
 
     def get_parameter(self, material: str, parameter: str, **kwargs) -> Parameter:
         """Retrieve the parameter for the material.
 
         Any arguments that obtaining this parameter requires must be included as
-        keyword arguments in the call.
+        keyword arguments in the call. The arguments of the calculable are obtained
+        following the plan for the enquiry (see 'plan'). Intermediate results are
+        shared through the cache of the ParameterManager or, if the inputs cannot be
+        cached (eg. arrays), through a memo kept during the enquiry, so each of them
+        is obtained only once.
 
         Args:
             material (str): Material the enquiry is about.
@@ -167,50 +233,353 @@ class CalculableParameters(ParameterSourceBase):
         Returns:
             A Parameter object with the requested parameter.
         """
-        calculable = self[parameter]
+        return self.get_parameter_in_context(material, parameter, Context(kwargs))
 
-        # These are the input arguments required by the calculable
-        sig = signature(calculable).parameters
+    def get_parameter_in_context(
+        self, material: str, parameter: str, context: Context
+    ) -> Parameter:
+        """Retrieve the parameter for the material given the context of the enquiry.
 
-        # Some might come from the input kwargs of this method
-        params = {p: kwargs[p] for p in sig.keys() if p in kwargs}
+        The context is passed as it is to the ParameterManager when obtaining the
+        arguments of the calculable, and only the arguments are read from it.
 
-        # Others are parameters that need to be retrieved for the material
-        to_retrieve = [p for p in sig.keys() if p not in kwargs]
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            context (Context): The input arguments of the enquiry.
 
-        # Some external parameters cannot be retrieved
-        external = ("T", "Na", "Nd", "comp")
-        for ext in to_retrieve:
-            if ext in external:
-                raise InputArgumentMissing(ext)
+        Raises
+            ParameterMissing: if the parameter does not exist for that material
+            InputArgumentMissing: if there is a problem when retrieving the parameter.
 
-        for p in to_retrieve:
-            # Try to get it some somewhere else
-            try:
-                params[p] = self.parman.get_parameter(material, p, **kwargs)
-            except ParameterMissing as err:
-                # If not... is there a default value??
-                if sig[p].default != insParam.empty:
-                    params[p] = sig[p].default
+        Returns:
+            A Parameter object with the requested parameter.
+        """
+        plan = self._plan(material, parameter, context.names)
+        memo, new = self._memo(material, context)
+        if memo is None:
+            # The manager obtains, and caches, the deeper steps when needed
+            values: Dict[str, Any] = {}
+            missing: Dict[str, ParameterMissing] = {}
+            args = plan[-1].arguments
+            steps = tuple(s for s in plan if s.parameter in args) + plan[-1:]
+        else:
+            _, _, values, missing = memo
+            steps = plan
+
+        try:
+            for step in steps:
+                p = step.parameter
+                if p in values or p in missing:
                     continue
 
-                # Well, bad luck then...
-                raise err
+                try:
+                    if p == parameter:
+                        values[p] = self._calculate(step, context, values, missing)
+                    else:
+                        values[p] = self.parman.get_parameter(
+                            material, p, context=context
+                        )
+                except ParameterMissing as err:
+                    missing[p] = err
+        finally:
+            if new:
+                self._memos.pop()
+
+        if parameter in missing:
+            raise missing[parameter]
+        return values[parameter]
+
+    def plan(self, material: str, parameter: str, **kwargs) -> Tuple[PlanStep, ...]:
+        """Steps to calculate the parameter for the material, in order of evaluation.
+
+        The plan is the dependency graph of the parameter sorted topologically. The
+        arguments of a calculable are calculated in turn if this source is the
+        preferred one for them, or retrieved from the source that provides them
+        otherwise. Arguments included in the keyword arguments are used directly. The
+        plan is cached for each material, parameter and set of the keyword arguments
+        that are arguments of the calculables involved.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            **kwargs: Any other argument needed to calculate the requested parameter.
+                Only their names are relevant for the plan.
+
+        Raises
+            ParameterMissing: if the parameter does not exist in this source
+            ParameterSourceError: if there are circular dependencies
+
+        Returns:
+            A tuple of PlanStep with the parameters to obtain, ending with the
+            requested one.
+        """
+        return self._plan(material, parameter, frozenset(kwargs))
+
+    def _plan(
+        self, material: str, parameter: str, provided: FrozenSet[str]
+    ) -> Tuple[PlanStep, ...]:
+        """Steps to calculate the parameter given the names of the provided inputs.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            provided (FrozenSet[str]): Names of the arguments included in the enquiry.
+
+        Raises
+            ParameterMissing: if the parameter does not exist in this source
+            ParameterSourceError: if there are circular dependencies
+
+        Returns:
+            A tuple of PlanStep with the parameters to obtain, ending with the
+            requested one.
+        """
+        key = (material, parameter, provided & self._inputs(material, parameter))
+        if key not in self._plans:
+            steps: Dict[str, PlanStep] = {}
+            self._plan_calculable(material, parameter, provided, steps, ())
+            self._plans[key] = tuple(steps.values())
+        return self._plans[key]
+
+    def _inputs(self, material: str, parameter: str) -> FrozenSet[str]:
+        """Arguments of the calculables the plan to calculate the parameter might use.
+
+        These are the arguments of the parameter and, in turn, those of the arguments
+        calculated by this source, so the plan depends only on which of them are
+        provided.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+
+        Raises
+            ParameterMissing: if the parameter does not exist in this source
+
+        Returns:
+            A frozenset with the names of the arguments.
+        """
+        key = (material, parameter)
+        if key not in self._plan_inputs:
+            self[parameter]
+            names: Set[str] = set()
+            pending = [parameter]
+            while len(pending) > 0:
+                for p in self._arguments[pending.pop()].names:
+                    if p in names:
+                        continue
+                    names.add(p)
+                    if p in EXTERNAL:
+                        continue
+
+                    try:
+                        if self.parman.find_source(material, p) == self.name:
+                            pending.append(p)
+                    except ParameterMissing:
+                        pass
+            self._plan_inputs[key] = frozenset(names)
+        return self._plan_inputs[key]
+
+    def clear_cache(self) -> None:
+        """Discard the calculation plans, as the available parameters have changed.
+
+        Returns:
+            None
+        """
+        self._plans.clear()
+        self._plan_inputs.clear()
+
+    @property
+    def _memos(self) -> List[Memo]:
+        """Memos of the enquiries in progress in the current thread.
+
+        Returns:
+            A list with the memos, the innermost one last.
+        """
+        try:
+            return self._local.memos
+        except AttributeError:
+            self._local.memos = []
+            return self._local.memos
+
+    def _memo(self, material: str, context: Context) -> Tuple[Optional[Memo], bool]:
+        """Memo with the values and errors obtained so far in the enquiry.
+
+        The memo of an enquiry in progress for the same material and context is
+        reused. No memo is used if the inputs can be cached by the ParameterManager and
+        the cache is in use, as the manager takes care of sharing the results, then.
+
+        Args:
+            material (str): Material the enquiry is about.
+            context (Context): Input arguments of the enquiry.
+
+        Returns:
+            A tuple with the memo, if any, and if it is a new one, which should be
+            removed once the enquiry is completed.
+        """
+        if len(self._memos) > 0:
+            memo = self._memos[-1]
+            m, inputs, _, _ = memo
+            if m == material and inputs is context:
+                return memo, False
+
+        if context.key is not None and self.parman.caching:
+            return None, False
+
+        self._memos.append((material, context, {}, {}))
+        return self._memos[-1], True
+
+    def _plan_calculable(
+        self,
+        material: str,
+        parameter: str,
+        provided: FrozenSet[str],
+        steps: Dict[str, PlanStep],
+        stack: Tuple[str, ...],
+    ) -> None:
+        """Add to the plan the steps to calculate a calculable parameter.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The calculable parameter.
+            provided (FrozenSet[str]): Arguments included in the enquiry.
+            steps (Dict[str, PlanStep]): The steps planned so far, in order. It is
+                updated in place.
+            stack (Tuple[str, ...]): Calculables that depend on this one.
+
+        Raises
+            ParameterSourceError: if there are circular dependencies
+
+        Returns:
+            None
+        """
+        if parameter in stack:
+            raise ParameterSourceError(
+                f"Circular dependency calculating '{parameter}': "
+                f"{' -> '.join(stack + (parameter,))}"
+            )
+
+        arguments = self._arguments[parameter].names
+        for p in arguments:
+            if p in provided or p in EXTERNAL or p in steps:
+                continue
+
+            try:
+                source: Optional[str] = self.parman.find_source(material, p)
+            except ParameterMissing:
+                source = None
+
+            if source == self.name:
+                self._plan_calculable(
+                    material, p, provided, steps, stack + (parameter,)
+                )
+            else:
+                steps[p] = PlanStep(p, source, ())
+
+        steps[parameter] = PlanStep(parameter, self.name, arguments)
+
+    def _calculate(
+        self,
+        step: PlanStep,
+        context: Context,
+        values: Dict[str, Union[Parameter, Quantity]],
+        missing: Dict[str, ParameterMissing],
+    ) -> Parameter:
+        """Calculate a calculable parameter out of the values obtained so far.
+
+        Args:
+            step (PlanStep): The step of the plan to calculate.
+            context (Context): The input arguments of the enquiry.
+            values (dict): The values of the previous steps.
+            missing (dict): The errors of the previous steps that failed.
+
+        Raises
+            ParameterMissing: if an argument without default value is missing
+            InputArgumentMissing: if an external argument is not provided.
+
+        Returns:
+            A Parameter object with the calculated parameter.
+        """
+        arguments = self._arguments[step.parameter]
+
+        # Some external parameters cannot be retrieved
+        for ext in arguments.external:
+            if ext not in context and ext not in values:
+                raise InputArgumentMissing(ext)
+
+        params = {}
+        for p in step.arguments:
+            if p in values:
+                params[p] = values[p]
+            elif p in context:
+                params[p] = context[p]
+            elif p in arguments.defaults:
+                params[p] = arguments.defaults[p]
+            else:
+                raise missing[p]
 
-        out = calculable(**params)
         ref = chain.from_iterable(
             {p.r for p in params.values() if isinstance(p, Parameter)}
         )
         references = tuple(set(chain(("Calculable",), ref)))
-        return Parameter(
-            out, description=self._descriptions[parameter], reference=references
-        )
+        description = self._descriptions[step.parameter]
+
+        if step.parameter in self._units:
+            function, units = self._units[step.parameter]
+            out = function(
+                **{k: _magnitude(v, units.get(k)) for k, v in params.items()}
+            )
+            return Parameter(
+                out,
+                _parse_units(units["return"]),
+                description=description,
+                reference=references,
+            )
+
+        out = self._params[step.parameter](**params)
+        return Parameter(out, description=description, reference=references)
 
     def get_nk(self, material: str, **kwargs):
         raise ParameterMissing(self.name, material, "nk")
 
+    def dependencies(
+        self, material: str, parameter: str
+    ) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """Inputs and parameters the parameter directly depends on.
+
+        These are the arguments of the calculable.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
 
-def eg(T: Quantity, eg0: Quantity, alpha: Quantity, beta: Quantity) -> Quantity:
+        Returns:
+            A tuple with the dependencies or None if they are not known.
+        """
+        if parameter not in self._params:
+            return None
+        return tuple((material, a) for a in self.list_arguments(parameter))
+
+
+def _arguments(function: Callable) -> Arguments:
+    """Inspect the arguments of a calculable.
+
+    Args:
+        function: The calculable.
+
+    Returns:
+        The arguments of the calculable.
+    """
+    parameters = signature(function).parameters
+    return Arguments(
+        names=tuple(parameters),
+        defaults={
+            k: v.default for k, v in parameters.items() if v.default != insParam.empty
+        },
+        external=tuple(k for k in parameters if k in EXTERNAL),
+    )
+
+
+def _eg(T: Magnitude, eg0: Magnitude, alpha: Magnitude, beta: Magnitude) -> Magnitude:
     """Energy gap as a function of temperature
 
     Calculate the energy gap for temperature T using the Varshni relationship:
@@ -221,20 +590,32 @@ def eg(T: Quantity, eg0: Quantity, alpha: Quantity, beta: Quantity) -> Quantity:
         T: Temperature (in K)
         eg0: Energy gap at T=0 (in eV)
         alpha: Proportionality constant (in eV/K)
-        beta: Temperature offset (in eV)
+        beta: Temperature offset (in K)
 
     Returns:
         The gap at the chosen temperature (in eV)
     """
-    Tk = T.to("K")
-    out = eg0 - alpha * Tk ** 2 / (Tk + beta)
-    return out.to("eV")
+    return eg0 - alpha * T ** 2 / (T + beta)
 
 
-@CalculableParameters.register_calculable(description="Band gap at the Gamma point")
+eg = with_units({"T": "K", "eg0": "eV", "alpha": "eV/K", "beta": "K", "return": "eV"})(
+    _eg
+)
+
+
+@CalculableParameters.register_calculable(
+    description="Band gap at the Gamma point",
+    units={
+        "T": "K",
+        "eg0_gamma": "eV",
+        "alpha_gamma": "eV/K",
+        "beta_gamma": "K",
+        "return": "eV",
+    },
+)
 def eg_gamma(
-    T: Quantity, eg0_gamma: Quantity, alpha_gamma: Quantity, beta_gamma: Quantity
-) -> Quantity:
+    T: Magnitude, eg0_gamma: Magnitude, alpha_gamma: Magnitude, beta_gamma: Magnitude
+) -> Magnitude:
     """Energy gap at the Gamma point as a function of temperature.
 
     Calculate the energy gap for temperature T using the Varshni relationship:
@@ -245,16 +626,21 @@ def eg_gamma(
         T: Temperature (in K)
         eg0_gamma: Energy gap at T=0 (in eV)
         alpha_gamma: Proportionality constant (in eV/K)
-        beta_gamma: Temperature offset (in eV)
+        beta_gamma: Temperature offset (in K)
 
     Returns:
         The gap at the chosen temperature (in eV)
     """
-    return eg(T, eg0_gamma, alpha_gamma, beta_gamma)
+    return _eg(T, eg0_gamma, alpha_gamma, beta_gamma)
 
 
-@CalculableParameters.register_calculable(description="Band gap at the X point")
-def eg_x(T: Quantity, eg0_x: Quantity, alpha_x: Quantity, beta_x: Quantity) -> Quantity:
+@CalculableParameters.register_calculable(
+    description="Band gap at the X point",
+    units={"T": "K", "eg0_x": "eV", "alpha_x": "eV/K", "beta_x": "K", "return": "eV"},
+)
+def eg_x(
+    T: Magnitude, eg0_x: Magnitude, alpha_x: Magnitude, beta_x: Magnitude
+) -> Magnitude:
     """Energy gap at the X point as a function of temperature.
 
     Calculate the energy gap for temperature T using the Varshni relationship:
@@ -265,16 +651,21 @@ def eg_x(T: Quantity, eg0_x: Quantity, alpha_x: Quantity, beta_x: Quantity) -> Q
         T: Temperature (in K)
         eg0_x: Energy gap at T=0 (in eV)
         alpha_x: Proportionality constant (in eV/K)
-        beta_x: Temperature offset (in eV)
+        beta_x: Temperature offset (in K)
 
     Returns:
         The gap at the chosen temperature (in eV)
     """
-    return eg(T, eg0_x, alpha_x, beta_x)
+    return _eg(T, eg0_x, alpha_x, beta_x)
 
 
-@CalculableParameters.register_calculable(description="Band gap at the L point")
-def eg_l(T: Quantity, eg0_l: Quantity, alpha_l: Quantity, beta_l: Quantity) -> Quantity:
+@CalculableParameters.register_calculable(
+    description="Band gap at the L point",
+    units={"T": "K", "eg0_l": "eV", "alpha_l": "eV/K", "beta_l": "K", "return": "eV"},
+)
+def eg_l(
+    T: Magnitude, eg0_l: Magnitude, alpha_l: Magnitude, beta_l: Magnitude
+) -> Magnitude:
     """Energy gap at the L point as a function of temperature.
 
     Calculate the energy gap for temperature T using the Varshni relationship:
@@ -285,22 +676,27 @@ def eg_l(T: Quantity, eg0_l: Quantity, alpha_l: Quantity, beta_l: Quantity) -> Q
         T: Temperature (in K)
         eg0_l: Energy gap at T=0 (in eV)
         alpha_l: Proportionality constant (in eV/K)
-        beta_l: Temperature offset (in eV)
+        beta_l: Temperature offset (in K)
 
     Returns:
         The gap at the chosen temperature (in eV)
     """
-    return eg(T, eg0_l, alpha_l, beta_l)
+    return _eg(T, eg0_l, alpha_l, beta_l)
 
 
-@CalculableParameters.register_calculable(description="Band gap energy")
+@CalculableParameters.register_calculable(
+    description="Band gap energy",
+    units={"eg_gamma": "eV", "eg_x": "eV", "eg_l": "eV", "return": "eV"},
+)
 def band_gap(
-    eg_gamma: Optional[Quantity] = None,
-    eg_x: Optional[Quantity] = None,
-    eg_l: Optional[Quantity] = None,
-) -> Quantity:
+    eg_gamma: Optional[Magnitude] = None,
+    eg_x: Optional[Magnitude] = None,
+    eg_l: Optional[Magnitude] = None,
+) -> Magnitude:
     """Band gap energy, taken as the minimum of the Gamma, X and L points.
 
+    The minimum is taken element-wise, so the gaps can be arrays.
+
     Raises
         ValueError: If the gap of at least one of the points is not provided
 
@@ -312,12 +708,12 @@ def band_gap(
     Returns:
         The band gap (in eV)
     """
-    gaps = [g.to("eV") for g in (eg_gamma, eg_x, eg_l) if g is not None]
+    gaps = [g for g in (eg_gamma, eg_x, eg_l) if g is not None]
 
     if len(gaps) == 0:
         raise ValueError("The gap for at least one of the points need to be provided.")
 
-    return min(gaps)
+    return reduce(np.minimum, gaps)
 
 
 @CalculableParameters.register_calculable(
@@ -342,13 +738,22 @@ def lowest_band(
     )
 
 
-@CalculableParameters.register_calculable(description="Split-off hole effective mass")
+@CalculableParameters.register_calculable(
+    description="Split-off hole effective mass",
+    units={
+        "gamma1": "dimensionless",
+        "interband_matrix_element": "eV",
+        "spin_orbit_splitting": "eV",
+        "band_gap": "eV",
+        "return": "kg",
+    },
+)
 def eff_mass_split_off(
-    gamma1: Union[Quantity, float],
-    interband_matrix_element: Quantity,
-    spin_orbit_splitting: Quantity,
-    band_gap: Quantity,
-) -> Parameter:
+    gamma1: Magnitude,
+    interband_matrix_element: Magnitude,
+    spin_orbit_splitting: Magnitude,
+    band_gap: Magnitude,
+) -> Magnitude:
     """Split-off hole effective mass, m_so.
 
     Provided by Eq. 2.18 of Vurgaftman et al. JAP, 2001:
@@ -367,15 +772,14 @@ def eff_mass_split_off(
     mr = gamma1 - interband_matrix_element * spin_orbit_splitting / (
         3 * band_gap * (band_gap + spin_orbit_splitting)
     )
-    return electron_mass_ / mr
+    return electron_mass / mr
 
 
 @CalculableParameters.register_calculable(
-    description="Heavy hole effective mass along the z [100] direction"
+    description="Heavy hole effective mass along the z [100] direction",
+    units={"gamma1": "dimensionless", "gamma2": "dimensionless", "return": "kg"},
 )
-def eff_mass_hh_z(
-    gamma1: Union[Quantity, float], gamma2: Union[Quantity, float]
-) -> Parameter:
+def eff_mass_hh_z(gamma1: Magnitude, gamma2: Magnitude) -> Magnitude:
     """Heavy hole effective mass along the z direction [100].
 
     Provided by Eq. 2.16 of Vurgaftman et al. JAP, 2001:
@@ -389,17 +793,21 @@ def eff_mass_hh_z(
     Returns:
         The effective mass (in kg)
     """
-    return electron_mass_ / (gamma1 - 2 * gamma2)
+    return electron_mass / (gamma1 - 2 * gamma2)
 
 
 @CalculableParameters.register_calculable(
-    description="Heavy hole effective mass along the [110] direction"
+    description="Heavy hole effective mass along the [110] direction",
+    units={
+        "gamma1": "dimensionless",
+        "gamma2": "dimensionless",
+        "gamma3": "dimensionless",
+        "return": "kg",
+    },
 )
 def eff_mass_hh_110(
-    gamma1: Union[Quantity, float],
-    gamma2: Union[Quantity, float],
-    gamma3: Union[Quantity, float],
-) -> Parameter:
+    gamma1: Magnitude, gamma2: Magnitude, gamma3: Magnitude
+) -> Magnitude:
     """Heavy hole effective mass along the [110] direction.
 
     Provided by Eq. 2.16 of Vurgaftman et al. JAP, 2001:
@@ -414,15 +822,14 @@ def eff_mass_hh_110(
     Returns:
         The effective mass (in kg)
     """
-    return electron_mass_ / (1 / 2 * (2 * gamma1 - gamma2 - 3 * gamma3))
+    return electron_mass / (1 / 2 * (2 * gamma1 - gamma2 - 3 * gamma3))
 
 
 @CalculableParameters.register_calculable(
-    description="Heavy hole effective mass along the [111] direction"
+    description="Heavy hole effective mass along the [111] direction",
+    units={"gamma1": "dimensionless", "gamma3": "dimensionless", "return": "kg"},
 )
-def eff_mass_hh_111(
-    gamma1: Union[Quantity, float], gamma3: Union[Quantity, float]
-) -> Parameter:
+def eff_mass_hh_111(gamma1: Magnitude, gamma3: Magnitude) -> Magnitude:
     """Heavy hole effective mass along the [111] direction.
 
     Provided by Eq. 2.16 of Vurgaftman et al. JAP, 2001:
@@ -436,15 +843,14 @@ def eff_mass_hh_111(
     Returns:
         The effective mass (in kg)
     """
-    return electron_mass_ / (gamma1 - 2 * gamma3)
+    return electron_mass / (gamma1 - 2 * gamma3)
 
 
 @CalculableParameters.register_calculable(
-    description="Light hole effective mass along the z [100] direction"
+    description="Light hole effective mass along the z [100] direction",
+    units={"gamma1": "dimensionless", "gamma2": "dimensionless", "return": "kg"},
 )
-def eff_mass_lh_z(
-    gamma1: Union[Quantity, float], gamma2: Union[Quantity, float]
-) -> Parameter:
+def eff_mass_lh_z(gamma1: Magnitude, gamma2: Magnitude) -> Magnitude:
     """Light hole effective mass along the z direction [100].
 
     Provided by Eq. 2.17 of Vurgaftman et al. JAP, 2001:
@@ -458,17 +864,21 @@ def eff_mass_lh_z(
     Returns:
         The effective mass (in kg)
     """
-    return electron_mass_ / (gamma1 + 2 * gamma2)
+    return electron_mass / (gamma1 + 2 * gamma2)
 
 
 @CalculableParameters.register_calculable(
-    description="Light hole effective mass along the [110] direction"
+    description="Light hole effective mass along the [110] direction",
+    units={
+        "gamma1": "dimensionless",
+        "gamma2": "dimensionless",
+        "gamma3": "dimensionless",
+        "return": "kg",
+    },
 )
 def eff_mass_lh_110(
-    gamma1: Union[Quantity, float],
-    gamma2: Union[Quantity, float],
-    gamma3: Union[Quantity, float],
-) -> Parameter:
+    gamma1: Magnitude, gamma2: Magnitude, gamma3: Magnitude
+) -> Magnitude:
     """Light hole effective mass along the [110] direction.
 
     Provided by Eq. 2.17 of Vurgaftman et al. JAP, 2001:
@@ -483,15 +893,14 @@ def eff_mass_lh_110(
     Returns:
         The effective mass (in kg)
     """
-    return electron_mass_ / (1 / 2 * (2 * gamma1 + gamma2 + 3 * gamma3))
+    return electron_mass / (1 / 2 * (2 * gamma1 + gamma2 + 3 * gamma3))
 
 
 @CalculableParameters.register_calculable(
-    description="Light hole effective mass along the [111] direction"
+    description="Light hole effective mass along the [111] direction",
+    units={"gamma1": "dimensionless", "gamma3": "dimensionless", "return": "kg"},
 )
-def eff_mass_lh_111(
-    gamma1: Union[Quantity, float], gamma3: Union[Quantity, float]
-) -> Parameter:
+def eff_mass_lh_111(gamma1: Magnitude, gamma3: Magnitude) -> Magnitude:
     """Light hole effective mass along the [111] direction.
 
     Provided by Eq. 2.17 of Vurgaftman et al. JAP, 2001:
@@ -505,16 +914,25 @@ def eff_mass_lh_111(
     Returns:
         The effective mass (in kg)
     """
-    return electron_mass_ / (gamma1 + 2 * gamma3)
+    return electron_mass / (gamma1 + 2 * gamma3)
 
 
-@CalculableParameters.register_calculable(description="Electron effective mass")
+@CalculableParameters.register_calculable(
+    description="Electron effective mass",
+    units={
+        "f": "dimensionless",
+        "interband_matrix_element": "eV",
+        "band_gap": "eV",
+        "spin_orbit_splitting": "eV",
+        "return": "kg",
+    },
+)
 def eff_mass_electron(
-    f: Union[Quantity, float],
-    interband_matrix_element: Quantity,
-    band_gap: Quantity,
-    spin_orbit_splitting: Quantity,
-) -> Parameter:
+    f: Magnitude,
+    interband_matrix_element: Magnitude,
+    band_gap: Magnitude,
+    spin_orbit_splitting: Magnitude,
+) -> Magnitude:
     """Electron effective mass
 
     Provided by Eq. 2.15 of Vurgaftman et al. JAP, 2001:
@@ -539,11 +957,14 @@ def eff_mass_electron(
         * (band_gap + 2 * spin_orbit_splitting / 3)
         / (band_gap * (band_gap + spin_orbit_splitting))
     )
-    return electron_mass_ / mr
+    return electron_mass / mr
 
 
-@CalculableParameters.register_calculable(description="Absolute permittivity")
-def permittivity(relative_permittivity: Union[Quantity, float]) -> Parameter:
+@CalculableParameters.register_calculable(
+    description="Absolute permittivity",
+    units={"relative_permittivity": "dimensionless", "return": "F/m"},
+)
+def permittivity(relative_permittivity: Magnitude) -> Magnitude:
     """Absolute permittivity of the material.
 
         epsilon = epsilon_r * epsilon_0
@@ -552,18 +973,27 @@ def permittivity(relative_permittivity: Union[Quantity, float]) -> Parameter:
         relative_permittivity: Relative permittivity (dimensionless)
 
     Returns:
-        The absolute permittivity
+        The absolute permittivity (in F/m)
     """
-    return vacuum_permittivity_ * relative_permittivity
+    return vacuum_permittivity * relative_permittivity
 
 
-@CalculableParameters.register_calculable(description="Electron affinity")
+@CalculableParameters.register_calculable(
+    description="Electron affinity",
+    units={
+        "valence_band_offset": "eV",
+        "band_gap": "eV",
+        "band_gap_InSb_300K": "eV",
+        "electron_affinity_InSb_300K": "eV",
+        "return": "eV",
+    },
+)
 def electron_affinity(
-    valence_band_offset: Quantity,
-    band_gap: Quantity,
-    band_gap_InSb_300K=Quantity(0.173723404, "eV"),
-    electron_affinity_InSb_300K=Quantity(4.59, "eV"),
-) -> Quantity:
+    valence_band_offset: Magnitude,
+    band_gap: Magnitude,
+    band_gap_InSb_300K: Magnitude = 0.173723404,
+    electron_affinity_InSb_300K: Magnitude = 4.59,
+) -> Magnitude:
     """Energy difference between the botton of the conduction band and the vacuum.
 
     It is calculated with reference to InSb at 300 K, with a known value of the
@@ -579,8 +1009,8 @@ def electron_affinity(
         https:// en.wikipedia.org/wiki/Anderson's_rule
 
     Args:
-        valence_band_offset: Valence band offset relative to InSb
-        band_gap: Band gap energy
+        valence_band_offset: Valence band offset relative to InSb (in eV)
+        band_gap: Band gap energy (in eV)
 
     Returns:
         The electron affinity (in eV)
@@ -593,7 +1023,7 @@ def electron_affinity(
     )
 
 
-def density_states(T: Quantity, mass: Quantity) -> Quantity:
+def _density_states(T: Magnitude, mass: Magnitude) -> Magnitude:
     """Effective density of states
 
     The present implementation is only valid for parabolic bands and therefore suited
@@ -606,17 +1036,22 @@ def density_states(T: Quantity, mass: Quantity) -> Quantity:
         mass: Effective mass of the carrier (in kg)
 
     Returns:
-        The effective density of states
+        The effective density of states (in 1/cm**3)
     """
-    T = T.to("K")
-    density = 2 * (2 * pi_ * mass * kb_ * T / h_ ** 2) ** (3 / 2)
-    return density.to("1/cm**3")
+    # From 1/m**3 to 1/cm**3
+    return 2 * (2 * pi * mass * kb * T / h ** 2) ** (3 / 2) * 1e-6
+
+
+density_states = with_units({"T": "K", "mass": "kg", "return": "1/cm**3"})(
+    _density_states
+)
 
 
 @CalculableParameters.register_calculable(
-    description="Conduction band effective density of states"
+    description="Conduction band effective density of states",
+    units={"T": "K", "eff_mass_electron": "kg", "return": "1/cm**3"},
 )
-def Nc(T: Quantity, eff_mass_electron: Quantity) -> Quantity:
+def Nc(T: Magnitude, eff_mass_electron: Magnitude) -> Magnitude:
     """Conduction band effective density of states
 
     Calculated according to:
@@ -628,16 +1063,16 @@ def Nc(T: Quantity, eff_mass_electron: Quantity) -> Quantity:
         eff_mass_electron: Electron effective mass (in kg)
 
     Returns:
-        Electron effective density of states
+        Electron effective density of states (in 1/cm**3)
     """
-    T = T.to("K")
-    return density_states(T, eff_mass_electron).to("1/cm**3")
+    return _density_states(T, eff_mass_electron)
 
 
 @CalculableParameters.register_calculable(
-    description="Valence band effective density of states"
+    description="Valence band effective density of states",
+    units={"T": "K", "eff_mass_hh_z": "kg", "eff_mass_lh_z": "kg", "return": "1/cm**3"},
 )
-def Nv(T: Quantity, eff_mass_hh_z: Quantity, eff_mass_lh_z: Quantity) -> Quantity:
+def Nv(T: Magnitude, eff_mass_hh_z: Magnitude, eff_mass_lh_z: Magnitude) -> Magnitude:
     """Valence band effective density of states
 
     The present implementation is only valid for III/V zinc blend semiconductors:
@@ -652,17 +1087,25 @@ def Nv(T: Quantity, eff_mass_hh_z: Quantity, eff_mass_lh_z: Quantity) -> Quantit
         eff_mass_lh_z: Light hole effective mass along the z [100] direction (in kg)
 
     Returns:
-        Hole effective density of states
+        Hole effective density of states (in 1/cm**3)
     """
-    T = T.to("K")
-    Nvhh = density_states(T, eff_mass_hh_z)
-    Nvlh = density_states(T, eff_mass_lh_z)
+    Nvhh = _density_states(T, eff_mass_hh_z)
+    Nvlh = _density_states(T, eff_mass_lh_z)
 
-    return (Nvhh + Nvlh).to("1/cm**3")
+    return Nvhh + Nvlh
 
 
-@CalculableParameters.register_calculable(description="Intrinsic carrier concentration")
-def ni(T: Quantity, Nc: Quantity, Nv: Quantity, band_gap: Quantity) -> Quantity:
+@CalculableParameters.register_calculable(
+    description="Intrinsic carrier concentration",
+    units={
+        "T": "K",
+        "Nc": "1/cm**3",
+        "Nv": "1/cm**3",
+        "band_gap": "J",
+        "return": "1/cm**3",
+    },
+)
+def ni(T: Magnitude, Nc: Magnitude, Nv: Magnitude, band_gap: Magnitude) -> Magnitude:
     """Intrinsic carrier concentration
 
     Calculated as:
@@ -673,10 +1116,9 @@ def ni(T: Quantity, Nc: Quantity, Nv: Quantity, band_gap: Quantity) -> Quantity:
         T: Temperature (in K)
         Nc: Conduction band effective density of states (in 1/cm**3)
         Nv: Valence band effective density of states (in 1/cm**3)
-        band_gap: Band gap energy (in eV)
+        band_gap: Band gap energy (in J)
 
     Returns:
         Intrinsic carrier concentration (1/cm**3)
     """
-    T = T.to("K")
-    return np.sqrt(Nc * Nv * np.exp(-band_gap / (kb_ * T))).to("1/cm**3")
+    return np.sqrt(Nc * Nv * np.exp(-band_gap / (kb * T)))
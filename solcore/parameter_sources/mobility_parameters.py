@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Tuple, Union, Dict
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
 
@@ -14,22 +14,40 @@ from solcore.parameter import (
     ParameterMissing,
     ParameterSourceBase,
     alloy_parameter,
+    with_units,
 )
+from solcore.parameter_sources.source_cache import cached
 
 ForQ = Union[float, Quantity]
 """Annotation shortcut when both a float and Quantity are valid types."""
 
-
+ForA = Union[float, np.ndarray]
+"""Annotation shortcut when both a float and an array are valid types."""
+
+
+@with_units(
+    {
+        "T": "K",
+        "N": "1/m**3",
+        "mu_min": "m**2/V/s",
+        "mu_max": "m**2/V/s",
+        "Nref": "1/m**3",
+        "ll": "dimensionless",
+        "t1": "dimensionless",
+        "t2": "dimensionless",
+        "return": "m**2/V/s",
+    }
+)
 def mobility_low_field(
-    T: Quantity,
-    N: Quantity,
-    mu_min: Quantity,
-    mu_max: Quantity,
-    Nref: Quantity,
-    ll: ForQ,
-    t1: ForQ,
-    t2: ForQ,
-) -> Quantity:
+    T: ForA,
+    N: ForA,
+    mu_min: ForA,
+    mu_max: ForA,
+    Nref: ForA,
+    ll: ForA,
+    t1: ForA,
+    t2: ForA,
+) -> ForA:
     """Low field mobility model.
 
     This implements Eq. 4 of Sotoodeh et al.:
@@ -57,15 +75,11 @@ def mobility_low_field(
     Returns:
         The low field mobility (in m2/V/s)
     """
-    T = T.to("K")
-    Tref = Quantity(300, "K")
-
-    m = mu_min + (mu_max * (Tref / T) ** t1 - mu_min) / (
+    Tref = 300.0
+    return mu_min + (mu_max * (Tref / T) ** t1 - mu_min) / (
         1 + (N / (Nref * (T / Tref) ** t2)) ** ll
     )
 
-    return m.to("m**2/V/s")
-
 
 class SotoodehMobilitySource(ParameterSourceBase):
 
@@ -73,18 +87,21 @@ class SotoodehMobilitySource(ParameterSourceBase):
     _path: Path = (
         Path(__file__).parent.parent / "material_data" / "sotoodehJAP2000_mobility.json"
     )
+    _provides = ("electron_mobility", "hole_mobility")
     _instance = None
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = ParameterSourceBase.__new__(cls)
+            inst = ParameterSourceBase.__new__(cls)
 
-            with cls._path.open("r") as f:
-                data = json.load(f)
+            data = cached(
+                cls.name, (cls._path,), lambda: json.loads(cls._path.read_text())
+            )
 
-            cls._instance.reference = data.pop("reference", "")
-            cls._instance._descriptions = data.pop("descriptions", {})
-            cls._instance._data = data
+            inst.reference = data.pop("reference", "")
+            inst._descriptions = data.pop("descriptions", {})
+            inst._data = data
+            cls._instance = inst
 
         return cls._instance
 
@@ -164,7 +181,8 @@ class SotoodehMobilitySource(ParameterSourceBase):
         if "x" in self._data[material]:
             return self._get_parameter_alloy(material, parameter, **kwargs)
 
-        N = max(kwargs.get("Nd", 0.0), kwargs.get("Na", 0.0))
+        no_doping = Quantity(0.0, "1/m**3")
+        N = np.maximum(kwargs.get("Nd", no_doping), kwargs.get("Na", no_doping))
         params = {p: Quantity(v) for p, v in self._data[material][carrier].items()}
         out = mobility_low_field(T=kwargs["T"], N=N, **params)
 
@@ -175,6 +193,24 @@ class SotoodehMobilitySource(ParameterSourceBase):
     def get_nk(self, material: str, **kwargs):
         raise ParameterMissing(self.name, material, "nk")
 
+    def dependencies(
+        self, material: str, parameter: str
+    ) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """Inputs and parameters the parameter directly depends on.
+
+        The mobility depends on the temperature and the doping.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+
+        Returns:
+            A tuple with the dependencies or None if they are not known.
+        """
+        if parameter not in self.parameters(material):
+            return None
+        return (material, "T"), (material, "Na"), (material, "Nd")
+
     def _get_parameter_alloy(
         self, material: str, parameter: str, **kwargs
     ) -> Parameter:
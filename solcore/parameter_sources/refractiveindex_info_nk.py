@@ -3,11 +3,10 @@ from __future__ import annotations
 import os
 
 from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import TYPE_CHECKING, Optional, Tuple, Union
 from logging import getLogger
 from tempfile import TemporaryDirectory
 
-import pint_xarray  # noqa: F401
 import xarray as xr
 import numpy as np
 
@@ -15,12 +14,14 @@ from solcore.parameter import (
     InputArgumentMissing,
     MaterialMissing,
     Parameter,
+    ParameterManager,
     ParameterMissing,
     ParameterSourceBase,
     ParameterSourceError,
 )
 
-from .tools.dboperations import Database as DB
+if TYPE_CHECKING:
+    from .tools.dboperations import Database as DB
 
 
 _DATABASE_URL: str = (
@@ -32,17 +33,43 @@ _DATABASE_URL: str = (
 class RefractiveindexInfoNKSource(ParameterSourceBase):
 
     name: str = "RefractiveindexInfoNK"
+    _provides = ("nk",)
     _instance = None
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = ParameterSourceBase.__new__(cls)
-            cls._instance._db = None
+            inst = ParameterSourceBase.__new__(cls)
+            inst._db = None
+            inst._materials = ()
+            cls._instance = inst
 
         return cls._instance
 
     def __init__(self, *args, **kwargs):
         self._db: Optional[DB]
+        self._materials: Tuple[str, ...]
+
+    @classmethod
+    def _set_db(cls, db: Optional[DB]) -> RefractiveindexInfoNKSource:
+        """Set the database of the source, refreshing the list of materials.
+
+        If the source is already in use by the parameter manager, the index of
+        available parameters is updated, too. This is done holding the lock of the
+        manager, so it does not interfere with sources being loaded in other threads.
+
+        Args:
+            db: The database to use or None.
+
+        Returns:
+            An instance of the source class
+        """
+        materials = () if db is None else tuple(db.get_available().unique())
+        with ParameterManager._lock:
+            source = cls()
+            source._materials = materials
+            source._db = db
+            source.parman.reindex_source(cls.name)
+        return source
 
     @classmethod
     def download_db(
@@ -71,12 +98,13 @@ class RefractiveindexInfoNKSource(ParameterSourceBase):
             )
             cls.select_db(path)
 
+        from .tools.dboperations import Database as DB
+
         db = DB(str(path))
         with TemporaryDirectory() as output:
             db.create_database_from_url(riiurl=url, outputfolder=output)
 
-        cls()._db = db
-        return cls()
+        return cls._set_db(db)
 
     @classmethod
     def select_db(cls, path: Union[Path, str]) -> RefractiveindexInfoNKSource:
@@ -91,13 +119,16 @@ class RefractiveindexInfoNKSource(ParameterSourceBase):
         if not Path(path).is_file():
             raise FileNotFoundError(f"Database file {str(path)} could not be found.")
 
-        cls()._db = DB(str(path))
-        return cls()
+        from .tools.dboperations import Database as DB
+
+        return cls._set_db(DB(str(path)))
 
     @classmethod
     def load_source(cls, source_name: str = "") -> ParameterSourceBase:
         """Factory method to initialise the source.
 
+        A database already selected with 'select_db' or 'download_db' is kept.
+
         Args:
             source_name: The name of the source, needed when a general base source
                 might have several concrete sources.
@@ -105,6 +136,9 @@ class RefractiveindexInfoNKSource(ParameterSourceBase):
         Returns:
             An instance of the source class
         """
+        if cls()._db is not None:
+            return cls()
+
         cwd_db = Path.cwd() / "nk.db"
         path = (
             str(cwd_db)
@@ -112,14 +146,15 @@ class RefractiveindexInfoNKSource(ParameterSourceBase):
             else os.environ.get("SOLCORE_REFRACTIVE_INDEX_DB")
         )
         if path is not None:
+            from .tools.dboperations import Database as DB
+
             db: Optional[DB] = DB(path)
         else:
             msg = "No refractiveindex.info database could be found. Ignoring source."
             getLogger().warn(msg)
             db = None
 
-        cls()._db = db
-        return cls()
+        return cls._set_db(db)
 
     @property
     def materials(self) -> Tuple[str, ...]:
@@ -128,10 +163,7 @@ class RefractiveindexInfoNKSource(ParameterSourceBase):
         Returns:
             A tuple with the list of materials.
         """
-        if self._db is None:
-            return ()
-        else:
-            return tuple(self._db.get_available().unique())
+        return self._materials
 
     def parameters(self, material: str) -> Tuple[str, ...]:
         """Parameters available in this source for the requested material.
@@ -186,7 +218,10 @@ class RefractiveindexInfoNKSource(ParameterSourceBase):
         Returns:
             A DataArray with the required data.
         """
-        if self._db is None:
+        import pint_xarray  # noqa: F401
+
+        db = self._db
+        if db is None:
             raise ParameterSourceError("Refractiveindex.info database not aavailable.")
 
         if material not in self.materials:
@@ -194,7 +229,7 @@ class RefractiveindexInfoNKSource(ParameterSourceBase):
 
         pageid = kwargs.get("pageid", None)
         if pageid is None:
-            options = self._db.get_available_for_material(material)
+            options = db.get_available_for_material(material)
             msg = (
                 "A 'pageid' is required to retrieve materials from the "
                 "'refractiveindex.info' database. "
@@ -203,8 +238,8 @@ class RefractiveindexInfoNKSource(ParameterSourceBase):
             print(msg)
             raise InputArgumentMissing("pageid")
 
-        n_data = self._db.get_material_n_numpy(int(pageid))
-        k_data = self._db.get_material_k_numpy(int(pageid))
+        n_data = db.get_material_n_numpy(int(pageid))
+        k_data = db.get_material_k_numpy(int(pageid))
         if n_data is None:
             getLogger().warn(f"No n data for material {material}. Setting equal to 1.")
             wl = k_data[:, 0]
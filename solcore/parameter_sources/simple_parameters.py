@@ -1,24 +1,409 @@
+from __future__ import annotations
+
 import json
 import math
 import os
-import re
 import sys
-from functools import lru_cache
+from collections import OrderedDict, defaultdict, namedtuple
+from functools import lru_cache, partial, reduce, wraps
+from itertools import combinations, product
+from operator import mul
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional, Tuple, Union
+from threading import Lock
+from types import FunctionType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+import numpy as np
+
+from pint import DimensionalityError, Quantity
 
-from pint import Quantity
 from solcore.parameter import (
+    Context,
     InputArgumentMissing,
     Parameter,
+    ParameterManager,
     ParameterMissing,
     ParameterSourceBase,
     alloy_parameter,
+    _parse_units,
 )
+from solcore.parameter_sources.source_cache import cached
 
 SAFE_BUILTINS = {k: v for k, v in math.__dict__.items() if not k.startswith("__")}
 """Only common mathematical opperations are allowed when evaluating expressions."""
 
+_VARIADIC = {"hypot": 0, "gcd": 0, "lcm": 1}
+"""Functions of 'math' taking any number of arguments, with their initial value."""
+
+
+def _elementwise(name: str) -> Callable:
+    """Element-wise version of a function of 'math', taking the same arguments.
+
+    NumPy ufuncs take extra positional arguments as the output arrays, so they
+    cannot be used directly in place of the functions of 'math': 'log(x, 2)' would
+    write the result into '2', rather than using it as the base.
+
+    Args:
+        name: Name of the function in 'math' and in NumPy.
+
+    Returns:
+        The element-wise function.
+    """
+    ufunc = getattr(np, name)
+    if name == "log":
+        return _log
+    elif name in _VARIADIC:
+        return wraps(ufunc)(partial(_reduced, ufunc, _VARIADIC[name]))
+
+    @wraps(ufunc)
+    def function(*args):
+        if len(args) != ufunc.nin:
+            raise TypeError(
+                f"{name}() takes exactly {ufunc.nin} arguments ({len(args)} given)"
+            )
+        return ufunc(*args)
+
+    return function
+
+
+def _log(x: Any, base: Optional[Any] = None) -> Any:
+    """Element-wise logarithm of x in the given base, natural by default."""
+    return np.log(x) if base is None else np.log(x) / np.log(base)
+
+
+def _reduced(ufunc: np.ufunc, initial: Any, *args) -> Any:
+    """Element-wise function of any number of arguments, out of a binary ufunc."""
+    return reduce(ufunc, args, initial)
+
+
+SAFE_BUILTINS_ARRAY = {
+    **SAFE_BUILTINS,
+    **{
+        k: _elementwise(k)
+        for k in SAFE_BUILTINS
+        if isinstance(getattr(np, k, None), np.ufunc) and k != "remainder"
+    },
+}
+"""Element-wise versions of the mathematical operations, used with array inputs."""
+
+
+ALLOY_KEYS = ("x", "parent0", "parent1", "sublattices")
+"""Entries of the alloys that describe them, rather than being parameters."""
+
+
+class Expression(
+    namedtuple(
+        "Expression",
+        ["value", "function", "array_function", "variables", "units", "raw"],
+        defaults=(None,),
+    )
+):
+    """Compiled raw parameter: its value, if constant, or functions of its variables.
+
+    Functions cannot be pickled, so expressions are pickled as their raw parameter,
+    which is compiled again when unpickling.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        if self.raw is None:
+            return Expression, tuple(self)
+        return _compile, (self.raw,)
+
+
+@lru_cache(maxsize=None)
+def _compile(raw: str) -> Expression:
+    """Compile the raw value of a parameter, eg. '2*cos(4*T) eV'.
+
+    Expressions become functions taking their variables as positional arguments, in
+    the order given by 'variables'. 'function' uses the mathematical operations of
+    'math' and 'array_function' their NumPy element-wise versions, for array inputs.
+
+    Args:
+        raw: The raw value of the parameter, with the units after the first space.
+
+    Returns:
+        The compiled expression, with the units already parsed.
+    """
+    value, _, units = raw.partition(" ")
+    parsed = _parse_units(units) if units != "" else None
+    try:
+        return Expression(float(value), None, None, (), parsed, raw)
+    except ValueError:
+        pass
+
+    names = compile(value, "<parameter>", "eval").co_names
+    variables = tuple(n for n in names if n not in SAFE_BUILTINS)
+    code = compile(f"lambda {', '.join(variables)}: {value}", "<parameter>", "eval")
+    function = eval(code, {"__builtins__": SAFE_BUILTINS})
+    array_function = FunctionType(
+        function.__code__, {"__builtins__": SAFE_BUILTINS_ARRAY}
+    )
+    return Expression(None, function, array_function, variables, parsed, raw)
+
+
+def _variables(raw: Union[float, str]) -> Tuple[str, ...]:
+    """Variables in the expression of a raw parameter, excluding the functions.
+
+    Args:
+        raw: The raw value of the parameter, eg. '2*cos(4*T) eV'.
+
+    Returns:
+        A tuple with the names of the variables.
+    """
+    return _compile(raw).variables if isinstance(raw, str) else ()
+
+
+Column = namedtuple("Column", ["materials", "index", "values", "units", "expressions"])
+"""A parameter of all the materials of a source, except alloys.
+
+The constant values are stored in a float array, in the same units, with NaN for the
+materials whose parameter is an expression. These are stored as tuples with the row,
+the compiled expression and the factor converting its result to the units of the
+column. Entries that cannot be compiled or whose units are not compatible with those
+of the column are stored with None as the factor, so only enquiries about them fail.
+"""
+
+
+Coefficients = namedtuple("Coefficients", ["p0", "p1", "bowing"])
+"""Terms of a parameter of a ternary alloy that do not depend on the composition.
+
+These are the parameter of both parents and the bowing, which is None if it depends on
+the composition, in which case it is evaluated for each enquiry.
+"""
+
+
+Quaternary = namedtuple(
+    "Quaternary", ["sublattices", "binaries", "ternaries", "parameters"]
+)
+"""A quaternary alloy described in terms of its binaries and ternaries.
+
+'binaries' holds the name of each binary with its element in each sublattice, and
+'ternaries' the name of each ternary in the source - or None, if it is not there -
+with the two elements that mix in it and the elements in the other sublattices.
+"""
+
+
+def _quaternaries(data: Dict[str, Dict]) -> Dict[str, Quaternary]:
+    """Describe the quaternary alloys of a source, given by their sublattices.
+
+    Quaternaries are given as, eg. {"sublattices": [["Ga", "In"], ["As", "P"]]}. The
+    binaries are named after their elements, eg. 'GaAs', and the ternaries are those
+    in the source whose parents are two binaries differing in one element. The
+    quaternary provides the parameters that its binaries have in common in the
+    source and those for which any of its ternaries has a bowing.
+
+    Args:
+        data: Dictionary of materials and their raw parameters.
+
+    Returns:
+        A dictionary with the description of each quaternary.
+    """
+    ternaries = {
+        frozenset((dmat["parent0"], dmat["parent1"])): m
+        for m, dmat in data.items()
+        if "parent0" in dmat and "parent1" in dmat
+    }
+
+    out = {}
+    for material, dmat in data.items():
+        if "sublattices" not in dmat:
+            continue
+
+        sublattices = tuple(tuple(s) for s in dmat["sublattices"])
+        binaries = tuple(("".join(e), e) for e in product(*sublattices))
+        mixed = []
+        for (n0, e0), (n1, e1) in combinations(binaries, 2):
+            differ = [i for i in range(len(sublattices)) if e0[i] != e1[i]]
+            if len(differ) != 1:
+                continue
+            i = differ[0]
+            common = e0[:i] + e0[i + 1 :]
+            mixed.append((ternaries.get(frozenset((n0, n1))), (e0[i], e1[i]), common))
+
+        present = [set(data[n]) for n, _ in binaries if n in data]
+        shared = set.intersection(*present) if len(present) > 0 else set()
+        bowed = {p for t, _, _ in mixed if t is not None for p in data[t]}
+        parameters = tuple(sorted((shared | bowed) - set(ALLOY_KEYS)))
+        out[material] = Quaternary(sublattices, binaries, tuple(mixed), parameters)
+
+    return out
+
+
+def _fractions(
+    sublattices: Tuple[Tuple[str, ...], ...], comp: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Fraction of each element of an alloy in its sublattice.
+
+    The last element of each sublattice takes the fraction left by the others.
+
+    Args:
+        sublattices: The elements in each sublattice.
+        comp: The composition, with the fraction of all the elements but the last one
+            of each sublattice.
+
+    Raises:
+        InputArgumentMissing: if the fraction of any of the elements is missing.
+
+    Returns:
+        A dictionary with the fraction of each element, as a float or an array.
+    """
+    fractions: Dict[str, np.ndarray] = {}
+    for elements in sublattices:
+        rest = np.ones(())
+        for e in elements[:-1]:
+            if e not in comp:
+                raise InputArgumentMissing(e)
+            fractions[e] = np.asarray(comp[e], dtype=float)
+            rest = rest - fractions[e]
+        fractions[elements[-1]] = rest
+    return fractions
+
+
+def _parse_source(
+    path: Path,
+) -> Tuple[str, Dict[str, str], Dict[str, Dict], Dict[str, Column], Dict]:
+    """Parse the file of a simple source, arranging its data for quick access.
+
+    Args:
+        path: The file of the source.
+
+    Returns:
+        A tuple with the reference, descriptions, raw data, parameter columns and
+        quaternaries of the source.
+    """
+    with path.open("r") as f:
+        data = json.load(f)
+
+    reference = data.pop("reference", "")
+    descriptions = data.pop("descriptions", {})
+
+    # Expressions are compiled once, rather than every time they are evaluated
+    for parameters in data.values():
+        for p, raw in parameters.items():
+            if isinstance(raw, str) and p not in ALLOY_KEYS:
+                _try_compile(raw)
+
+    return reference, descriptions, data, _columns(data), _quaternaries(data)
+
+
+def _columns(data: Dict[str, Dict]) -> Dict[str, Column]:
+    """Arrange the data of a source by parameter, rather than by material.
+
+    Args:
+        data: Dictionary of materials and their raw parameters.
+
+    Returns:
+        A dictionary with the column of each parameter.
+    """
+    entries: Dict[str, List[Tuple[str, Optional[Expression]]]] = defaultdict(list)
+    for material, parameters in data.items():
+        if "x" in parameters or "sublattices" in parameters:
+            continue
+        for p, raw in parameters.items():
+            entries[p].append((material, _try_compile(raw)))
+
+    columns = {}
+    for p, column in entries.items():
+        materials = tuple(m for m, _ in column)
+        units = next(
+            (e.units for _, e in column if e is not None and e.units is not None), None
+        )
+        values = np.full(len(column), np.nan)
+        expressions = []
+        for i, (_, expression) in enumerate(column):
+            try:
+                factor = (
+                    None if expression is None else _factor(expression.units, units)
+                )
+            except DimensionalityError:
+                factor = None
+            if (
+                expression is not None
+                and factor is not None
+                and expression.function is None
+            ):
+                values[i] = expression.value * factor
+            else:
+                expressions.append((i, expression, factor))
+        values.flags.writeable = False
+        index = {m: i for i, m in enumerate(materials)}
+        columns[p] = Column(materials, index, values, units, tuple(expressions))
+
+    return columns
+
+
+def _try_compile(raw: Any) -> Optional[Expression]:
+    """Compile the raw value of a parameter, if it is a valid one.
+
+    Args:
+        raw: The raw value of the parameter, a number or a string.
+
+    Returns:
+        The compiled expression or None if it cannot be compiled, eg. it is a note or
+        its units are not known. Enquiries about it will report the error.
+    """
+    try:
+        if isinstance(raw, str):
+            return _compile(raw)
+        return Expression(float(raw), None, None, (), None)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _factor(units: Any, target: Any) -> float:
+    """Factor converting a magnitude in some units to the target units.
+
+    Args:
+        units: The units of the magnitude, or None if it is dimensionless.
+        target: The target units, or None if they are dimensionless.
+
+    Returns:
+        The conversion factor.
+    """
+    if units == target:
+        return 1.0
+    return float(Quantity(1.0, units).m_as(target))
+
+
+def _evaluate(expression: Expression, context: Context) -> Any:
+    """Evaluate a compiled expression with the inputs in the context.
+
+    Args:
+        expression: The compiled expression.
+        context: The input arguments, including the variables of the expression.
+
+    Raises:
+        InputArgumentMissing: if any of the variables of the expression is missing
+            from the input arguments.
+
+    Returns:
+        The magnitude resulting from the evaluation.
+    """
+    if expression.function is None:
+        return expression.value
+
+    magnitudes = context.magnitudes
+    for v in expression.variables:
+        if v not in magnitudes:
+            raise InputArgumentMissing(v)
+    function = expression.array_function if context.has_arrays else expression.function
+    return function(*(magnitudes[v] for v in expression.variables))
+
 
 def locate_source_files_builtin() -> Iterator[Path]:
     """Locate the builtin parameter sources and return their names."""
@@ -46,14 +431,14 @@ def locate_source_files() -> Tuple[Iterator[Path], ...]:
     )
 
 
-@lru_cache(maxsize=128)
 def populate_sources(
-    locations: Tuple[Iterator[Path], ...] = locate_source_files(),
+    locations: Optional[Tuple[Iterable[Path], ...]] = None,
 ) -> Tuple[List, Dict[str, Path], Dict[str, int]]:
     """Create a subclass of the SimpleSource for each available parameters file.
 
     Args:
         locations: Tuple of iterators providing the paths for the parameters files.
+            By default, the standard locations are scanned when called.
 
     Returns:
         tuple with the:
@@ -61,6 +446,9 @@ def populate_sources(
             - dictionary to the source files
             - dictionary with the respective priorities
     """
+    if locations is None:
+        locations = locate_source_files()
+
     name: List[str] = []
     path: Dict[str, Path] = {}
     priority: Dict[str, int] = {}
@@ -74,15 +462,115 @@ def populate_sources(
     return name, path, priority
 
 
+SourceFile = namedtuple("SourceFile", ["path", "priority", "mtime", "size"])
+"""File providing a simple source, with the information to tell if it has changed."""
+
+_discovered: Dict[str, SourceFile] = {}
+"""Files of the simple sources registered so far."""
+
+_registered: Dict[str, Type[SimpleSource]] = {}
+"""Classes of the simple sources registered so far."""
+
+_discovery_lock = Lock()
+
+
+def scan_sources(
+    locations: Optional[Tuple[Iterable[Path], ...]] = None
+) -> Dict[str, SourceFile]:
+    """Find the files of the simple sources and when they were last modified.
+
+    When there are several files for a source, the one in the location with the
+    highest priority is used, as in 'populate_sources'. Files that disappear while
+    scanning are skipped.
+
+    Args:
+        locations: Tuple of iterators providing the paths for the parameters files.
+            By default, the standard locations are scanned.
+
+    Returns:
+        A dictionary with the file of each source.
+    """
+    _, path, priority = populate_sources(locations)
+    out = {}
+    for n, p in path.items():
+        try:
+            stat = p.stat()
+        except OSError:
+            continue
+        out[n] = SourceFile(p, priority[n], stat.st_mtime_ns, stat.st_size)
+    return out
+
+
+def refresh_simple_sources(
+    locations: Optional[Tuple[Iterable[Path], ...]] = None
+) -> Tuple[str, ...]:
+    """Register, reload or remove simple sources whose files have changed.
+
+    The standard locations are scanned again, so files dropped there, eg. in a
+    directory of SOLCORE_PARAMETERS, after solcore was imported become available. Only
+    the sources whose files are new, modified or gone are touched and, for those
+    already loaded, only the cached values depending on them are discarded (see
+    'ParameterManager.reload_source'). Nothing is read unless a file has changed, so
+    this is cheap enough to be called before every enquiry in long-running
+    applications.
+
+    Args:
+        locations: Tuple of iterators providing the paths for the parameters files.
+            By default, the standard locations are scanned.
+
+    Returns:
+        A tuple with the names of the sources that have changed.
+    """
+    global _discovered
+
+    with _discovery_lock:
+        found = scan_sources(locations)
+        changed = tuple(n for n in found if _discovered.get(n) != found[n]) + tuple(
+            n for n in _discovered if n not in found
+        )
+        for n in changed:
+            if n not in found:
+                del _registered[n]
+                ParameterManager().remove_source(n)
+            elif n not in _registered:
+                _register(SimpleSource, n, found[n])
+            else:
+                cls = _registered[n]
+                cls._path = found[n].path
+                cls._priority = found[n].priority
+                cls._instance = None
+                ParameterManager().reload_source(n)
+
+        _discovered = found
+        return changed
+
+
+def _register(cls: Type[SimpleSource], name: str, source_file: SourceFile) -> None:
+    """Create and register the subclass of the SimpleSource for a parameters file.
+
+    Args:
+        cls: The SimpleSource class.
+        name: Name of the source.
+        source_file: File providing the source.
+
+    Returns:
+        None
+    """
+    _registered[name] = type(
+        f"{name}{cls.__name__}",
+        (cls,),
+        {"name": name, "_path": source_file.path, "_priority": source_file.priority},
+    )
+
+
 def register_simple_sources(cls):
     """Register multiple simple sources found in standard locations."""
-    name, path, priority = populate_sources()
-    for n in name:
-        type(
-            f"{n}{cls.__name__}",
-            (cls,),
-            {"name": n, "_path": path[n], "_priority": priority[n]},
-        )
+    global _discovered
+
+    with _discovery_lock:
+        _discovered = scan_sources()
+        for n, source_file in _discovered.items():
+            _register(cls, n, source_file)
     return cls
 
 
@@ -92,14 +580,31 @@ class SimpleSource(ParameterSourceBase):
     name: str = "_"
     _path: Path = Path()
     _instance = None
+    _alloys_maxsize: int = 1024
 
-    def __new__(cls, reference, descriptions, data, *args, **kwargs):
+    def __new__(
+        cls,
+        reference,
+        descriptions,
+        data,
+        *args,
+        columns=None,
+        quaternaries=None,
+        **kwargs,
+    ):
         if cls._instance is None:
-            cls._instance = ParameterSourceBase.__new__(cls)
+            inst = ParameterSourceBase.__new__(cls)
 
-            cls._instance.reference = reference
-            cls._instance._descriptions = descriptions
-            cls._instance._data = data
+            inst.reference = reference
+            inst._descriptions = descriptions
+            inst._data = data
+            inst._columns = _columns(data) if columns is None else columns
+            inst._quaternaries = (
+                _quaternaries(data) if quaternaries is None else quaternaries
+            )
+            inst._alloys = OrderedDict()
+            inst._alloys_lock = Lock()
+            cls._instance = inst
 
         return cls._instance
 
@@ -114,19 +619,22 @@ class SimpleSource(ParameterSourceBase):
         Returns:
             An instance of the source class
         """
-        with cls._path.open("r") as f:
-            data = json.load(f)
-
-        reference = data.pop("reference", "")
-        descriptions = data.pop("descriptions", {})
-
-        return cls(reference, descriptions, data)
+        reference, descriptions, data, columns, quaternaries = cached(
+            cls.name, (cls._path,), partial(_parse_source, cls._path)
+        )
+        return cls(
+            reference, descriptions, data, columns=columns, quaternaries=quaternaries
+        )
 
     def __init__(
         self,
         reference: str,
         descriptions: Optional[Dict[str, str]],
         data: Dict[str, Dict],
+        *args,
+        columns: Optional[Dict[str, Column]] = None,
+        quaternaries: Optional[Dict[str, Quaternary]] = None,
+        **kwargs,
     ):
         """Base class for all sources directly derived from data in a file.
 
@@ -135,10 +643,16 @@ class SimpleSource(ParameterSourceBase):
             reference: Reference indicating the origin of the data.
             descriptions: Dictionary linking each property
                 (a short name) with a description indicating what they are.
+            columns: The data arranged by parameter, if already available.
+            quaternaries: The description of the quaternaries, if already available.
         """
         self.reference: str
         self._data: Dict[str, Dict]
         self._descriptions: Dict[str, str]
+        self._columns: Dict[str, Column]
+        self._quaternaries: Dict[str, Quaternary]
+        self._alloys: OrderedDict[Hashable, Coefficients]
+        self._alloys_lock: Lock
 
     @property
     def materials(self) -> Tuple[str, ...]:
@@ -160,6 +674,8 @@ class SimpleSource(ParameterSourceBase):
         """
         if material not in self.materials:
             return ()
+        elif material in self._quaternaries:
+            return self._quaternaries[material].parameters
 
         return tuple(self._data[material].keys())
 
@@ -179,6 +695,26 @@ class SimpleSource(ParameterSourceBase):
             ParameterMissing: if the parameter does not exist for that material
             InputArgumentMissing: if there is a problem when retrieving the parameter.
 
+        Returns:
+            A Parameter object with the requested parameter.
+        """
+        return self.get_parameter_in_context(material, parameter, Context(kwargs))
+
+    def get_parameter_in_context(
+        self, material: str, parameter: str, context: Context
+    ) -> Parameter:
+        """Retrieve the parameter for the material given the context of the enquiry.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            context (Context): The input arguments of the enquiry.
+
+        Raises
+            MaterialMissing: if the material does not exist in the source
+            ParameterMissing: if the parameter does not exist for that material
+            InputArgumentMissing: if there is a problem when retrieving the parameter.
+
         Returns:
             A Parameter object with the requested parameter.
         """
@@ -186,25 +722,126 @@ class SimpleSource(ParameterSourceBase):
             raise ParameterMissing(self.name, material, parameter)
 
         if "x" in self._data[material]:
-            return self._get_parameter_alloy(material, parameter, **kwargs)
+            return self._get_parameter_alloy(material, parameter, context)
+        elif material in self._quaternaries:
+            return self._get_parameter_quaternary(material, parameter, context)
         else:
             raw = self._data[material][parameter]
-            return self.to_param(raw, parameter, **kwargs)
+            return self.to_param(raw, parameter, context)
+
+    def get_parameter_table(
+        self, parameter: str, context: Optional[Context] = None, **kwargs
+    ) -> Tuple[Tuple[str, ...], Parameter]:
+        """Retrieve the parameter for all the materials of the source at once.
+
+        The constant values are taken directly from the columns built when loading
+        the source, so only the expressions need evaluating. Alloys are not included.
+
+        Args:
+            parameter (str): The parameter of interest.
+            context (Optional[Context]): The input arguments of the enquiry.
+            **kwargs: Any other argument needed to calculate the requested parameter.
+
+        Raises
+            ParameterMissing: if no material has the parameter.
+            InputArgumentMissing: if any argument needed by the expressions is missing.
+            DimensionalityError: if the units of an entry are not compatible with
+                those of the rest.
+
+        Returns:
+            A tuple with the materials and a Parameter with their values, in the same
+            units. If the inputs are arrays, the first dimension runs over materials.
+        """
+        column = self._columns.get(parameter)
+        if column is None:
+            raise ParameterMissing(self.name, "any material", parameter)
+
+        context = Context.of(context, kwargs)
+        evaluated = []
+        for i, expression, factor in column.expressions:
+            if factor is None:
+                # Reports the error of the entry, as when enquiring about the material
+                raw = self._data[column.materials[i]][parameter]
+                value = self.to_param(raw, parameter, context).m_as(
+                    column.units if column.units is not None else "dimensionless"
+                )
+            else:
+                value = _evaluate(expression, context) * factor
+            evaluated.append((i, value))
+        shape = np.broadcast_shapes(*(np.shape(v) for _, v in evaluated))
+        values = np.empty((len(column.values), *shape))
+        values[...] = column.values.reshape(-1, *(1,) * len(shape))
+        for i, v in evaluated:
+            values[i] = v
+
+        out = Parameter(
+            values,
+            units=column.units,
+            description=self._descriptions.get(parameter, ""),
+            reference=self.name,
+        )
+        return column.materials, out
 
     def get_nk(self, material: str, **kwargs):
         raise ParameterMissing(self.name, material, "nk")
 
+    def dependencies(
+        self, material: str, parameter: str
+    ) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """Inputs and parameters the parameter directly depends on.
+
+        These are the variables of the expression of the parameter and, for alloys,
+        the composition and the parameter of the parents or of the binaries.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+
+        Returns:
+            A tuple with the dependencies or None if they are not known.
+        """
+        if parameter not in self.parameters(material):
+            return None
+
+        dmat = self._data[material]
+        if material in self._quaternaries:
+            quaternary = self._quaternaries[material]
+            return (
+                (material, "comp"),
+                *((name, parameter) for name, _ in quaternary.binaries),
+                *(
+                    (material, v)
+                    for t, _, _ in quaternary.ternaries
+                    if t is not None
+                    for v in _variables(self._data[t].get(parameter, 0))
+                    if v != self._data[t]["x"]
+                ),
+            )
+        elif "x" not in dmat:
+            return tuple((material, v) for v in _variables(dmat[parameter]))
+        elif "parent0" not in dmat or "parent1" not in dmat:
+            return None
+
+        return (
+            (material, "comp"),
+            (dmat["parent0"], parameter),
+            (dmat["parent1"], parameter),
+            *((material, v) for v in _variables(dmat.get(parameter, 0))),
+        )
+
     def _get_parameter_alloy(
-        self, material: str, parameter: str, **kwargs
+        self,
+        material: str,
+        parameter: str,
+        context: Optional[Context] = None,
+        **kwargs,
     ) -> Parameter:
         """Retrieve the parameter for the material in the case of a ternary alloy.
 
-        Any arguments that obtaining this parameter requires must be included as
-        keyword arguments in the call.
-
         Args:
             material (str): Material the enquiry is about.
             parameter (str): The parameter of interest.
+            context (Optional[Context]): The input arguments of the enquiry.
             **kwargs: Any other argument needed to calculate the requested parameter.
 
         Raises
@@ -216,10 +853,11 @@ class SimpleSource(ParameterSourceBase):
             A Parameter object with the requested parameter.
         """
         dmat = self._data[material]
+        context = Context.of(context, kwargs)
 
         p0name = dmat.get("parent0", None)
         p1name = dmat.get("parent1", None)
-        x = kwargs.get("comp", {}).get(dmat["x"], None)
+        x = context.get("comp", {}).get(dmat["x"], None)
 
         if p0name is None:
             raise ParameterMissing(self.name, material, "parent0")
@@ -229,54 +867,183 @@ class SimpleSource(ParameterSourceBase):
         if x is None:
             raise InputArgumentMissing(dmat["x"])
 
-        kwargs[dmat["x"]] = x
+        context = context.replace(**{dmat["x"]: x})
 
-        p0 = self.parman.get_parameter(p0name, parameter, **kwargs)
-        p1 = self.parman.get_parameter(p1name, parameter, **kwargs)
-        b = self.to_param(dmat.get(parameter, 0), parameter, **kwargs)
+        p0, p1, b = self._alloy_coefficients(material, parameter, context)
+        if b is None:
+            b = self.to_param(dmat.get(parameter, 0), parameter, context)
 
         raw = alloy_parameter(p0, p1, x, b)
-        return self.to_param(raw, parameter, **kwargs)
+        return self.to_param(raw, parameter, context)
+
+    def _get_parameter_quaternary(
+        self, material: str, parameter: str, context: Context
+    ) -> Parameter:
+        """Retrieve the parameter for the material in the case of a quaternary alloy.
+
+        The parameter is interpolated from that of the binaries, weighted by the
+        fractions of their elements, minus the bowing of the ternaries, weighted by the
+        fractions of the two elements that mix and of those in the other sublattices.
+        For A_x B_(1-x) C_y D_(1-y) alloys this is the usual scheme based on the four
+        ternaries and, for A_x B_y C_(1-x-y) D alloys, the one based on the three of
+        them. Bowings depending on the composition of the ternary are evaluated with
+        the relative fraction of the two elements that mix. The composition can be
+        given as arrays, eg. a grid, which are evaluated at once.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            context (Context): The input arguments of the enquiry.
+
+        Raises
+            InputArgumentMissing: if the composition or any other input needed by the
+                binaries or the bowings is missing.
+
+        Returns:
+            A Parameter object with the requested parameter.
+        """
+        quaternary = self._quaternaries[material]
+        fractions = _fractions(quaternary.sublattices, context.get("comp", {}))
+        others = Context({k: v for k, v in context.items() if k != "comp"})
+
+        value = sum(
+            reduce(mul, (fractions[e] for e in elements))
+            * self.parman.get_parameter(name, parameter, context=others)
+            for name, elements in quaternary.binaries
+        )
+        for ternary, (a, b), common in quaternary.ternaries:
+            raw = self._data[ternary].get(parameter) if ternary is not None else None
+            if raw is None:
+                continue
+
+            x = self._data[ternary]["x"]
+            inputs = context
+            if x in (a, b):
+                total = fractions[a] + fractions[b]
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    relative = np.where(total > 0, fractions[x] / total, 0.5)
+                inputs = context.replace(**{x: relative})
+
+            weight = reduce(mul, (fractions[e] for e in (a, b, *common)))
+            value = value - weight * self.to_param(raw, parameter, inputs)
+
+        return self.to_param(value, parameter, context)
+
+    def _alloy_coefficients(
+        self, material: str, parameter: str, context: Context
+    ) -> Coefficients:
+        """Terms of the parameter of a ternary alloy independent of the composition.
+
+        They are cached for each combination of the other inputs, so enquiries for
+        different compositions of the alloy - or for arrays of them - only need
+        evaluating the polynomial in 'alloy_parameter'.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            context (Context): The input arguments of the enquiry, including the
+                composition.
+
+        Returns:
+            The coefficients of the parameter.
+        """
+        key = self._alloy_key(material, parameter, context)
+        if key is not None:
+            with self._alloys_lock:
+                coefficients = self._alloys.get(key)
+                if coefficients is not None:
+                    self._alloys.move_to_end(key)
+                    return coefficients
+
+        dmat = self._data[material]
+        raw = dmat.get(parameter, 0)
+        coefficients = Coefficients(
+            self.parman.get_parameter(dmat["parent0"], parameter, context=context),
+            self.parman.get_parameter(dmat["parent1"], parameter, context=context),
+            None
+            if dmat["x"] in _variables(raw)
+            else self.to_param(raw, parameter, context),
+        )
+
+        if key is not None:
+            with self._alloys_lock:
+                self._alloys[key] = coefficients
+                if len(self._alloys) > self._alloys_maxsize:
+                    self._alloys.popitem(last=False)
+        return coefficients
+
+    def _alloy_key(
+        self, material: str, parameter: str, context: Context
+    ) -> Optional[Hashable]:
+        """Key of the coefficients of the parameter of an alloy for the context.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+            context (Context): The input arguments of the enquiry.
+
+        Returns:
+            The key, made of the inputs the parents and the bowing depend on, or None
+            if the coefficients cannot be cached, because the parameter of the parents
+            might depend on the composition or the inputs cannot be hashed.
+        """
+        dmat = self._data[material]
+        composition = ("comp", dmat["x"])
+        names = set(_variables(dmat.get(parameter, 0))) - set(composition)
+        for parent in (dmat["parent0"], dmat["parent1"]):
+            dependencies = self.parman.dependencies(parent, parameter)
+            if dependencies is None or any(c in dependencies for c in composition):
+                return None
+            names.update(dependencies)
+
+        key = context.key_of(frozenset(names))
+        return None if key is None else (material, parameter, key)
+
+    def clear_cache(self) -> None:
+        """Discard the coefficients of the alloys, as the parents might have changed.
+
+        Returns:
+            None
+        """
+        with self._alloys_lock:
+            self._alloys.clear()
 
     def to_param(
-        self, raw: Union[float, str, Parameter], parameter: str, **kwargs
+        self,
+        raw: Union[float, str, Parameter],
+        parameter: str,
+        context: Optional[Context] = None,
+        **kwargs,
     ) -> Parameter:
         """Transform a raw input read from file into a Parameter object.
 
         If it cannot be transformed directly because the parameter value is written as
-        some sort of small mathematical expression (eg. 2*cos(4*T) ) then 'eval' is used
-        to evaluate the expression. To be safe, the '__builtins__' passed to 'eval' are
-        limited to the contents of the 'math' builtin library.
+        some sort of small mathematical expression (eg. 2*cos(4*T) ) then the
+        expression, compiled the first time it is seen, is evaluated. To be safe, the
+        expressions can only use the contents of the 'math' builtin library, replaced
+        by their NumPy element-wise equivalents if any of the inputs is an array.
 
         Args:
             raw: The raw value of the parameter.
             parameter: The name of the parameter.
+            context: The input arguments needed to calculate the parameter.
             **kwargs: Any other argument needed to calculate the requested parameter.
 
         Raises:
-            InputArgumentMissing: if 'eval' does not have all the information required
-                to evaluate the expression.
+            InputArgumentMissing: if any of the variables of the expression is missing
+                from the input arguments.
 
         Returns:
             A Parameter object with the requested parameter.
         """
         if isinstance(raw, str):
-            value, units = raw.split(" ", 1)
-            try:
-                value = float(value)
-            except ValueError:
-                try:
-                    kw = {
-                        k: (v.m if isinstance(v, Quantity) else v)
-                        for k, v in kwargs.items()
-                    }
-                    value = eval(value, {"__builtins__": SAFE_BUILTINS}, kw)
-                except NameError as err:
-                    var = re.search("(?<=')(.*?)(?=')", err.__str__())
-                    if var is not None:
-                        raise InputArgumentMissing(var[0])
-                    else:
-                        raise err
+            expression = _compile(raw)
+            value = (
+                expression.value
+                if expression.function is None
+                else _evaluate(expression, Context.of(context, kwargs))
+            )
+            units = expression.units
         else:
             value = raw
             units = None
@@ -290,8 +1057,6 @@ class SimpleSource(ParameterSourceBase):
 
 
 if __name__ == "__main__":
-    from solcore.parameter import ParameterManager
-
     v = ParameterManager()._load_source("vurgaftmanJAP2001")
     print(v.get_parameter("GaAs", "gamma1"))
     print(v.get_parameter("GaAs", "alpha_gamma"))
@@ -1,10 +1,14 @@
-from typing import Tuple
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Optional, Tuple
 from pathlib import Path
-from configparser import ConfigParser
-import pint_xarray  # noqa: F401
 
 import xarray as xr
-import pandas as pd
+
+if TYPE_CHECKING:
+    from configparser import ConfigParser
+    import pandas as pd
 
 from solcore.parameter import (
     Parameter,
@@ -13,19 +17,29 @@ from solcore.parameter import (
     ParameterMissing,
     MaterialMissing,
 )
+from solcore.parameter_sources.source_cache import cached
 
 
 class SopraNKSource(ParameterSourceBase):
 
     name: str = "SopraNK"
     _root = Path(__file__).parent.parent / "material_data" / "sopra_nk"
+    _provides = ("nk",)
     _instance = None
 
     def __new__(cls, contents: pd.DataFrame, compounds: ConfigParser, *args, **kwargs):
         if cls._instance is None:
-            cls._instance = ParameterSourceBase.__new__(cls)
-            cls._instance._contents = contents
-            cls._instance._compounds = compounds
+            inst = ParameterSourceBase.__new__(cls)
+            inst._contents = contents
+            inst._compounds = compounds
+            inst._materials = tuple(
+                (
+                    str(m)
+                    for m in contents.Symbol.unique()
+                    if m not in compounds.sections()
+                )
+            )
+            cls._instance = inst
 
         return cls._instance
 
@@ -34,6 +48,7 @@ class SopraNKSource(ParameterSourceBase):
     ):
         self._contents: pd.DataFrame
         self._compounds: ConfigParser
+        self._materials: Tuple[str, ...]
 
     @classmethod
     def load_source(cls, source_name: str = "") -> ParameterSourceBase:
@@ -46,11 +61,31 @@ class SopraNKSource(ParameterSourceBase):
         Returns:
             An instance of the source class
         """
-        contents = pd.read_csv(cls._root / "SOPRA_DB_Updated.csv")
-        compounds = ConfigParser()
-        compounds.read(cls._root / "compounds.txt")
+        paths = (cls._root / "SOPRA_DB_Updated.csv", cls._root / "compounds.txt")
+        contents, compounds = cached(
+            cls.name, paths, partial(cls._parse, *paths), libraries=("pandas",)
+        )
         return cls(contents, compounds)
 
+    @staticmethod
+    def _parse(index: Path, compounds_file: Path) -> Tuple[pd.DataFrame, ConfigParser]:
+        """Parse the index of the database and the description of the compounds.
+
+        Args:
+            index: CSV file with the materials in the database.
+            compounds_file: File with the bowing element of each compound.
+
+        Returns:
+            A tuple with the index, as a DataFrame, and the compounds.
+        """
+        from configparser import ConfigParser
+        import pandas as pd
+
+        contents = pd.read_csv(index)
+        compounds = ConfigParser()
+        compounds.read(compounds_file)
+        return contents, compounds
+
     @property
     def materials(self) -> Tuple[str, ...]:
         """Materials this source provides parameters for.
@@ -58,13 +93,7 @@ class SopraNKSource(ParameterSourceBase):
         Returns:
             A tuple with the list of materials.
         """
-        return tuple(
-            (
-                str(m)
-                for m in self._contents.Symbol.unique()
-                if m not in self._compounds.sections()
-            )
-        )
+        return self._materials
 
     def parameters(self, material: str) -> Tuple[str, ...]:
         """Parameters available in this source for the requested material.
@@ -118,6 +147,9 @@ class SopraNKSource(ParameterSourceBase):
         Returns:
             A DataArray with the required data.
         """
+        import pandas as pd
+        import pint_xarray  # noqa: F401
+
         if material not in self.materials:
             raise MaterialMissing(self.name, material)
 
@@ -145,6 +177,24 @@ class SopraNKSource(ParameterSourceBase):
         )
         return data.pint.quantify({data.name: "dimensionless", "wavelength": "m"})
 
+    def dependencies(
+        self, material: str, parameter: str
+    ) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """Inputs and parameters the parameter directly depends on.
+
+        The nk data depends only on the composition.
+
+        Args:
+            material (str): Material the enquiry is about.
+            parameter (str): The parameter of interest.
+
+        Returns:
+            A tuple with the dependencies or None if they are not known.
+        """
+        if parameter not in self.parameters(material):
+            return None
+        return ((material, "comp"),)
+
     def _load_alloy(self, folder: Path, comp: float) -> pd.DataFrame:
         """Loads the data - and calculates - the n and k of an alloy.
 
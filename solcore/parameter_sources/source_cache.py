@@ -0,0 +1,142 @@
+"""Persistent cache of the parsed parameter sources, in the solcore user directory.
+
+Parsing the files of the sources is done every time a process loads them, which adds
+up for many short-lived processes. The parsed sources are stored in the user
+directory, in a binary file per source, keyed by the contents of the files they come
+from and the version of solcore, so they are parsed again only if any of these
+changes. Cache files are written to a temporary file first and then moved into
+place, so several processes can share them safely.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import sys
+from hashlib import sha256
+from importlib import import_module
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Callable, Sequence, Tuple
+
+from solcore import __version__
+
+logger = getLogger(__name__)
+
+
+def user_dir() -> Path:
+    """Directory for the files that solcore keeps per user.
+
+    Returns:
+        The path to the directory, which might not exist, yet.
+    """
+    if sys.platform == "win32":
+        return Path.home() / "AppData" / "Local" / "solcore"
+    elif sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / "solcore"
+    return Path.home() / ".solcore"
+
+
+def cache_dir() -> Path:
+    """Directory where the parsed sources are cached.
+
+    Returns:
+        The path to the directory, which might not exist, yet.
+    """
+    return user_dir() / "cache"
+
+
+LIBRARIES: Tuple[str, ...] = ("numpy", "pint")
+"""Libraries whose objects are in all the cached sources, eg. arrays and units."""
+
+
+def cached(
+    name: str,
+    paths: Sequence[Path],
+    loader: Callable[[], Any],
+    libraries: Sequence[str] = (),
+) -> Any:
+    """Load the parsed contents of some files from the cache, parsing them if needed.
+
+    The cache is keyed by the contents of the files and the versions of solcore, of
+    Python and of the libraries whose objects are stored, so upgrading any of them
+    parses the files again rather than unpickling incompatible objects. If the cache
+    cannot be read or written, eg. the user directory is read only, the files are
+    parsed every time, as if there was no cache.
+
+    Args:
+        name: Name identifying the cached contents, eg. the name of the source.
+        paths: Files the contents are parsed from.
+        loader: Function without arguments parsing the files. Its output must be
+            picklable.
+        libraries: Libraries, other than those in LIBRARIES, whose objects are in
+            the output of the loader, eg. 'pandas'. They are imported to get their
+            versions.
+
+    Returns:
+        The output of the loader.
+    """
+    versions = [__version__, str(sys.version_info[:2])]
+    for library in (*LIBRARIES, *libraries):
+        versions.append(f"{library}={import_module(library).__version__}")
+    digest = sha256(" ".join(versions).encode())
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    target = cache_dir() / f"{name}-{digest.hexdigest()[:32]}.pickle"
+
+    try:
+        with target.open("rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as err:
+        logger.warning(f"Discarding the cache of '{name}' as it is invalid: {err}")
+
+    out = loader()
+    try:
+        _write(target, out)
+    except Exception as err:
+        logger.warning(f"The cache of '{name}' could not be written: {err}")
+    return out
+
+
+def _write(target: Path, value: Any) -> None:
+    """Write the value to the cache file and remove older versions of it.
+
+    The value is written to a temporary file in the same directory, which is then
+    renamed atomically, so other processes never read a partially written file.
+
+    Args:
+        target: The cache file.
+        value: The value to store.
+
+    Returns:
+        None
+    """
+    from tempfile import NamedTemporaryFile
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(
+        "wb", dir=target.parent, prefix=f".{target.stem}-", delete=False
+    ) as f:
+        try:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, target)
+
+    name = target.stem.rsplit("-", 1)[0]
+    for old in target.parent.glob(f"{name}-*.pickle"):
+        if old != target and old.stem.rsplit("-", 1)[0] == name:
+            old.unlink(missing_ok=True)
+
+
+def clear() -> None:
+    """Remove all the cached sources.
+
+    Returns:
+        None
+    """
+    for path in cache_dir().glob("*.pickle"):
+        path.unlink(missing_ok=True)
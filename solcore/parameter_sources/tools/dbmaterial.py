@@ -1,8 +1,6 @@
 # from: https://github.com/HugoGuillen/refractiveindex.info-sqlite
 
-import yaml
 import numpy
-import scipy.interpolate
 
 
 class DBMaterial:
@@ -21,6 +19,8 @@ class DBMaterial:
         if empty:
             return
 
+        import yaml
+
         f = open(filename)
         try:
             material = yaml.safe_load(f)
@@ -403,6 +403,8 @@ class TabulatedRefractiveIndexData:
         if self.rangeMin == self.rangeMax:
             self.refractiveFunction = values[0]
         else:
+            import scipy.interpolate
+
             self.refractiveFunction = scipy.interpolate.interp1d(wavelengths, values)
 
         self.wavelengths = wavelengths
@@ -468,6 +470,8 @@ class ExtinctionCoefficientData:
         :param wavelengths:
         :param coefficients:
         """
+        import scipy.interpolate
+
         self.extCoeffFunction = scipy.interpolate.interp1d(wavelengths, coefficients)
         self.rangeMin = numpy.min(wavelengths)
         self.rangeMax = numpy.max(wavelengths)
@@ -4,6 +4,7 @@ from collections import namedtuple, OrderedDict
 import os
 import yaml
 import sqlite3
+import threading
 import numpy as np
 from pathlib import Path
 import pandas as pd
@@ -20,12 +21,33 @@ class Database:
     def __init__(self, sqlitedbpath):
         self.db_path = sqlitedbpath
         self.version = ""
+        self._local = threading.local()
         if not os.path.isfile(sqlitedbpath):
             print("Database file not found.")
         else:
             print("Database file found at", sqlitedbpath)
 
+    def _connect(self):
+        """Connection to the database for the current thread.
+
+        SQLite connections cannot be shared between threads, so each thread opens
+        its own the first time it needs it and reuses it afterwards.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close the connection to the database of the current thread, if any."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def create_database_from_folder(self, yml_database_path, interpolation_points=200):
+        self.close()
         create_sqlite_database(
             yml_database_path, self.db_path, interpolation_points=interpolation_points
         )
@@ -42,7 +64,7 @@ class Database:
         pass
 
     def search_custom(self, sqlquery):
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         c.execute(sqlquery)
         results = c.fetchall()
@@ -50,11 +72,10 @@ class Database:
             print("No results found.")
         else:
             print(len(results), "results found.")
-        conn.close()
         return results
 
     def search_pages(self, term="", exact=False, print_list=False):
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
 
         if not exact:
@@ -71,7 +92,6 @@ class Database:
             )
 
         results = pd.DataFrame(c.fetchall(), columns=db._get_pages_columns())
-        conn.close()
 
         if print_list:
             print(results)
@@ -88,7 +108,7 @@ class Database:
 
     def search_n(self, n, delta_n):
         print("*Search n =", n, "delta_n =", delta_n)
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         interval = [n - delta_n, n + delta_n]
         c.execute(
@@ -105,11 +125,10 @@ class Database:
             print("pageid|shelf|book|page|wavelength|n")
             for r in results:
                 print(r)
-        conn.close()
 
     def search_k(self, k, delta_k):
         print("*Search k =", k, "delta_k =", delta_k)
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         interval = [k - delta_k, k + delta_k]
         c.execute(
@@ -126,11 +145,10 @@ class Database:
             print("pageid|shelf|book|page|wavelength|k")
             for r in results:
                 print(r)
-        conn.close()
 
     def search_nk(self, n, delta_n, k, delta_k):
         print("*Search n =", n, "delta_n =", delta_n, "k =", k, "delta_k =", delta_k)
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         interval = [n - delta_n, n + delta_n, k - delta_k, k + delta_k]
         c.execute(
@@ -148,23 +166,20 @@ class Database:
             print("pageid|shelf|book|page|wavelength|n|k")
             for r in results:
                 print(r)
-        conn.close()
 
     def get_available(self) -> pd.Series:
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         c.execute("SELECT book FROM pages")
         results = pd.DataFrame(c.fetchall())[0]
-        conn.close()
         return results
 
     def get_available_for_material(self, material=str) -> pd.DataFrame:
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         c.execute("SELECT * FROM pages WHERE book like ?", [material])
         results = pd.DataFrame(c.fetchall(), columns=self._get_pages_columns())
         results.set_index("pageid", inplace=True)
-        conn.close()
         return results
 
     def get_material(self, pageid):
@@ -173,7 +188,7 @@ class Database:
             print("PageID not found.")
             return None
         else:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             c = conn.cursor()
             wavelengths_r = None
             wavelengths_e = None
@@ -201,7 +216,6 @@ class Database:
                 results = c.fetchall()
                 wavelengths_e = [r[0] for r in results]
                 extinction = [r[1] for r in results]
-            conn.close()
             print("Material", pagedata["filepath"], "loaded.")
             return DBMaterial.FromLists(
                 pagedata,
@@ -288,22 +302,20 @@ class Database:
             self.get_material_csv(pageid=id, output="", folder=outputfolder)
 
     def _get_pages_columns(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         c.execute("PRAGMA table_info(pages);")
         results = c.fetchall()
         names = [r[1] for r in results]
-        conn.close()
         return names
 
     def _get_page_info(self, pageid):
         columns = self._get_pages_columns()
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         c.execute("SELECT * FROM pages WHERE pageid = ?", [pageid])
         results = c.fetchall()
         if len(results) == 0:
-            conn.close()
             return None
         else:
             row = results[0]
@@ -311,16 +323,14 @@ class Database:
             for idx, c in enumerate(columns):
                 data[c] = row[idx]
             # data = {columns[i]:row[i] for i in range(len(columns))}
-            conn.close()
             return data
 
     def _get_all_pageids(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         c = conn.cursor()
         c.execute("SELECT pageid FROM pages")
         results = c.fetchall()
         if len(results) == 0:
-            conn.close()
             return None
         else:
             pageids = [row[0] for row in results]
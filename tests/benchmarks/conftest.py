@@ -0,0 +1,58 @@
+"""Benchmarks of the hot paths of the library.
+
+They are disabled by default. Run them with:
+
+    pytest tests/benchmarks --benchmark-enable
+
+The results are saved in the '.benchmarks' folder, named after the commit, and two
+runs can be compared with:
+
+    pytest-benchmark compare 0001 0002
+"""
+from pytest import fixture
+
+NK_PAGE = """
+DATA:
+  - type: tabulated nk
+    data: |
+{}
+"""
+"""Page of the refractiveindex.info database with tabulated n and k data."""
+
+
+@fixture(scope="session")
+def manager():
+    from solcore.parameter import ParameterManager
+
+    pm = ParameterManager()
+    pm.preload()
+    return pm
+
+
+@fixture(scope="session")
+def nk_db(tmp_path_factory):
+    """Database of refractiveindex.info generated locally, with a single material."""
+    import numpy as np
+    from solcore.parameter_sources.tools.dboperations import Database
+
+    root = tmp_path_factory.mktemp("rii")
+    page = root / "data" / "main" / "GaAs" / "Bench.yml"
+    page.parent.mkdir(parents=True)
+    wavelength = np.linspace(0.3, 1.0, 701)
+    rows = (f"        {w:.4f} {3.5 + 0.1 * w:.4f} {0.1 / w:.4f}" for w in wavelength)
+    page.write_text(NK_PAGE.format("\n".join(rows)))
+    (root / "library.yml").write_text(
+        "- SHELF: main\n"
+        "  name: Inorganic materials\n"
+        "  content:\n"
+        "    - BOOK: GaAs\n"
+        "      name: GaAs\n"
+        "      content:\n"
+        "        - PAGE: Bench\n"
+        "          name: Benchmark data\n"
+        "          data: main/GaAs/Bench.yml\n"
+    )
+
+    path = root / "nk.db"
+    Database(str(path)).create_database_from_folder(str(root))
+    return path
@@ -0,0 +1,11 @@
+"""Benchmarks of the time it takes to import the library."""
+import subprocess
+import sys
+
+from pytest import mark
+
+
+@mark.parametrize("module", ["solcore.material", "solcore.parameter_sources"])
+def test_import(benchmark, module):
+    command = [sys.executable, "-c", f"import {module}"]
+    benchmark.pedantic(subprocess.run, (command,), {"check": True}, rounds=5)
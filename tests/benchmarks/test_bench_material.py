@@ -0,0 +1,152 @@
+"""Benchmarks of the creation of materials and the retrieval of their parameters."""
+from pytest import mark
+
+INCLUDE = ("band_gap", "ni", "lattice_constant", "electron_mobility")
+
+
+@mark.parametrize("include", [(), INCLUDE], ids=["no_include", "include"])
+def test_factory(benchmark, manager, include):
+    from solcore.material import Material
+
+    benchmark(Material.factory, "GaAs", include=include, T=300, Nd=1e23)
+
+
+@mark.parametrize("many", [False, True], ids=["loop", "factory_many"])
+def test_composition_sweep(benchmark, manager, many):
+    import numpy as np
+    from solcore.material import Material
+
+    x = np.linspace(0, 0.4, 50)
+
+    def sweep():
+        if many:
+            return Material.factory_many(
+                "AlGaAs", comp={"Al": x}, include=("band_gap",), T=300
+            )
+        return [
+            Material.factory("AlGaAs", comp={"Al": xi}, include=("band_gap",), T=300)
+            for xi in x
+        ]
+
+    def setup():
+        manager.clear_cache()
+
+    assert len(benchmark.pedantic(sweep, setup=setup, rounds=20)) == len(x)
+
+
+@mark.parametrize("evolve", [False, True], ids=["factory", "evolve"])
+def test_temperature_steps(benchmark, manager, evolve):
+    from solcore.material import Material
+
+    include = ("gamma1", "gamma2", "gamma3", "interband_matrix_element", "band_gap")
+
+    def steps():
+        mat = Material.factory("GaAs", include=include, T=300, Nd=1e23)
+        for T in range(301, 321):
+            if evolve:
+                mat = mat.evolve(T=T)
+            else:
+                mat = Material.factory("GaAs", include=include, T=T, Nd=1e23)
+            for p in include:
+                getattr(mat, p)
+        return mat
+
+    def setup():
+        manager.clear_cache()
+
+    benchmark.pedantic(steps, setup=setup, rounds=10)
+
+
+def test_getattr_cold(benchmark, manager):
+    from solcore.material import Material
+
+    def setup():
+        manager.clear_cache()
+        return (Material.factory("GaAs", T=300, Nd=1e23), "ni"), {}
+
+    benchmark.pedantic(getattr, setup=setup, rounds=50)
+
+
+def test_getattr_warm(benchmark, manager):
+    from solcore.material import Material
+
+    mat = Material.factory("GaAs", include=("ni",), T=300, Nd=1e23)
+    benchmark(getattr, mat, "ni")
+
+
+def test_get_multiple_parameters(benchmark, manager):
+    from pint import Quantity
+
+    T = Quantity(300, "K")
+    Nd = Quantity(1e23, "1/m**3")
+    out = benchmark(
+        manager.get_multiple_parameters,
+        "GaAs",
+        include=None,
+        exclude=("nk",),
+        T=T,
+        Nd=Nd,
+    )
+    assert len(out) > 0
+
+
+@mark.parametrize("snapshot", [False, True], ids=["plain", "snapshot"])
+def test_pickle_round_trip(benchmark, manager, snapshot):
+    import pickle
+    from pint import Quantity
+    from solcore.material import Material
+
+    mat = Material.factory("GaAs", include=INCLUDE + ("nk",), T=300, Nd=1e23)
+    # What pickle would store without the custom state of Material and Parameter
+    obj = (
+        mat
+        if snapshot
+        else (
+            mat.name,
+            dict(mat.comp),
+            mat.sources,
+            {k: Quantity(v) for k, v in mat._params.items()},
+            mat.nk,
+        )
+    )
+
+    def round_trip():
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        return len(data), pickle.loads(data)
+
+    size, _ = benchmark(round_trip)
+    benchmark.extra_info["size"] = size
+
+
+@mark.parametrize("record", [False, True], ids=["getattr", "to_records"])
+def test_mesh_properties(benchmark, manager, record):
+    import numpy as np
+    from solcore.material import Material
+    from solcore.parameter import _magnitude
+
+    include = INCLUDE[:3] + ("gamma1", "electron_affinity")
+    fields = include + ("T", "Nd")
+    units = {
+        "band_gap": "J",
+        "ni": "1/m**3",
+        "lattice_constant": "m",
+        "gamma1": "",
+        "electron_affinity": "J",
+        "T": "K",
+        "Nd": "1/m**3",
+    }
+    mats = [
+        Material.factory("GaAs", include=include, T=300 + i, Nd=1e23) for i in range(20)
+    ]
+    nodes = np.arange(1000) % len(mats)
+
+    def sweep():
+        if record:
+            table = Material.to_records(mats, fields, units, as_dict=True)
+            return {f: table[f][nodes] for f in fields}
+        return {
+            f: np.array([_magnitude(getattr(mats[n], f), units[f]) for n in nodes])
+            for f in fields
+        }
+
+    benchmark(sweep)
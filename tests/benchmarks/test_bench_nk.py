@@ -0,0 +1,61 @@
+"""Benchmarks of the retrieval of the refractive index data."""
+from pytest import fixture, mark
+
+
+@fixture
+def builtin(manager):
+    return manager.sources["BuiltinNK"]
+
+
+@mark.parametrize(
+    "material, comp", [("GaAs", {}), ("AlGaAs", {"Al": 0.3})], ids=["pure", "alloy"]
+)
+def test_builtin_get_nk(benchmark, builtin, material, comp):
+    def setup():
+        builtin._load.cache_clear()
+        builtin._load_alloy.cache_clear()
+        return (material,), {"comp": comp}
+
+    benchmark.pedantic(builtin.get_nk, setup=setup, rounds=20)
+
+
+def test_critical_point_interpolate(benchmark, builtin):
+    from solcore.parameter_sources.tools.critical_point_interpolate import (
+        critical_point_interpolate,
+        load_data_from_directory,
+    )
+
+    data, critical_points = load_data_from_directory(
+        str(builtin._paths["AlGaAs"] / "n")
+    )
+    wl = list(data.values())[0][0]
+    benchmark(critical_point_interpolate, data, critical_points, 0.3, wl)
+
+
+def test_sopra_get_nk(benchmark, manager):
+    benchmark(manager.sources["SopraNK"].get_nk, "GaAs")
+
+
+def test_refractiveindex_info_get_nk(benchmark, nk_db):
+    from solcore.parameter_sources import RefractiveindexInfoNKSource
+
+    source = RefractiveindexInfoNKSource.select_db(nk_db)
+    try:
+        out = benchmark(source.get_nk, "GaAs", pageid=0)
+        assert out.shape == (701,)
+    finally:
+        RefractiveindexInfoNKSource._set_db(None)
+
+
+@mark.parametrize("cached", [False, True], ids=["interp", "nk_on"])
+def test_nk_on_grid(benchmark, manager, cached):
+    import numpy as np
+    from pint import Quantity
+    from solcore.material import Material
+
+    mat = Material.factory("GaAs")
+    grid = Quantity(np.linspace(300, 900, 601), "nm")
+    if cached:
+        benchmark(mat.nk_on, grid, as_array=True)
+    else:
+        benchmark(mat.nk.pint.interp, wavelength=grid)
@@ -0,0 +1,238 @@
+"""Benchmarks of the ParameterManager."""
+from functools import lru_cache
+from time import perf_counter
+
+import numpy as np
+from pytest import mark, skip
+
+
+def scan_sources(pm, material, parameter, nsource):
+    """Find the source checking the parameters of each source in turn."""
+    for s in nsource:
+        if parameter in pm.sources[s].parameters(material):
+            return s
+
+
+@mark.parametrize("material, parameter", [("GaAs", "gamma1"), ("GaAs", "nk")])
+def test_find_source_scan(benchmark, manager, material, parameter):
+    nsource = manager._normalise_source(())
+    assert benchmark(scan_sources, manager, material, parameter, nsource) is not None
+
+
+@mark.parametrize("material, parameter", [("GaAs", "gamma1"), ("GaAs", "nk")])
+def test_find_source_index(benchmark, manager, material, parameter):
+    nsource = manager._normalise_source(())
+    expected = scan_sources(manager, material, parameter, nsource)
+    assert benchmark(manager._find_source, material, parameter, nsource) == expected
+
+
+@mark.parametrize("parameter", ["band_gap", "ni"])
+def test_calculable(benchmark, manager, parameter):
+    from pint import Quantity
+
+    T = Quantity(300, "K")
+    benchmark(manager.get_parameter, "GaAs", parameter, T=T, use_cache=False)
+
+
+@mark.parametrize("recorded", [False, True], ids=["signature", "recorded"])
+def test_calculable_arguments(benchmark, manager, recorded):
+    """Arguments of a calculable, inspected on each call or recorded when registered."""
+    from solcore.parameter_sources.calculable_parameters import _arguments
+
+    cp = manager.sources["Calculable"]
+    if recorded:
+        benchmark(lambda: cp._arguments["band_gap"])
+    else:
+        benchmark(_arguments, cp.band_gap)
+
+
+@mark.parametrize("parameter", ["band_gap", "ni"])
+def test_calculable_array(benchmark, manager, parameter):
+    from pint import Quantity
+    import numpy as np
+
+    T = Quantity(np.linspace(250, 350, 11), "K")
+    benchmark(manager.get_parameter, "GaAs", parameter, T=T)
+
+
+@lru_cache(maxsize=1)
+def map_requests():
+    """Requests for 'map', taking about a second serially so the workers start-up is
+    amortised."""
+    from pint import Quantity
+
+    return [
+        {"material": m, "parameter": p, "T": Quantity(t, "K"), "use_cache": False}
+        for m in ("GaAs", "InP", "AlAs", "GaP")
+        for p in ("band_gap", "ni")
+        for t in range(200, 400)
+    ]
+
+
+@lru_cache(maxsize=1)
+def serial_map_time(manager) -> float:
+    """Best time to evaluate the requests serially, in seconds."""
+    times = []
+    for _ in range(3):
+        start = perf_counter()
+        manager.map(map_requests(), processes=1)
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+@mark.parametrize("processes", [1, 2, 4, 8])
+def test_map(benchmark, manager, processes):
+    """Speedup of 'map' against the serial path (processes=1) as cores increase."""
+    import os
+
+    if processes > (os.cpu_count() or 1) * 2:
+        skip(f"Not enough CPUs to run {processes} processes.")
+
+    requests = map_requests()
+    benchmark.group = "map"
+    # The warm-up round starts the workers, which are kept between calls
+    out = benchmark.pedantic(
+        manager.map, (requests, processes), rounds=3, warmup_rounds=1
+    )
+    assert not any(isinstance(r, Exception) for r in out)
+    if benchmark.stats is not None:
+        speedup = serial_map_time(manager) / benchmark.stats.stats.min
+        benchmark.extra_info["speedup"] = speedup
+
+
+@mark.parametrize("value, units", [(1.5, "eV"), ("1.5 eV", None)])
+def test_parameter_construction(benchmark, value, units):
+    """Time to create a Parameter and memory taken by each instance."""
+    import tracemalloc
+    from solcore.parameter import Parameter
+
+    description = "Band gap energy"
+    number = 10000
+    tracemalloc.start()
+    params = [Parameter(value, units, description, "A paper") for _ in range(number)]
+    size = tracemalloc.get_traced_memory()[0] / number
+    tracemalloc.stop()
+    del params
+
+    benchmark(Parameter, value, units, description, "A paper")
+    benchmark.extra_info["bytes_per_instance"] = size
+
+
+OPERATIONS = {
+    "add": lambda a, b: a + b,
+    "mul": lambda a, b: a * 2,
+    "sqrt": lambda a, b: np.sqrt(a),
+    "sum": lambda a, b: np.sum(a),
+    "to": lambda a, b: a.to("meV"),
+    "getitem": lambda a, b: a[0],
+}
+"""Operations timed on Parameters and on plain Quantities, to measure the overhead of
+propagating the metadata."""
+
+
+@mark.parametrize("operation", OPERATIONS)
+@mark.parametrize("kind", ["quantity", "parameter"])
+def test_parameter_operations(benchmark, operation, kind):
+    from solcore.parameter import Parameter
+    from pint import Quantity
+
+    magnitudes = np.array([1.5, 1.4, 1.3]), np.array([0.5, 0.6, 0.7])
+    if kind == "parameter":
+        a, b = (Parameter(m, "eV", "Band gap", r) for m, r in zip(magnitudes, "AB"))
+    else:
+        a, b = (Quantity(m, "eV") for m in magnitudes)
+
+    benchmark.group = f"operation {operation}"
+    out = benchmark(OPERATIONS[operation], a, b)
+    assert isinstance(out, Parameter) == (kind == "parameter")
+
+
+@mark.parametrize("array", [False, True], ids=["scalar", "array"])
+def test_simple_expression(benchmark, manager, array):
+    from pint import Quantity
+    import numpy as np
+
+    T = Quantity(np.linspace(250, 350, 11) if array else 300, "K")
+    benchmark(manager.get_parameter, "GaAs", "lattice_constant", T=T, use_cache=False)
+
+
+@mark.parametrize("table", [False, True], ids=["loop", "table"])
+def test_all_materials(benchmark, manager, table):
+    """Lattice constant of all the materials of a source, eg. for lattice matching."""
+    source = manager.sources["vurgaftmanJAP2001"]
+    materials, _ = source.get_parameter_table("lattice_constant", T=300)
+
+    def scan():
+        if table:
+            return source.get_parameter_table("lattice_constant", T=300)[1]
+        return [source.get_parameter(m, "lattice_constant", T=300) for m in materials]
+
+    benchmark(scan)
+
+
+@mark.parametrize("array", [False, True], ids=["loop", "array"])
+def test_composition_grading(benchmark, manager, array):
+    """Band gap of a graded AlGaAs layer, one composition at a time or all at once."""
+    from pint import Quantity
+    import numpy as np
+
+    T = Quantity(300, "K")
+    x = np.linspace(0, 1, 100)
+
+    def grading():
+        if array:
+            return manager.get_parameter("AlGaAs", "eg_gamma", T=T, comp={"Al": x})
+        return [
+            manager.get_parameter("AlGaAs", "eg_gamma", T=T, comp={"Al": xi})
+            for xi in x
+        ]
+
+    benchmark.pedantic(grading, setup=manager.clear_cache, rounds=20)
+
+
+@mark.parametrize("grid", [False, True], ids=["loop", "grid"])
+def test_quaternary_grid(benchmark, manager, grid):
+    """Band gap of GaInAsP over a 10x10 grid of compositions."""
+    from pint import Quantity
+    import numpy as np
+
+    T = Quantity(300, "K")
+    x = np.linspace(0, 1, 10)
+
+    def evaluate():
+        if grid:
+            comp = {"Ga": x, "As": x}
+            return manager.get_parameter_grid("GaInAsP", "band_gap", T=T, comp=comp)
+        return [
+            manager.get_parameter("GaInAsP", "band_gap", T=T, comp={"Ga": a, "As": b})
+            for a in x
+            for b in x
+        ]
+
+    benchmark.pedantic(evaluate, setup=manager.clear_cache, rounds=10)
+
+
+def test_refresh_simple_sources(benchmark, manager):
+    """Polling the standard locations when no file has changed."""
+    from solcore.parameter_sources.simple_parameters import refresh_simple_sources
+
+    refresh_simple_sources()
+    assert benchmark(refresh_simple_sources) == ()
+
+
+@mark.parametrize("cached", [False, True], ids=["parse", "cached"])
+def test_load_source(benchmark, manager, cached):
+    """Loading a simple source, parsing its file or reading it from the cache."""
+    from solcore.parameter_sources import source_cache
+
+    source = manager._known_sources["vurgaftmanJAP2001"]
+
+    def setup():
+        source._instance = None
+        if not cached:
+            source_cache.clear()
+
+    source.load_source()
+    benchmark.pedantic(source.load_source, setup=setup, rounds=20)
+    source._instance = None
+    manager.reload_source("vurgaftmanJAP2001")
@@ -16,7 +16,7 @@ def app_local_path():
     if sys.platform == "win32":
         path = Path("AppData") / "Local" / "solcore"
     elif sys.platform == "darwin":
-        path = Path("Library") / "ApplicationSupport" / "solcore"
+        path = Path("Library") / "Application Support" / "solcore"
     else:
         path = Path(".solcore")
     return path
@@ -32,10 +32,12 @@ def app_temp_path(app_local_path):
 @fixture
 def parameter_manager():
     from solcore.parameter import ParameterManager
+    import solcore.parameter_sources  # noqa: F401
 
-    if ParameterManager._instance is not None:
-        ParameterManager._instance = None
-    return ParameterManager()
+    original = ParameterManager._instance
+    ParameterManager._instance = None
+    yield ParameterManager()
+    ParameterManager._instance = original
 
 
 @fixture
@@ -6,7 +6,7 @@ def gather_known_sources():
     from solcore.parameter import ParameterManager
 
     pm = ParameterManager()
-    pm.initialize()
+    pm.preload()
 
     return tuple(pm.sources.keys())
 
@@ -15,7 +15,7 @@ def gather_known_materials():
     from solcore.parameter import ParameterManager
 
     pm = ParameterManager()
-    pm.initialize()
+    pm.preload()
 
     materials = set()
     for source in gather_known_sources():
@@ -28,7 +28,7 @@ def gather_known_parameters():
     from solcore.parameter import ParameterManager, MaterialMissing
 
     pm = ParameterManager()
-    pm.initialize()
+    pm.preload()
 
     parameters = set()
     for m in gather_known_materials():
@@ -0,0 +1,78 @@
+import subprocess
+import sys
+
+BUDGET = 0.6
+"""Maximum time, in seconds, spent importing solcore.material and its dependencies.
+
+Most of it goes to xarray (and pandas, which xarray imports), needed by the nk arrays.
+"""
+
+PACKAGE_BUDGET = 0.01
+"""Maximum time, in seconds, spent importing the solcore package on its own."""
+
+DEFERRED = (
+    "pint_xarray",
+    "scipy.interpolate",
+    "yaml",
+    "sqlite3",
+    "configparser",
+    "solcore.parameter_sources.tools.dboperations",
+)
+"""Modules only imported when the sources or features that need them are used."""
+
+
+def import_times(statement):
+    """Import times, in seconds, of the modules imported when running the statement.
+
+    Args:
+        statement: Python code to run in a fresh interpreter.
+
+    Returns:
+        A dictionary with the self and cumulative import times of each module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, cumulative, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = (int(self_time) / 1e6, int(cumulative) / 1e6)
+    return times
+
+
+def test_import_time():
+    times = import_times("import solcore.material")
+
+    assert not set(DEFERRED) & set(times)
+    assert times["solcore.material"][1] < BUDGET
+
+
+def test_package_import_time():
+    times = import_times("import solcore")
+
+    assert "pint" not in times
+    assert times["solcore"][1] < PACKAGE_BUDGET
+
+
+def test_sources_defer_imports():
+    times = import_times("import solcore.parameter_sources")
+
+    assert not set(DEFERRED) & set(times)
+
+
+def test_units_configured():
+    statement = """
+import pint
+import solcore.material
+assert type(pint.get_application_registry().get()) is pint.registry.LazyRegistry
+before = type(pint.Quantity(1, "eV").magnitude)
+import pint_xarray
+after = type(pint.Quantity(1, "eV").magnitude)
+assert before is after, (before, after)
+"""
+    subprocess.run([sys.executable, "-c", statement], check=True)
@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+
+from pytest import approx
+
+MATERIALS = ("GaAs", "InP", "AlAs", "GaP", "InAs")
+TEMPERATURES = (250, 300, 350)
+INCLUDE = ("band_gap", "ni", "lattice_constant", "electron_mobility")
+
+
+def create(name, T):
+    from solcore.material import Material
+    from pint import Quantity
+
+    mat = Material.factory(
+        name=name, include=INCLUDE, T=Quantity(T, "K"), Nd=Quantity(1e23, "1/m**3")
+    )
+    return {p: getattr(mat, p).to_base_units().m for p in INCLUDE}
+
+
+def test_factory_from_threads():
+    from solcore.parameter import ParameterManager
+
+    pm = ParameterManager()
+    pm.initialize()
+
+    jobs = list(product(MATERIALS, TEMPERATURES)) * 20
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda job: create(*job), jobs))
+
+    assert pm.cache_info().currsize > 0
+    pm.clear_cache()
+    expected = {job: create(*job) for job in set(jobs)}
+    for job, result in zip(jobs, results):
+        assert result == approx(expected[job])
+    assert len(pm._resolving) == 0
@@ -25,6 +25,36 @@ class TestMaterial:
         assert "T" in mat._params
         xr.testing.assert_equal(nk, mat._nk)
 
+    def test_factory_many(self):
+        from solcore.material import Material
+        from pytest import raises
+        import numpy as np
+
+        x = [0.1, 0.2, 0.3]
+        mats = Material.factory_many(
+            name="AlGaAs", comp={"Al": x}, include=("band_gap",), T=300, Nd=1e23
+        )
+        assert len(mats) == len(x)
+        for mat, xi in zip(mats, x):
+            expected = Material.factory(
+                name="AlGaAs", comp={"Al": xi}, include=("band_gap",), T=300
+            )
+            assert mat.comp == {"Al": xi}
+            assert mat.T == expected.T
+            assert mat.band_gap.d == expected.band_gap.d
+            assert mat.band_gap.r == expected.band_gap.r
+            np.testing.assert_allclose(mat.band_gap.m, expected.band_gap.m)
+
+        mats = Material.factory_many(name="GaAs", include=("band_gap",), T=[300, 350])
+        assert [m.T.m for m in mats] == [300, 350]
+        assert mats[0].band_gap > mats[1].band_gap
+
+        with raises(ValueError):
+            Material.factory_many(name="AlGaAs", comp={"Al": [x, x]})
+
+        with raises(ValueError):
+            Material.factory_many(name="AlGaAs", comp={"Al": x}, T=[300, 350])
+
     def test_params(self):
         from solcore.material import Material
         from pint import Quantity as Q_
@@ -41,6 +71,29 @@ class TestMaterial:
         assert "band_gap" not in mat._params
         mat.band_gap
         assert "band_gap" in mat._params
+        assert mat._context["comp"] == mat.comp
+        assert mat._context["T"] == Q_(300, "K")
+
+        # The context holds the inputs only, whatever has been retrieved
+        assert "band_gap" not in mat._context
+
+    def test_get_attribute_cache(self):
+        from solcore.material import Material
+        from solcore.parameter import ParameterManager
+        from pint import Quantity as Q_
+
+        pm = ParameterManager()
+        pm.clear_cache()
+        mat = Material.factory(name="GaAs", T=Q_(300, "K"))
+        for p in ("lattice_constant", "eg_gamma", "eg_x", "eg_l", "gamma1"):
+            getattr(mat, p)
+        mat.band_gap
+
+        # Later enquiries hit the cache whatever the material retrieved before
+        hits = pm.cache_info().hits
+        other = Material.factory(name="GaAs", T=Q_(300, "K"))
+        assert other.band_gap == mat.band_gap
+        assert pm.cache_info().hits == hits + 1
 
     def test_nk(self):
         from solcore.material import Material
@@ -50,6 +103,171 @@ class TestMaterial:
         mat.nk
         assert mat._nk.shape != ()
 
+    def test_nk_on(self, monkeypatch):
+        from solcore.material import Material
+        from pint import Quantity as Q_
+        import numpy as np
+        import xarray as xr
+
+        nk = xr.DataArray(
+            [1 + 1j, 2 + 2j, 3 + 3j],
+            dims=["wavelength"],
+            coords={"wavelength": [0, 1, 2]},
+        )
+        mat = Material(name="Dark matter", nk=nk)
+
+        out = mat.nk_on([0.5, 1.5])
+        xr.testing.assert_equal(out, nk.interp(wavelength=[0.5, 1.5]))
+        assert mat.nk_on(np.array([0.5, 1.5])) is out
+
+        array = mat.nk_on([0.5, 1.5], as_array=True)
+        assert array.dtype == np.complex128
+        assert array.flags.c_contiguous
+        assert not array.flags.writeable
+        np.testing.assert_equal(array, out.values)
+
+        # Units are part of the key
+        mat.nk_on(Q_([0.5, 1.5], "m"))
+        assert len(mat._nk_cache) == 2
+
+        # The least recently used grids are discarded
+        monkeypatch.setattr(Material, "nk_cache_maxbytes", 1)
+        mat.nk_on([0.5])
+        assert list(mat._nk_cache) == [(None, (1,), np.array([0.5]).tobytes())]
+
+    def test_nk_on_units(self):
+        from solcore.material import Material
+        from pint import Quantity as Q_
+        import xarray as xr
+
+        mat = Material.factory(name="GaAs")
+        grid = Q_([500, 600], "nm")
+        out = mat.nk_on(grid)
+        expected = mat.nk.pint.interp(wavelength=grid)
+        xr.testing.assert_allclose(out.pint.dequantify(), expected.pint.dequantify())
+        xr.testing.assert_allclose(
+            mat.nk_on(grid.m_as("m")).pint.dequantify().drop_vars("wavelength"),
+            out.pint.dequantify().drop_vars("wavelength"),
+        )
+
+    def test_evolve(self):
+        from solcore.material import Material
+        from pint import Quantity as Q_
+
+        include = ("gamma1", "band_gap", "lattice_constant", "nk")
+        mat = Material.factory(name="GaAs", include=include, T=Q_(300, "K"))
+        mat.electron_affinity
+        out = mat.evolve(T=Q_(350, "K"))
+
+        assert out.T == Q_(350, "K")
+        assert out.gamma1 is mat.gamma1
+        assert out._nk is mat._nk
+        for p in ("band_gap", "lattice_constant", "electron_affinity"):
+            assert p not in out.params
+            expected = getattr(Material.factory(name="GaAs", T=Q_(350, "K")), p)
+            assert getattr(out, p) == expected
+
+        # Parameters given as inputs are kept, but not those depending on them
+        out = mat.evolve(band_gap=Q_(1.5, "eV"))
+        assert out.band_gap == Q_(1.5, "eV")
+        assert "band_gap" not in out._resolved
+        assert "electron_affinity" not in out.params
+        assert out.evolve(T=Q_(350, "K")).band_gap == Q_(1.5, "eV")
+
+        out = Material.factory(
+            name="AlGaAs", comp={"Al": 0.1}, include=include[1:2], T=Q_(300, "K")
+        )
+        assert "band_gap" not in out.evolve(comp={"Al": 0.2}).params
+        assert "band_gap" in out.evolve(comp={"Al": 0.1}).params
+
+    def test_pickle(self):
+        from solcore.material import Material, _restore_material
+        from solcore.parameter import Parameter
+        from pint import Quantity as Q_
+        from pytest import raises
+        import pickle
+        import xarray as xr
+
+        mat = Material.factory(
+            name="GaAs",
+            include=("band_gap", "nk"),
+            T=Q_(300, "K"),
+            Nd=Q_([1, 2], "1/m**3"),
+        )
+        out = pickle.loads(pickle.dumps(mat))
+        assert (out.name, out.comp, out.sources) == (mat.name, mat.comp, mat.sources)
+        assert out.params == mat.params
+        assert isinstance(out.band_gap, Parameter)
+        assert out.band_gap == mat.band_gap
+        assert out.band_gap.d == mat.band_gap.d
+        assert out.band_gap.r == mat.band_gap.r
+        assert out.T == mat.T
+        assert list(out.Nd.m) == [1, 2]
+
+        # The nk data is rebuilt when used
+        assert isinstance(out._nk, tuple)
+        xr.testing.assert_identical(out.nk, mat.nk)
+
+        out = Material.from_snapshot(mat.snapshot())
+        xr.testing.assert_identical(out.nk, mat.nk)
+
+        with raises(TypeError):
+            Material.from_snapshot(pickle.dumps(42))
+
+        state = list(mat.__getstate__())
+        state[0] = -1
+        with raises(ValueError):
+            _restore_material(tuple(state))
+
+    def test_pickle_plain_nk(self):
+        from solcore.material import Material
+        import pickle
+        import xarray as xr
+
+        mat = Material(name="Dark matter")
+        assert pickle.loads(pickle.dumps(mat))._nk.shape == ()
+
+        nk = xr.DataArray(
+            [1 + 1j, 2 + 2j], dims=["wavelength"], coords={"wavelength": [0, 1]}
+        )
+        mat = Material(name="Dark matter", nk=nk)
+        xr.testing.assert_identical(pickle.loads(pickle.dumps(mat)).nk, nk)
+
+    def test_to_record(self):
+        from solcore.material import Material
+        from pint import Quantity as Q_
+        from pytest import raises, approx
+        import numpy as np
+
+        mat = Material.factory(name="GaAs", T=Q_(300, "K"), Nd=Q_(1e23, "1/m**3"))
+        fields = ("band_gap", "T", "Nd")
+        out = mat.to_record(fields, units={"band_gap": "J", "Nd": "1/cm**3"})
+        assert out.dtype.names == fields
+        assert out["band_gap"] == approx(mat.band_gap.m_as("J"))
+        assert out["T"] == 300
+        assert out["Nd"] == approx(1e17)
+        assert out.dtype.metadata["units"]["T"] == "kelvin"
+
+        out = mat.to_record(fields, as_dict=True)
+        assert out == {"band_gap": float(mat.band_gap.m), "T": 300.0, "Nd": 1e23}
+
+        with raises(ValueError):
+            mat.to_record(("lowest_band",))
+
+        mats = Material.factory_many(name="AlGaAs", comp={"Al": [0.1, 0.2]}, T=300)
+        out = Material.to_records(mats, ("band_gap", "T"), units={"band_gap": "meV"})
+        assert out.shape == (2,)
+        assert out["band_gap"] == approx([m.band_gap.m_as("meV") for m in mats])
+
+        out = Material.to_records(mats, ("band_gap",), as_dict=True)
+        assert out["band_gap"].dtype == np.float64
+        assert out["band_gap"] == approx([m.band_gap.m for m in mats])
+
+        with raises(ValueError):
+            Material.to_records(
+                [Material.factory(name="GaAs", T=Q_([300, 350], "K"))], ("T",)
+            )
+
     def test_material_str(self):
         from solcore.material import Material
 
@@ -32,16 +32,190 @@ class TestParameter:
         assert var.reference == ()
         assert var.r == ()
 
+    def test_units(self):
+        from solcore.parameter import Parameter
+        from pint import Quantity
+
+        expected = Quantity(1.5, "eV")
+        assert Parameter(1.5, "eV") == expected
+        assert Parameter(1.5, expected.units) == expected
+        assert Parameter("1.5 eV") == expected
+        assert Parameter(expected) == expected
+        assert Parameter(2) == Quantity(2)
+
+    def test_shared_metadata(self):
+        from solcore.parameter import Parameter
+
+        var = Parameter(42, "k", description="Great parameter", reference="A paper")
+        other = Parameter(1, "eV", description="Great parameter", reference="A paper")
+        assert other.d is var.d
+        assert other.r is var.r
+
+    def test_array_operations(self):
+        from solcore.parameter import Parameter
+        from pint import Quantity
+        import numpy as np
+
+        var = Parameter(np.array([1.0, 2.0, 3.0]), "eV", "Band gap", "A paper")
+        other = Parameter(0.5, "", "Composition", ("Another paper", "A paper"))
+
+        # The description is kept when the result is the same kind of magnitude
+        for out in (
+            var[1:],
+            var[0],
+            var.to("J"),
+            var.sum(),
+            np.mean(var),
+            np.maximum(var, var),
+            np.concatenate([var, var]),
+            var + Quantity(1, "eV"),
+            var + Parameter(1, "eV", "Band gap", "A paper"),
+            list(var)[0],
+        ):
+            assert isinstance(out, Parameter)
+            assert out.d == "Band gap"
+            assert out.r == ("A paper",)
+
+        # Otherwise, only the references are merged
+        for out in (var * other, np.sqrt(var), Quantity(2, "m") * var, var ** 2):
+            assert isinstance(out, Parameter)
+            assert out.d == ""
+        assert (var * other).r == ("A paper", "Another paper")
+        assert np.allclose((var * other).m, [0.5, 1.0, 1.5])
+
+        # The operands are not modified
+        assert (var.d, var.r) == ("Band gap", ("A paper",))
+        assert (other.d, other.r) == ("Composition", ("Another paper", "A paper"))
+
+        assert not isinstance(var > Quantity(1, "eV"), Quantity)
+        assert var.m_as("meV") == approx([1000, 2000, 3000])
+
+    def test_pickle(self):
+        from solcore.parameter import Parameter
+        import pickle
+
+        var = Parameter(42, "eV", description="Great parameter", reference="A paper")
+        out = pickle.loads(pickle.dumps(var))
+        assert isinstance(out, Parameter)
+        assert out == var
+        assert out.d == var.d
+        assert out.r == var.r
+
+        # The metadata of restored parameters is shared
+        other = pickle.loads(pickle.dumps(var))
+        assert other.d is out.d
+        assert other.r is out.r
+
+
+class TestContext:
+    def test_mapping(self):
+        from solcore.parameter import Context
+        from pint import Quantity
+
+        T = Quantity(300, "K")
+        context = Context({"T": T}, comp={"Al": 0.3})
+        assert dict(context) == {"T": T, "comp": {"Al": 0.3}}
+        assert context.names == {"T", "comp"}
+        assert context.magnitudes == {"T": T.magnitude, "comp": {"Al": 0.3}}
+        assert not context.has_arrays
+
+        new = context.replace(Nd=1e23)
+        assert "Nd" not in context
+        assert new["Nd"] == 1e23
+        assert new["T"] is T
+
+    def test_of(self):
+        from solcore.parameter import Context
+
+        context = Context(T=300)
+        assert Context.of(context, {}) is context
+        assert Context.of(context, {"T": 400})["T"] == 400
+        assert Context.of(None, {"T": 400}) == Context(T=400)
+
+    def test_key(self):
+        from solcore.parameter import Context
+        from pint import Quantity
+
+        context = Context(T=Quantity(300, "K"))
+        assert context.key == Context(T=Quantity(300.0, "K")).key
+        assert context.key != Context(T=Quantity(300, "degC")).key
+
+        context = Context(T=Quantity([300, 400], "K"))
+        assert context.key is None
+        assert context.has_arrays
+
+    def test_key_of(self):
+        from solcore.parameter import Context
+        from pint import Quantity
+        import numpy as np
+
+        T = Quantity(300, "K")
+        context = Context(T=T, Nd=Quantity(np.array([1e22, 1e23]), "1/m**3"))
+        assert context.key is None
+        assert context.key_of(frozenset({"T"})) == Context(T=T).key
+        assert context.key_of(frozenset({"T", "Na"})) == Context(T=T).key
+        assert context.key_of(frozenset({"T", "Nd"})) is None
+        assert context.key_of(frozenset()) == Context().key
+
 
 class TestParameterManager:
     def test_initialize(self, parameter_manager):
+        source = MagicMock(materials=("dark matter",), any_material=False)
+        source.parameters = MagicMock(return_value=("the answer",))
+
         class DummySource:
-            load_source = MagicMock(return_value="A source")
+            _priority = 0
+            load_source = MagicMock(return_value=source)
 
         parameter_manager._known_sources["my source"] = DummySource
         assert len(parameter_manager.sources) == 0
         parameter_manager.initialize()
-        assert parameter_manager.sources["my source"] == "A source"
+        assert len(parameter_manager.sources) == 0
+        DummySource.load_source.assert_not_called()
+
+        parameter_manager.preload()
+        DummySource.load_source.assert_called_once_with("my source")
+        assert parameter_manager.sources["my source"] is source
+        assert parameter_manager._index == {
+            ("dark matter", "the answer"): frozenset(("my source",))
+        }
+        assert tuple(parameter_manager.load_times) == ("my source",)
+
+    def test_lazy_loading(self, parameter_manager):
+        ps = parameter_manager
+
+        def make_source(name, priority, provides=None):
+            source = MagicMock(materials=("dark matter",), any_material=False)
+            source.priority = priority
+            source.parameters = MagicMock(return_value=(name,))
+            source.get_parameter = MagicMock(return_value=priority)
+            return type(
+                name,
+                (),
+                {
+                    "_priority": priority,
+                    "_provides": provides,
+                    "load_source": MagicMock(return_value=source),
+                },
+            )
+
+        ps._known_sources = {
+            "high": make_source("high", 10, provides=("high",)),
+            "middle": make_source("middle", 5),
+            "low": make_source("low", 0),
+        }
+        ps.initialize()
+
+        # 'high' says it cannot provide it and 'low' is never reached
+        assert ps.get_parameter("dark matter", "middle") == 5
+        ps._known_sources["high"].load_source.assert_not_called()
+        ps._known_sources["middle"].load_source.assert_called_once()
+        ps._known_sources["low"].load_source.assert_not_called()
+        assert tuple(ps.sources) == ("middle",)
+
+        assert ps.get_parameter("dark matter", "low") == 0
+        ps._known_sources["middle"].load_source.assert_called_once()
+        assert tuple(ps.load_times) == ("middle", "low")
 
     def test_add_source(self, parameter_manager):
         class Dummy:
@@ -76,6 +250,8 @@ class TestParameterManager:
 
         class DummySource:
             source_1 = MagicMock()
+            materials = ("dark matter",)
+            any_material = False
 
             def __init__(self, name):
                 self.name = name
@@ -97,9 +273,307 @@ class TestParameterManager:
         DummySource.source_1.assert_called_once()
         assert value == 42
 
+        # The index is used, so sources are not queried again
+        ps.get_parameter("dark matter", "the answer", use_cache=False)
+        DummySource.source_1.assert_called_once()
+
         with raises(ParameterMissing):
             ps.get_parameter("dark matter", "stupid question")
 
+    def test_get_parameter_cache(self, parameter_manager):
+        from solcore.parameter import Context
+        from pint import Quantity
+
+        ps = parameter_manager
+        ps._normalise_source = MagicMock(return_value=("source 1",))
+        ps._cache_maxsize = 2
+
+        source = MagicMock()
+        source.materials = ("dark matter",)
+        source.any_material = False
+        source.parameters = MagicMock(return_value=("the answer",))
+        source.get_parameter = MagicMock(return_value=42)
+        ps.sources["source 1"] = source
+
+        T = Quantity(300, "K")
+        assert ps.get_parameter("dark matter", "the answer", T=T) == 42
+        assert ps.get_parameter("dark matter", "the answer", T=T) == 42
+        source.get_parameter.assert_called_once()
+        assert ps.cache_info().hits == 1
+        assert ps.cache_info().misses == 1
+
+        ps.get_parameter("dark matter", "the answer", T=T, use_cache=False)
+        assert source.get_parameter.call_count == 2
+        assert ps.cache_info().hits == 1
+
+        # Contexts are equivalent to keyword arguments
+        assert ps.get_parameter("dark matter", "the answer", context=Context(T=T)) == 42
+        assert ps.cache_info().hits == 2
+
+        # Unhashable inputs skip the cache
+        ps.get_parameter("dark matter", "the answer", T=Quantity([300, 400], "K"))
+        assert ps.cache_info().currsize == 1
+
+        ps.get_parameter("dark matter", "the answer", T=Quantity(400, "K"))
+        ps.get_parameter("dark matter", "the answer", T=Quantity(500, "K"))
+        assert ps.cache_info().evictions == 1
+        assert ps.cache_info().currsize == 2
+
+    def test_get_parameter_cache_copies(self):
+        from solcore.parameter import ParameterManager
+        from pint import Quantity
+        import numpy as np
+
+        pm = ParameterManager()
+        pm.clear_cache()
+        T = Quantity(300, "K")
+        first = pm.get_parameter("GaAs", "band_gap", T=T)
+        expected = float(first.m_as("eV"))
+        metadata = first.d, first.r
+
+        # Changing the values in place does not affect the cache
+        first *= 2
+        first.ito("meV")
+        second = pm.get_parameter("GaAs", "band_gap", T=T)
+        assert pm.cache_info().hits == 1
+        assert second.m_as("eV") == approx(expected)
+        assert (second.d, second.r) == metadata
+        second.ito("meV")
+        if isinstance(second.magnitude, np.ndarray):
+            second.magnitude[...] = 0
+        assert pm.get_parameter("GaAs", "band_gap", T=T).m_as("eV") == approx(expected)
+
+    def test_get_parameter_cache_dependencies(self):
+        from solcore.parameter import ParameterManager
+        from pint import Quantity
+        import numpy as np
+
+        pm = ParameterManager()
+        pm.clear_cache()
+        T = Quantity(300, "K")
+        first = pm.get_parameter("GaAs", "lattice_constant", T=T)
+
+        # Inputs the parameter does not depend on are not part of the key
+        Nd = Quantity(np.array([1e22, 1e23]), "1/m**3")
+        second = pm.get_parameter(
+            "GaAs", "lattice_constant", T=T, Nd=Nd, band_gap=Quantity(1, "eV")
+        )
+        assert second == first
+        assert pm.cache_info().hits == 1
+        assert pm.cache_info().currsize == 1
+
+        pm.get_parameter("GaAs", "lattice_constant", T=Quantity(400, "K"))
+        assert pm.cache_info().currsize == 2
+
+    def test_get_parameter_no_cache_nested(self):
+        from solcore.parameter import ParameterManager
+        from pint import Quantity
+
+        pm = ParameterManager()
+        pm.clear_cache()
+        T = Quantity(300, "K")
+
+        # The arguments of the calculable are not cached either
+        pm.get_parameter("GaAs", "band_gap", T=T, use_cache=False)
+        assert pm.cache_info().currsize == 0
+        assert pm.cache_info().misses == 0
+
+        pm.get_parameter("GaAs", "band_gap", T=T)
+        assert pm.cache_info().currsize > 1
+
+    def test_clear_cache(self, parameter_manager):
+        ps = parameter_manager
+        ps._normalise_source = MagicMock(side_effect=lambda s: (s,))
+
+        class DummySource:
+            materials = ("dark matter",)
+            any_material = False
+            clear_cache = MagicMock()
+
+            def parameters(self, material):
+                return ("param 1", "param 2")
+
+            def get_parameter(self, material, parameter, **kwargs):
+                if parameter == "param 2":
+                    return ps.get_parameter(material, "param 1", "source 2")
+                return 42
+
+        ps.sources["source 1"] = DummySource()
+        ps.sources["source 2"] = DummySource()
+
+        ps.get_parameter("dark matter", "param 1", "source 1")
+        ps.get_parameter("dark matter", "param 2", "source 1")
+        assert ps.cache_info().currsize == 3
+
+        # Indirect dependencies are also invalidated
+        ps.clear_cache("source 2")
+        assert ps.cache_info().currsize == 1
+        assert DummySource.clear_cache.call_count == 2
+
+        ps.clear_cache()
+        assert ps.cache_info() == (0, 0, 0, ps._cache_maxsize, 0)
+
+    @mark.parametrize("parameter", ["band_gap", "ni", "electron_mobility"])
+    def test_get_parameter_grid(self, parameter):
+        from solcore.parameter import ParameterManager
+        from pint import Quantity
+        import numpy as np
+
+        pm = ParameterManager()
+        T = Quantity(np.array([250, 300]), "K")
+        Nd = Quantity(np.array([1e22, 1e23, 1e24]), "1/m**3")
+
+        out = pm.get_parameter_grid("GaAs", parameter, T=T, Nd=Nd)
+        assert out.dims == ("T", "Nd")
+        assert out.shape == (2, 3)
+        for i, t in enumerate(T):
+            for j, n in enumerate(Nd):
+                expected = pm.get_parameter("GaAs", parameter, T=t, Nd=n)
+                assert out.data[i, j].m == approx(expected.to(out.data.u).m)
+
+        with raises(ValueError):
+            pm.get_parameter_grid("GaAs", parameter, T=T.reshape(1, -1), Nd=Nd)
+
+    @mark.parametrize("parameter", ["band_gap", "lattice_constant"])
+    def test_get_parameter_grid_composition(self, parameter):
+        from solcore.parameter import ParameterManager
+        from pint import Quantity
+        import numpy as np
+
+        pm = ParameterManager()
+        T = Quantity(300, "K")
+        comp = {"Ga": np.array([0.2, 0.47, 1.0]), "As": np.array([0.0, 0.5])}
+
+        out = pm.get_parameter_grid("GaInAsP", parameter, T=T, comp=comp)
+        assert out.dims == ("Ga", "As")
+        assert out.shape == (3, 2)
+        assert list(out.Ga.values) == list(comp["Ga"])
+        for i, x in enumerate(comp["Ga"]):
+            for j, y in enumerate(comp["As"]):
+                c = {"Ga": x, "As": y}
+                expected = pm.get_parameter("GaInAsP", parameter, T=T, comp=c)
+                assert out.data[i, j].m == approx(expected.to(out.data.u).m)
+
+    @mark.parametrize("processes", [1, 2])
+    def test_map(self, processes):
+        from solcore.parameter import Parameter, ParameterManager, ParameterMissing
+        from pint import Quantity
+
+        pm = ParameterManager()
+        requests = [
+            {"material": "GaAs", "parameter": "band_gap", "T": Quantity(t, "K")}
+            for t in (250, 300, 350)
+        ]
+        requests.insert(1, {"material": "Dark matter", "parameter": "gamma1"})
+
+        out = pm.map(requests, processes=processes)
+        assert len(out) == len(requests)
+        assert isinstance(out[1], ParameterMissing)
+        del requests[1], out[1]
+        for request, result in zip(requests, out):
+            assert isinstance(result, Parameter)
+            assert result == pm.get_parameter(**request)
+            assert result.r == pm.get_parameter(**request).r
+
+    def test_map_pool(self):
+        from solcore.parameter import ParameterManager
+        from pint import Quantity
+
+        pm = ParameterManager()
+        requests = [
+            {"material": "GaAs", "parameter": "band_gap", "T": Quantity(t, "K")}
+            for t in (250, 300, 350)
+        ]
+
+        # A few requests are evaluated in this process by default
+        pm.shutdown()
+        pm.map(requests)
+        assert pm._executor is None
+
+        # The workers are kept between calls while the sources do not change
+        pm.map(requests, processes=2)
+        executor = pm._executor
+        assert executor is not None
+        pm.map(requests, processes=2)
+        assert pm._executor is executor
+
+        # But not if the cache is cleared, as the workers keep their own
+        pm.clear_cache()
+        assert pm._executor is None
+        pm.map(requests, processes=2)
+        assert pm._executor is not executor
+        pm.shutdown()
+        assert pm._executor is None
+
+    def test_find_source(self, parameter_manager):
+        from solcore.parameter import ParameterMissing
+
+        ps = parameter_manager
+
+        class DummySource:
+            def __init__(self, materials, parameters, any_material=False):
+                self.materials = materials
+                self._parameters = parameters
+                self.any_material = any_material
+                self.priority = 0
+
+            def parameters(self, material):
+                if self.any_material or material in self.materials:
+                    return self._parameters
+                return ()
+
+        ps._initialized = True
+        ps._known_sources = {s: None for s in ("source 1", "source 2", "calc")}
+        ps.sources["source 1"] = DummySource(("dark matter",), ("mass",))
+        ps.sources["source 2"] = DummySource(("dark matter", "light"), ("mass", "c"))
+        ps.sources["calc"] = DummySource((), ("energy",), any_material=True)
+
+        assert ps.find_source("dark matter", "mass", ("source 1", "source 2")) == (
+            "source 1"
+        )
+        assert ps.find_source("dark matter", "mass", ("source 2", "source 1")) == (
+            "source 2"
+        )
+        assert ps.find_source("light", "c", ("source 1", "source 2")) == "source 2"
+        assert ps.find_source("light", "energy", "calc") == "calc"
+        with raises(ParameterMissing):
+            ps.find_source("light", "mass", "source 1")
+
+        # Re-indexing a source that has changed updates its entries
+        ps.sources["source 1"]._parameters = ("c",)
+        ps._index_source("source 1")
+        assert ps.find_source("light", "mass", ("source 1", "source 2")) == "source 2"
+        assert ps.find_source("dark matter", "c", ("source 1", "source 2")) == (
+            "source 1"
+        )
+
+    def test_dependencies(self):
+        from solcore.parameter import ParameterManager
+
+        pm = ParameterManager()
+        assert pm.dependencies("GaAs", "gamma1") == frozenset()
+        assert pm.dependencies("GaAs", "lattice_constant") == {"T"}
+
+        deps = pm.dependencies("GaAs", "band_gap")
+        assert {"T", "eg_gamma", "eg0_gamma", "alpha_gamma"} <= deps
+
+        # Provided parameters have no further dependencies
+        deps = pm.dependencies("GaAs", "band_gap", provided=frozenset({"eg_gamma"}))
+        assert "eg_gamma" in deps
+        assert "eg0_gamma" not in deps
+
+        deps = pm.dependencies("AlGaAs", "band_gap")
+        assert {"T", "comp"} <= deps
+
+        # Only the provided names among the dependencies are relevant
+        provided = frozenset({"eg_gamma", "unrelated"})
+        before = len(pm._dependencies)
+        assert pm.dependencies("GaAs", "band_gap", provided=provided) == (
+            pm.dependencies("GaAs", "band_gap", provided=frozenset({"eg_gamma"}))
+        )
+        assert len(pm._dependencies) == before
+        assert pm.dependencies("GaAs", "gamma1", provided=provided) == frozenset()
+
     def test_get_multiple_parameters(self, parameter_manager):
         ps = parameter_manager
         sources = ("source 1", "source 2")
@@ -156,9 +630,10 @@ class TestParameterManager:
 
         with raises(KeyError):
             ps._load_source("source 1")
-            ps.initialize.assert_called_once()
-            ps._validate_source.assert_called_once()
+        ps.initialize.assert_called_once()
+        ps._validate_source.assert_called_once()
 
+        ps._initialized = True
         ps.initialize.reset_mock()
         ps._validate_source.reset_mock()
         ps.sources["source 1"] = 42
@@ -166,6 +641,15 @@ class TestParameterManager:
         ps.initialize.assert_not_called()
         ps._validate_source.assert_called_once()
 
+        source = MagicMock(materials=(), any_material=False)
+        ps._known_sources["source 2"] = MagicMock()
+        ps._known_sources["source 2"].load_source = MagicMock(return_value=source)
+        assert ps._load_source("source 2") is source
+        assert ps._load_source("source 2") is source
+        ps._known_sources["source 2"].load_source.assert_called_once_with("source 2")
+        assert "source 2" in ps._indexed
+        assert "source 2" in ps.load_times
+
     def test__normalise_source(self, parameter_manager):
         ps = parameter_manager
         ps.initialize = MagicMock()
@@ -245,6 +729,25 @@ class TestParameterSourceBase:
         parameter_manager.add_source = add_source
 
 
+def test_with_units():
+    from solcore.parameter import with_units
+    from pint import Quantity
+    import numpy as np
+
+    @with_units({"length": "m", "time": "s", "return": "km/h"})
+    def speed(length, time, factor=1):
+        return length / time * 3.6 * factor
+
+    out = speed(Quantity(1, "km"), Quantity(np.array([1000, 2000]), "s"), factor=2)
+    assert out.u == "kilometer / hour"
+    assert out.m == approx(np.array([7.2, 3.6]))
+    assert speed(1000, time=1000).m == approx(3.6)
+    assert speed.__wrapped__(1, 1) == 3.6
+
+    with raises(ValueError):
+        with_units({"length": "m"})
+
+
 @mark.parametrize("bow", [-1, 1])
 def test_alloy_parameter(bow):
     import numpy as np
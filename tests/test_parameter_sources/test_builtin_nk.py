@@ -24,6 +24,10 @@ class TestBuiltinNKSource(NKSourceTestSuite):
         assert "wavelength" in nk.dims
         assert self.source.name == nk.attrs["reference"]
 
+    def test_dependencies(self):
+        assert self.source.dependencies("GaAs", "nk") == (("GaAs", "comp"),)
+        assert self.source.dependencies("Dark matter", "nk") is None
+
     def test_load(self, tmp_path):
         import numpy as np
 
@@ -1,5 +1,5 @@
 from pytest import raises, mark, approx
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 
 
 def test_eg():
@@ -19,21 +19,15 @@ def test_eg():
 @mark.parametrize("fun", ["eg_gamma", "eg_x", "eg_l"])
 def test_eg_at_point(fun):
     from pint import Quantity
+    from solcore.parameter_sources.calculable_parameters import eg, eg_gamma, eg_x, eg_l
 
     T = Quantity(298, "K")
     eg0 = Quantity(1.6, "eV")
     alpha = Quantity(0.1, "meV/K")
     beta = Quantity(600, "K")
-    mock_eg = MagicMock()
-    package = "solcore.parameter_sources.calculable_parameters"
 
-    with patch(f"{package}.eg", mock_eg):
-        from solcore.parameter_sources.calculable_parameters import eg_gamma, eg_x, eg_l
-
-        f = {"eg_gamma": eg_gamma, "eg_x": eg_x, "eg_l": eg_l}[fun]
-        f(T, eg0, alpha, beta)
-        mock_eg.assert_called_once_with(T, eg0, alpha, beta)
-        mock_eg.reset_mock()
+    f = {"eg_gamma": eg_gamma, "eg_x": eg_x, "eg_l": eg_l}[fun]
+    assert f(T, eg0, alpha, beta) == eg(T, eg0, alpha, beta)
 
 
 def test_band_gap_and_lowest_band():
@@ -49,6 +43,9 @@ def test_band_gap_and_lowest_band():
 
     gap = band_gap(eg_gamma, eg_x, eg_l)
     assert eg_l == gap
+
+    gaps = band_gap(Quantity([1.4, 1.0], "eV"), eg_x, Quantity([1.0, 1.4], "eV"))
+    assert all(gaps == Quantity([1.0, 1.0], "eV"))
     assert Quantity("L", "dimensionless") == lowest_band(gap, eg_gamma, eg_x, eg_l)
 
 
@@ -191,6 +188,44 @@ class TestCalculableParameters:
             def eg_gamma():
                 pass
 
+    def test_register_calculable_units(self):
+        from solcore.parameter_sources import CalculableParameters
+        from solcore.parameter import ParameterManager, Parameter
+        from pint import Quantity
+
+        cp = CalculableParameters()
+        units = {"T": "K", "eg0_gamma": "eV", "return": "meV"}
+        pm = ParameterManager()
+
+        @CalculableParameters.register_calculable(description="Dummy", units=units)
+        def dummy_units(T, eg0_gamma):
+            assert not isinstance(T, Quantity) and not isinstance(eg0_gamma, Quantity)
+            return eg0_gamma * 1000 - T
+
+        try:
+            assert cp._units["dummy_units"] == (dummy_units.__wrapped__, units)
+
+            # Called directly, the inputs are converted to the units and the output
+            # is a Quantity
+            out = dummy_units(Quantity(20, "degC"), Quantity(1000, "meV"))
+            assert out.u == "millielectron_volt"
+            assert out.m == approx(1000 - 293.15)
+
+            # Through the source, a Parameter is built out of the magnitude
+            T = Quantity(300, "K")
+            out = pm.get_parameter("GaAs", "dummy_units", T=T)
+            expected = pm.get_parameter("GaAs", "eg0_gamma").m_as("meV") - 300
+            assert isinstance(out, Parameter)
+            assert out.u == "millielectron_volt"
+            assert out.m == approx(expected)
+            assert out.d == "Dummy"
+        finally:
+            cp._params.pop("dummy_units")
+            cp._units.pop("dummy_units")
+            cp._descriptions.pop("dummy_units")
+            cp._arguments.pop("dummy_units")
+            pm.reindex_source(cp.name)
+
     def test_materials(self):
         from solcore.parameter_sources import CalculableParameters
 
@@ -212,6 +247,35 @@ class TestCalculableParameters:
         expected = ("T", "eg0_gamma", "alpha_gamma", "beta_gamma")
         assert cp.list_arguments("eg_gamma") == expected
 
+    def test_arguments(self):
+        from solcore.parameter_sources import CalculableParameters
+        from solcore.parameter_sources.calculable_parameters import (
+            Arguments,
+            _arguments,
+        )
+
+        def dummy(T, eg0_gamma, Nd=0, alpha=1.0):
+            pass
+
+        assert _arguments(dummy) == Arguments(
+            names=("T", "eg0_gamma", "Nd", "alpha"),
+            defaults={"Nd": 0, "alpha": 1.0},
+            external=("T", "Nd"),
+        )
+
+        cp = CalculableParameters()
+        assert cp._arguments["eg_gamma"] == _arguments(cp.eg_gamma)
+
+    def test_dependencies(self):
+        from solcore.parameter_sources import CalculableParameters
+
+        cp = CalculableParameters()
+        expected = ("T", "eg0_gamma", "alpha_gamma", "beta_gamma")
+        assert cp.dependencies("GaAs", "eg_gamma") == tuple(
+            ("GaAs", a) for a in expected
+        )
+        assert cp.dependencies("GaAs", "dark_param") is None
+
     def test_get_parameter(self):
         from solcore.parameter_sources import CalculableParameters
         from solcore.parameter import (
@@ -274,6 +338,96 @@ class TestCalculableParameters:
         dummies = (d for d in cp.parameters() if "dummy" in d)
         for d in dummies:
             cp._params.pop(d)
+        del cp.parman.get_parameter
+
+    def test_plan(self):
+        from solcore.parameter_sources import CalculableParameters
+        from solcore.parameter import ParameterManager
+        from pint import Quantity
+
+        ParameterManager().initialize()
+        cp = CalculableParameters()
+
+        steps = cp.plan("GaAs", "ni", T=Quantity(300, "K"))
+        names = [s.parameter for s in steps]
+        assert len(names) == len(set(names))
+        assert names[-1] == "ni"
+        for i, step in enumerate(steps):
+            assert set(step.arguments) - {"T"} <= set(names[:i])
+            if step.source != cp.name:
+                assert step.arguments == ()
+
+        # Provided arguments are not planned and plans are cached
+        steps = cp.plan("GaAs", "ni", T=Quantity(300, "K"), band_gap=1)
+        assert "band_gap" not in [s.parameter for s in steps]
+        assert steps is cp.plan("GaAs", "ni", T=Quantity(400, "K"), band_gap=2)
+
+        # Only the arguments of the calculables involved are part of the key
+        plans = len(cp._plans)
+        assert steps is cp.plan("GaAs", "ni", T=Quantity(300, "K"), band_gap=1, x=1)
+        assert len(cp._plans) == plans
+
+    def test_shared_dependencies(self):
+        from solcore.parameter_sources import CalculableParameters
+        from solcore.parameter import ParameterManager, ParameterSourceError
+        from pint import Quantity
+
+        ParameterManager().initialize()
+        cp = CalculableParameters()
+        calls = MagicMock()
+
+        try:
+
+            @CalculableParameters.register_calculable
+            def dummy_shared():
+                calls()
+                return 2
+
+            @CalculableParameters.register_calculable
+            def dummy_left(dummy_shared):
+                return dummy_shared + 1
+
+            @CalculableParameters.register_calculable
+            def dummy_right(dummy_shared):
+                return dummy_shared * 3
+
+            @CalculableParameters.register_calculable
+            def dummy_top(dummy_left, dummy_right):
+                return dummy_left + dummy_right
+
+            out = ParameterManager().get_parameter(
+                "Dark matter", "dummy_top", use_cache=False
+            )
+            assert out.m == 9
+            calls.assert_called_once()
+
+            # Inputs that cannot be cached use a memo during the enquiry
+            calls.reset_mock()
+            out = ParameterManager().get_parameter(
+                "Dark matter", "dummy_top", T=Quantity([300, 400], "K")
+            )
+            assert out.m == 9
+            calls.assert_called_once()
+            assert cp._memos == []
+
+            @CalculableParameters.register_calculable
+            def dummy_loop_1(dummy_loop_2):
+                return dummy_loop_2
+
+            @CalculableParameters.register_calculable
+            def dummy_loop_2(dummy_loop_1):
+                return dummy_loop_1
+
+            with raises(ParameterSourceError):
+                cp.plan("Dark matter", "dummy_loop_1")
+        finally:
+            dummies = [d for d in cp._params if d.startswith("dummy_")]
+            for d in dummies:
+                cp._params.pop(d)
+                cp._descriptions.pop(d)
+                cp._units.pop(d, None)
+                cp._arguments.pop(d)
+            ParameterManager().reindex_source(cp.name)
 
 
 def test_electron_affinity():
@@ -305,33 +459,24 @@ def test_density_states():
 def test_nc():
     from pint import Quantity
     from solcore.constants import electron_mass_
+    from solcore.parameter_sources.calculable_parameters import Nc, density_states
 
     T = Quantity(298, "K")
     mass = 0.1 * electron_mass_
-    mock_density_states = MagicMock()
-    package = "solcore.parameter_sources.calculable_parameters"
 
-    with patch(f"{package}.density_states", mock_density_states):
-        from solcore.parameter_sources.calculable_parameters import Nc
-
-        Nc(T, mass)
-        assert mock_density_states.call_count == 1
+    assert Nc(T, mass) == density_states(T, mass)
 
 
 def test_nv():
     from pint import Quantity
     from solcore.constants import electron_mass_
+    from solcore.parameter_sources.calculable_parameters import Nv, density_states
 
     T = Quantity(298, "K")
     mass = 0.1 * electron_mass_
-    mock_density_states = MagicMock()
-    package = "solcore.parameter_sources.calculable_parameters"
-
-    with patch(f"{package}.density_states", mock_density_states):
-        from solcore.parameter_sources.calculable_parameters import Nv
 
-        Nv(T, 2 * mass, mass)
-        assert mock_density_states.call_count == 2
+    expected = density_states(T, 2 * mass) + density_states(T, mass)
+    assert Nv(T, 2 * mass, mass).m == approx(expected.m)
 
 
 def test_ni():
@@ -82,6 +82,19 @@ class TestSotoodehMobilitySource:
             assert out.r == (sm.name,)
             assert out.u == "meter ** 2 / second / volt"
 
+    def test_dependencies(self):
+        from solcore.parameter_sources import SotoodehMobilitySource
+
+        sm = SotoodehMobilitySource()
+        material = sm.materials[0]
+
+        assert sm.dependencies("Dark matter", "electron_mobility") is None
+        assert sm.dependencies(material, "electron_mobility") == (
+            (material, "T"),
+            (material, "Na"),
+            (material, "Nd"),
+        )
+
     @mark.xfail(reason="Method not implemented, yet.")
     def test__get_parameter_alloy(self):
         assert False
@@ -1,4 +1,4 @@
-from pytest import raises
+from pytest import raises, approx
 from unittest.mock import MagicMock, patch
 
 
@@ -95,6 +95,49 @@ def test_populate_sources():
     assert priority == expected
 
 
+def test_refresh_simple_sources(tmp_path, simple_data, parameter_manager, monkeypatch):
+    from solcore.parameter_sources import simple_parameters as sp
+    import json
+    import os
+
+    monkeypatch.setattr(sp, "_discovered", {})
+    monkeypatch.setattr(sp, "_registered", {})
+
+    def write(name, value):
+        path = tmp_path / f"{name}_simple_param.json"
+        data = dict(simple_data, **{"Dark matter": {"param1": value}})
+        path.write_text(json.dumps(data))
+        # Make sure the change is noticed, whatever the resolution of the clock
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    def refresh():
+        return sp.refresh_simple_sources((tmp_path.glob("*_simple_param.json"),))
+
+    assert refresh() == ()
+    write("Source1", 42)
+    write("Source2", 12)
+    assert set(refresh()) == {"Source1", "Source2"}
+    assert refresh() == ()
+
+    pm = parameter_manager
+    assert pm.get_parameter("Dark matter", "param1", source="Source1").m == 42
+    assert pm.get_parameter("Dark matter", "param1", source="Source2").m == 12
+    assert pm.cache_info().currsize == 2
+
+    # Only the modified source is reloaded and only its cached values discarded
+    write("Source1", 43)
+    assert refresh() == ("Source1",)
+    assert pm.cache_info().currsize == 1
+    assert pm.get_parameter("Dark matter", "param1", source="Source1").m == 43
+    assert pm.get_parameter("Dark matter", "param1", source="Source2").m == 12
+
+    (tmp_path / "Source2_simple_param.json").unlink()
+    assert refresh() == ("Source2",)
+    assert "Source2" not in pm.known_sources
+    assert pm.get_parameter("Dark matter", "param1", source="Source1").m == 43
+
+
 class TestSimpleSource:
     def test_load_source(self, simple_data, simple_data_file):
         from solcore.parameter_sources import SimpleSource
@@ -134,7 +177,7 @@ class TestSimpleSource:
         assert actual == tuple(ss._data["Dark matter"].keys())
 
     def test_get_parameter(self, simple_param_source):
-        from solcore.parameter import ParameterMissing
+        from solcore.parameter import Context, ParameterMissing
 
         ss = simple_param_source
         ss._get_parameter_alloy = MagicMock(return_value=84)
@@ -151,20 +194,20 @@ class TestSimpleSource:
         raw = ss._data["Dark matter"]["param1"]
         out = ss.get_parameter(material="Dark matter", parameter="param1")
         assert out == 42
-        ss.to_param.assert_called_with(raw, "param1")
+        ss.to_param.assert_called_with(raw, "param1", Context())
 
         ss.to_param.reset_mock()
         ss._data["Dark matter"]["x"] = "Lp"
         out = ss.get_parameter(material="Dark matter", parameter="param1")
         assert out == 84
-        ss._get_parameter_alloy.assert_called_with("Dark matter", "param1")
+        ss._get_parameter_alloy.assert_called_with("Dark matter", "param1", Context())
         ss.to_param.assert_not_called()
 
-    def test__get_parameter_alloy(self, simple_param_source):
+    def test__get_parameter_alloy(self, simple_param_source, monkeypatch):
         from solcore.parameter import InputArgumentMissing, ParameterMissing
 
         ss = simple_param_source
-        ss.parman.get_parameter = MagicMock(side_effect=[2, 3])
+        monkeypatch.setattr(ss.parman, "get_parameter", MagicMock(side_effect=[2, 3]))
         ss.to_param = MagicMock(side_effect=[0, 42])
 
         ss._data["Dark matter"]["x"] = "Lp"
@@ -172,7 +215,7 @@ class TestSimpleSource:
         with raises(ParameterMissing, match=msg):
             ss._get_parameter_alloy(material="Dark matter", parameter="param1")
 
-        ss.parman.get_parameter = MagicMock(side_effect=[2, 3])
+        monkeypatch.setattr(ss.parman, "get_parameter", MagicMock(side_effect=[2, 3]))
         ss.to_param = MagicMock(side_effect=[0, 42])
         ss._data["Dark matter"]["x"] = "Lp"
         ss._data["Dark matter"]["parent0"] = "mamma"
@@ -181,7 +224,7 @@ class TestSimpleSource:
         with raises(InputArgumentMissing, match=msg):
             ss._get_parameter_alloy(material="Dark matter", parameter="param1")
 
-        ss.parman.get_parameter = MagicMock(side_effect=[2, 3])
+        monkeypatch.setattr(ss.parman, "get_parameter", MagicMock(side_effect=[2, 3]))
         ss.to_param = MagicMock(side_effect=[0, 42])
         comp = {"Lp": 0.3}
         out = ss._get_parameter_alloy(
@@ -189,8 +232,165 @@ class TestSimpleSource:
         )
         assert out == 42
 
+        # The parents and bowing are cached for other compositions
+        ss.to_param = MagicMock(side_effect=[42])
+        out = ss._get_parameter_alloy(
+            material="Dark matter", parameter="param1", comp={"Lp": 0.5}
+        )
+        assert out == 42
+        assert len(ss._alloys) == 1
+
+        ss.clear_cache()
+        assert len(ss._alloys) == 0
+
+    def test_alloy_coefficients(self):
+        from solcore.parameter import Context, ParameterManager
+        from pint import Quantity
+        import numpy as np
+
+        pm = ParameterManager()
+        T = Quantity(300, "K")
+        x = np.linspace(0, 1, 5)
+
+        # The bowing of eg_gamma depends on the composition, but not that of eg_x
+        for parameter in ("eg_gamma", "eg_x"):
+            pm.clear_cache()
+            expected = [
+                pm.get_parameter("AlGaAs", parameter, T=T, comp={"Al": xi}).m
+                for xi in x
+            ]
+            pm.clear_cache()
+            out = pm.get_parameter("AlGaAs", parameter, T=T, comp={"Al": x})
+            assert out.m == approx(expected)
+
+        # The coefficients are keyed by the inputs of the parents and the bowing
+        ss = pm.sources[pm.find_source("AlGaAs", "eg_x")]
+        context = Context(T=T, comp={"Al": 0.3})
+        key = ss._alloy_key("AlGaAs", "eg_x", context)
+        assert key is not None
+        others = context.replace(Nd=Quantity(x, "1/m**3"), band_gap=Quantity(1, "eV"))
+        assert ss._alloy_key("AlGaAs", "eg_x", others) == key
+        assert ss._alloy_key("AlGaAs", "eg_x", context.replace(T=2 * T)) != key
+
+    def test_dependencies(self, simple_param_source):
+        ss = simple_param_source
+
+        assert ss.dependencies("ice", "param1") is None
+        assert ss.dependencies("Dark matter", "param1") == ()
+        assert ss.dependencies("Dark matter", "param2") == ()
+        assert ss.dependencies("Dark matter", "param3") == (("Dark matter", "T"),)
+
+        ss._data["Dark matter"]["x"] = "Lp"
+        assert ss.dependencies("Dark matter", "param3") is None
+
+        ss._data["Dark matter"]["parent0"] = "mamma"
+        ss._data["Dark matter"]["parent1"] = "papa"
+        assert ss.dependencies("Dark matter", "param3") == (
+            ("Dark matter", "comp"),
+            ("mamma", "param3"),
+            ("papa", "param3"),
+            ("Dark matter", "T"),
+        )
+
+    def test_quaternary(self):
+        from solcore.parameter import ParameterManager, InputArgumentMissing
+        from pint import Quantity
+        import numpy as np
+
+        pm = ParameterManager()
+        ss = pm._load_source("vurgaftmanJAP2001")
+        T = Quantity(300, "K")
+        assert "lattice_constant" in ss.parameters("GaInAsP")
+        assert "eg_gamma" in ss.parameters("AlGaInP")
+
+        # The quaternaries reduce to their ternaries and binaries
+        for material, comp, ternary, tcomp in (
+            ("GaInAsP", {"Ga": 0.47, "As": 1.0}, "InGaAs", {"In": 0.53}),
+            ("GaInAsP", {"Ga": 0.3, "As": 0.0}, "GaInP", {"In": 0.7}),
+            ("AlGaInP", {"Al": 0.0, "Ga": 0.51}, "GaInP", {"In": 0.49}),
+            ("AlGaInP", {"Al": 0.3, "Ga": 0.7}, "AlGaP", {"Ga": 0.7}),
+            ("AlGaAsSb", {"Al": 0.4, "As": 1.0}, "AlGaAs", {"Al": 0.4}),
+            ("GaInAsP", {"Ga": 1.0, "As": 1.0}, "GaAs", {}),
+        ):
+            for parameter in ("eg_gamma", "eg_x", "lattice_constant"):
+                try:
+                    expected = pm.get_parameter(ternary, parameter, T=T, comp=tcomp)
+                except Exception:
+                    continue
+                out = ss.get_parameter(material, parameter, T=T, comp=comp)
+                assert out.to(expected.u).m == approx(expected.m)
+                assert out.r == (ss.name,)
+
+        x = np.linspace(0, 1, 3)
+        out = ss.get_parameter(
+            "GaInAsP", "eg_gamma", T=T, comp={"Ga": x[:, None], "As": x[None, :]}
+        )
+        assert out.shape == (3, 3)
+
+        with raises(InputArgumentMissing, match="'As'"):
+            ss.get_parameter("GaInAsP", "eg_gamma", T=T, comp={"Ga": 0.5})
+
+        assert set(ss.dependencies("GaInAsP", "eg_gamma")) == {
+            ("GaInAsP", "comp"),
+            ("GaAs", "eg_gamma"),
+            ("GaP", "eg_gamma"),
+            ("InAs", "eg_gamma"),
+            ("InP", "eg_gamma"),
+        }
+
+    def test_get_parameter_table(self, simple_param_source):
+        from solcore.parameter import InputArgumentMissing, ParameterMissing
+        import numpy as np
+
+        ss = simple_param_source
+        materials, out = ss.get_parameter_table("param2")
+        assert materials == ("Dark matter", "Light matter")
+        assert out.m == approx([23, 42])
+        assert out.u == "electron_volt"
+        assert out.d == "The second parameter"
+        assert out.r == (ss.name,)
+
+        materials, out = ss.get_parameter_table("param3", T=2)
+        assert materials == ("Dark matter",)
+        assert out.m == approx([4])
+
+        materials, out = ss.get_parameter_table("param3", T=np.array([1, 2, 3]))
+        assert out.shape == (1, 3)
+
+        with raises(InputArgumentMissing):
+            ss.get_parameter_table("param3")
+
+        with raises(ParameterMissing):
+            ss.get_parameter_table("mass")
+
+    def test_invalid_entries(self, tmp_path, simple_data):
+        from solcore.parameter_sources import SimpleSource
+        from pint import DimensionalityError, Quantity
+        import json
+
+        dark = dict(simple_data["Dark matter"], param1="42 eV", note="A")
+        data = dict(simple_data, **{"Dark matter": dark})
+        path = tmp_path / "invalid_simple_param.json"
+        path.write_text(json.dumps(data))
+        NewSource = type(
+            f"Source2{SimpleSource.__name__}",
+            (SimpleSource,),
+            {"name": "Source2", "_path": path, "_priority": 1},
+        )
+
+        ss = NewSource.load_source()
+        assert ss.get_parameter("Dark matter", "param1").m == 42
+        assert ss.get_parameter("Light matter", "param1").m == 84
+        with raises(DimensionalityError):
+            ss.get_parameter_table("param1")
+        with raises(Exception):
+            ss.get_parameter("Dark matter", "note")
+        materials, out = ss.get_parameter_table("param2", T=Quantity(1, "K"))
+        assert out.m == approx([23, 42])
+
     def test_to_param(self, simple_param_source):
         from solcore.parameter import Parameter, InputArgumentMissing
+        import numpy as np
 
         ss = simple_param_source
         out = ss.to_param(42, "the answer")
@@ -210,3 +410,134 @@ class TestSimpleSource:
         out = ss.to_param("42*T eV", "the answer", T=2)
         assert out.m == 84
         assert out.u == "electron_volt"
+
+        out = ss.to_param("42*cos(T) eV", "the answer", T=np.array([0, np.pi]))
+        assert out.m == approx([42, -42])
+
+        with raises(InputArgumentMissing, match="'Na'"):
+            ss.to_param("42*T+Na eV", "the answer", T=2)
+
+
+def test_compile():
+    from solcore.parameter_sources.simple_parameters import _compile
+    from pint import Quantity
+    import pickle
+
+    out = _compile("1.5 eV")
+    assert out.value == 1.5
+    assert out.function is None
+    assert out.units == Quantity(1, "eV").units
+    assert _compile("1.5").units is None
+
+    out = _compile("2*cos(4*T)+x angstrom")
+    assert out.value is None
+    assert out.variables == ("T", "x")
+    assert out.units == Quantity(1, "angstrom").units
+    args = {"T": 0, "x": 1}
+    assert out.function(*(args[v] for v in out.variables)) == 3
+    assert _compile("2*cos(4*T)+x angstrom") is out
+
+    # Expressions are pickled as their raw parameter, compiling them again
+    assert pickle.loads(pickle.dumps(out)) is out
+
+
+def test_array_functions():
+    from solcore.parameter_sources.simple_parameters import _compile
+    import numpy as np
+
+    x = np.array([2.0, 8.0])
+    for raw, expected in (
+        ("log(x,2)", [1, 3]),
+        ("log(x)", np.log(x)),
+        ("hypot(x,x,x)", np.sqrt(3) * x),
+        ("hypot(x)", x),
+        ("sin(x)", np.sin(x)),
+    ):
+        out = _compile(raw)
+        assert out.array_function(x) == approx(expected)
+        assert out.function(x[1]) == approx(expected[1])
+
+    # Extra arguments are errors, as in 'math', not outputs
+    y = np.ones(2)
+    with raises(TypeError):
+        _compile("sin(x,y)").array_function(x, y)
+    assert y == approx([1, 1])
+
+
+def test_columns():
+    from solcore.parameter_sources.simple_parameters import _columns
+    from pint import Quantity
+    import numpy as np
+
+    data = {
+        "A": {"a": "1 nm", "b": 2.0, "c": "2*T eV"},
+        "B": {"a": "20 angstrom", "c": "3 meV"},
+        "AB": {"x": "A", "parent0": "A", "parent1": "B"},
+    }
+    out = _columns(data)
+    assert set(out) == {"a", "b", "c"}
+
+    assert out["a"].materials == ("A", "B")
+    assert out["a"].index == {"A": 0, "B": 1}
+    assert out["a"].units == Quantity(1, "nm").units
+    assert out["a"].values == approx([1, 2])
+    assert out["a"].expressions == ()
+
+    assert out["b"].units is None
+    assert out["c"].values[1] == approx(3e-3)
+    assert np.isnan(out["c"].values[0])
+    assert [(i, f) for i, _, f in out["c"].expressions] == [(0, 1.0)]
+
+
+def test_columns_invalid_entries():
+    from solcore.parameter_sources.simple_parameters import _columns
+    from pint import Quantity
+
+    data = {
+        "A": {"a": "1 eV", "b": "2 nm", "note": "measured at room temperature"},
+        "B": {"a": 2.0, "b": "3 nanometre", "note": "calculated twice"},
+        "C": {"a": "3 meV", "b": "4 nm"},
+    }
+    out = _columns(data)
+
+    # Only the problematic entries are left for enquiries to report their errors
+    assert out["a"].units == Quantity(1, "eV").units
+    assert out["a"].values[[0, 2]] == approx([1, 3e-3])
+    assert list(out["a"].expressions) == [(1, (2.0, None, None, (), None, None), None)]
+    assert out["b"].values == approx([2, 3, 4])
+    assert [(i, e, f) for i, e, f in out["note"].expressions] == [
+        (0, None, None),
+        (1, None, None),
+    ]
+
+
+def test_quaternaries():
+    from solcore.parameter_sources.simple_parameters import _quaternaries
+
+    data = {
+        "AC": {"a": "1 eV", "b": "1 eV"},
+        "BC": {"a": "2 eV"},
+        "DC": {"a": "3 eV"},
+        "ABC": {"parent0": "AC", "parent1": "BC", "x": "B", "b": "1 eV"},
+        "ABDC": {"sublattices": [["A", "B", "D"], ["C"]]},
+    }
+    out = _quaternaries(data)["ABDC"]
+    assert out.sublattices == (("A", "B", "D"), ("C",))
+    assert out.binaries == (("AC", ("A", "C")), ("BC", ("B", "C")), ("DC", ("D", "C")),)
+    assert out.ternaries == (
+        ("ABC", ("A", "B"), ("C",)),
+        (None, ("A", "D"), ("C",)),
+        (None, ("B", "D"), ("C",)),
+    )
+    assert out.parameters == ("a", "b")
+
+
+def test_fractions():
+    from solcore.parameter_sources.simple_parameters import _fractions
+    from solcore.parameter import InputArgumentMissing
+
+    out = _fractions((("A", "B", "D"), ("C",)), {"A": 0.2, "B": 0.5})
+    assert out == approx({"A": 0.2, "B": 0.5, "D": 0.3, "C": 1.0})
+
+    with raises(InputArgumentMissing):
+        _fractions((("A", "B", "D"), ("C",)), {"A": 0.2})
@@ -0,0 +1,104 @@
+from unittest.mock import MagicMock
+
+
+def test_user_dir(app_local_path):
+    from solcore.parameter_sources.source_cache import user_dir
+    from pathlib import Path
+
+    assert user_dir() == Path.home() / app_local_path
+
+
+def test_user_dir_platforms(monkeypatch):
+    from solcore.parameter_sources.source_cache import user_dir
+    from pathlib import Path
+
+    monkeypatch.setattr("sys.platform", "darwin")
+    assert user_dir() == Path.home() / "Library" / "Application Support" / "solcore"
+    monkeypatch.setattr("sys.platform", "linux")
+    assert user_dir() == Path.home() / ".solcore"
+
+
+def test_cached(tmp_path):
+    from solcore.parameter_sources.source_cache import cached, cache_dir
+
+    path = tmp_path / "data.txt"
+    path.write_text("some data")
+    loader = MagicMock(return_value={"parsed": [1, 2, 3]})
+
+    assert cached("data", (path,), loader) == {"parsed": [1, 2, 3]}
+    assert cached("data", (path,), loader) == {"parsed": [1, 2, 3]}
+    loader.assert_called_once()
+    assert len(list(cache_dir().glob("data-*.pickle"))) == 1
+
+    # Changing the contents invalidates the cache, replacing the old file
+    path.write_text("other data")
+    loader.return_value = {"parsed": [4]}
+    assert cached("data", (path,), loader) == {"parsed": [4]}
+    assert loader.call_count == 2
+    assert len(list(cache_dir().glob("data-*.pickle"))) == 1
+    assert len(list(cache_dir().iterdir())) == 1
+
+
+def test_cached_versions(tmp_path, monkeypatch, caplog):
+    from solcore.parameter_sources.source_cache import cached, cache_dir
+    import numpy as np
+    import pandas as pd
+
+    path = tmp_path / "data.txt"
+    path.write_text("some data")
+    loader = MagicMock(return_value=42)
+    cached("data", (path,), loader, libraries=("pandas",))
+
+    # Upgrading a library whose objects are stored parses the files again
+    monkeypatch.setattr(np, "__version__", "0.0.1")
+    cached("data", (path,), loader, libraries=("pandas",))
+    assert loader.call_count == 2
+    monkeypatch.setattr(pd, "__version__", "0.0.1")
+    cached("data", (path,), loader, libraries=("pandas",))
+    assert loader.call_count == 3
+
+    assert "invalid" not in caplog.text
+    assert len(list(cache_dir().glob("data-*.pickle"))) == 1
+
+
+def test_cached_invalid(tmp_path, caplog):
+    from solcore.parameter_sources.source_cache import cached, cache_dir, clear
+
+    path = tmp_path / "data.txt"
+    path.write_text("some data")
+    cached("data", (path,), lambda: 42)
+    target = next(cache_dir().glob("data-*.pickle"))
+
+    target.write_bytes(b"garbage")
+    assert cached("data", (path,), lambda: 42) == 42
+    assert "invalid" in caplog.text
+
+    # Values that cannot be stored are still returned
+    assert cached("other", (path,), lambda: lambda: 42)() == 42
+    assert "could not be written" in caplog.text
+    assert len(list(cache_dir().iterdir())) == 1
+
+    clear()
+    assert len(list(cache_dir().iterdir())) == 0
+
+
+def test_simple_source_cached(simple_data_file):
+    from solcore.parameter_sources import SimpleSource
+    from solcore.parameter_sources.source_cache import cache_dir
+    from pint import Quantity
+
+    NewSource = type(
+        f"Source1{SimpleSource.__name__}",
+        (SimpleSource,),
+        {"name": "Source1", "_path": simple_data_file, "_priority": 1},
+    )
+    first = NewSource.load_source()
+    NewSource._instance = None
+    second = NewSource.load_source()
+
+    assert first is not second
+    assert len(list(cache_dir().glob("Source1-*.pickle"))) == 1
+    assert second._data == first._data
+    assert second._quaternaries == first._quaternaries
+    assert second._columns.keys() == first._columns.keys()
+    assert second.get_parameter("Dark matter", "param3", T=Quantity(2, "K")).m == 4